@@ -1,5 +1,5 @@
 import asyncio
-from collections.abc import Mapping
+from collections.abc import Mapping, Sequence
 from typing import Any
 
 from celery import Celery
@@ -23,3 +23,17 @@ class EventstreamTransport(AsyncAbstractEventstreamTransport):
             self.celery_client.send_task("send_message", kwargs={"message": message})
 
         await loop.run_in_executor(None, send_message)
+
+    async def send_messages_serialized(
+        self, messages: Sequence[Mapping[str, Any]]
+    ) -> None:
+        """Publish many serialized messages in one executor call."""
+        loop = asyncio.get_event_loop()
+
+        def send_messages():
+            for message in messages:
+                self.celery_client.send_task(
+                    "send_message", kwargs={"message": message}
+                )
+
+        await loop.run_in_executor(None, send_messages)
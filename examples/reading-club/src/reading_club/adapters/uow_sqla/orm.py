@@ -21,5 +21,8 @@ messages = Table(
     Column("created_at", DateTime(timezone=True), nullable=False),
     Column("metadata", JSON(), nullable=False),
     Column("payload", JSON(), nullable=False),
+    Column("causation_id", Uuid(), nullable=True),
+    Column("correlation_id", Uuid(), nullable=True),
     Index("idx_messages_created_at", "created_at"),
+    Index("idx_messages_correlation_id", "correlation_id"),
 )
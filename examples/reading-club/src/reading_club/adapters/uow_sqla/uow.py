@@ -1,8 +1,10 @@
+from collections.abc import Sequence
 from types import TracebackType
+from typing import Any
 from uuid import UUID
 
 from result import Err, Ok
-from sqlalchemy import insert, select
+from sqlalchemy import Text, insert, select, type_coerce, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 
@@ -30,23 +32,33 @@ class SQLMessageStoreRepository(AsyncAbstractMessageStoreRepository):
         super().__init__(publisher)
         self.session = session
 
+    def _format_message(self, message: Message) -> dict[str, Any]:
+        # the payload is serialized once, for the message store and the eventstream,
+        # and is inserted as is in the JSON column.
+        serialized = self.serialize_message(message)
+        return {
+            "id": message.message_id,
+            "created_at": message.created_at,
+            "metadata": message.metadata.model_dump(),
+            "payload": type_coerce(serialized["payload"], Text),
+            "causation_id": message.causation_id,
+            "correlation_id": message.correlation_id,
+        }
+
     async def _add(self, message: Message) -> None:
+        qry = insert(orm.messages).values([self._format_message(message)])
+        await self.session.execute(qry)
+
+    async def _add_many(self, messages: Sequence[Message]) -> None:
         qry = insert(orm.messages).values(
-            [
-                {
-                    "id": message.message_id,
-                    "created_at": message.created_at,
-                    "metadata": message.metadata.model_dump(),
-                    "payload": message.model_dump(
-                        mode="json", exclude={"message_id", "created_at", "metadata"}
-                    ),
-                }
-            ]
+            [self._format_message(message) for message in messages]
         )
         await self.session.execute(qry)
 
 
 class SQLBookRepository(AbstractBookRepository):
+    use_identity_map = True
+
     def __init__(self, session: AsyncSession):
         super().__init__()
         self.session = session
@@ -59,17 +71,34 @@ class SQLBookRepository(AbstractBookRepository):
         except IntegrityError:
             return Err(BookRepositoryError.integrity_error)
 
-        self.seen.append(model)
+        self.track(model)
         return Ok(...)
 
     async def by_id(self, id: UUID) -> BookRepositoryResult:
+        if id in self.identity_map:
+            book = self.identity_map[id]
+            self.track(book)
+            return Ok(book)
         qry = select(orm.books).where(orm.books.c.id == id)
         row = (await self.session.execute(qry)).first()
         if not row:
             return Err(BookRepositoryError.not_found)
         book = Book(**row._asdict())
+        self.track(book)
         return Ok(book)
 
+    async def flush_changes(self) -> None:
+        """Update the changed columns of the books, before the commit."""
+        for book in self.identity_map.values():
+            if not book.dirty_fields:
+                continue
+            qry = (
+                update(orm.books)
+                .where(orm.books.c.id == book.id)
+                .values({field: getattr(book, field) for field in book.dirty_fields})
+            )
+            await self.session.execute(qry)
+
 
 class SQLUnitOfWork(AbstractUnitOfWork):
     session: AsyncSession
@@ -107,6 +136,7 @@ class SQLUnitOfWork(AbstractUnitOfWork):
             await self.session.close()
 
     async def commit(self):
+        await self.books.flush_changes()
         await self.session.commit()
 
     async def rollback(self):
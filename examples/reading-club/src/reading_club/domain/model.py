@@ -4,6 +4,8 @@ from messagebus import Field, Model
 
 
 class Book(Model):
+    track_changes = True
+
     id: UUID = Field(...)
     title: str = Field(...)
     author: str = Field(...)
@@ -13,6 +13,8 @@ unasync.unasync_files(
                 "TAsyncUow": "TSyncUow",
                 "TAsyncMessageStore": "TSyncMessageStore",
                 "async_listen": "sync_listen",
+                "async_gather": "sync_gather",
+                "async_sleep": "sync_sleep",
             },
         ),
     ],
@@ -27,6 +29,7 @@ unasync.unasync_files(
             additional_replacements={
                 "_async": "_sync",
                 "tests._async.handlers": "tests._sync.handlers",
+                "async_sleep": "sync_sleep",
             },
         ),
     ],
@@ -18,14 +18,27 @@ from .domain.model import (
     TMetadata,
     TransactionStatus,
 )
+from .service._async.consumer import AsyncEventstreamConsumer
 from .service._async.dependency import AsyncDependency
 from .service._async.eventstream import (
+    AsyncAbstractEventstreamReceiver,
     AsyncAbstractEventstreamTransport,
     AsyncEventstreamPublisher,
     AsyncSinkholeEventstreamTransport,
 )
+from .service._async.outbox import (
+    AsyncInMemoryOutboxMessageStore,
+    AsyncOutboxRelay,
+    AsyncSQLiteOutboxMessageStore,
+)
 from .service._async.registry import AsyncMessageBus, async_listen
+from .service._async.replay import (
+    AsyncAbstractReplayCheckpointStore,
+    AsyncInMemoryReplayCheckpointStore,
+    AsyncReplayRunner,
+)
 from .service._async.repository import (
+    AsyncAbstractOutboxMessageStoreRepository,
     AsyncAbstractRepository,
     AsyncSinkholeMessageStoreRepository,
 )
@@ -35,14 +48,27 @@ from .service._async.unit_of_work import (
     AsyncUnitOfWorkTransaction,
     TAsyncMessageStore,
 )
+from .service._sync.consumer import SyncEventstreamConsumer
 from .service._sync.dependency import SyncDependency
 from .service._sync.eventstream import (
+    SyncAbstractEventstreamReceiver,
     SyncAbstractEventstreamTransport,
     SyncEventstreamPublisher,
     SyncSinkholeEventstreamTransport,
 )
+from .service._sync.outbox import (
+    SyncInMemoryOutboxMessageStore,
+    SyncOutboxRelay,
+    SyncSQLiteOutboxMessageStore,
+)
 from .service._sync.registry import SyncMessageBus, sync_listen
+from .service._sync.replay import (
+    SyncAbstractReplayCheckpointStore,
+    SyncInMemoryReplayCheckpointStore,
+    SyncReplayRunner,
+)
 from .service._sync.repository import (
+    SyncAbstractOutboxMessageStoreRepository,
     SyncAbstractRepository,
     SyncSinkholeMessageStoreRepository,
 )
@@ -52,7 +78,16 @@ from .service._sync.unit_of_work import (
     SyncUnitOfWorkTransaction,
     TSyncMessageStore,
 )
-from .service.eventstream import AbstractMessageSerializer
+from .service.background import AsyncBackgroundEventstreamPublisher, OverflowPolicy
+from .service.dependency import DependencyLifetime
+from .service.dispatch_queue import (
+    AbstractDispatchQueue,
+    FifoDispatchQueue,
+    PriorityDispatchQueue,
+)
+from .service.eventstream import AbstractMessageSerializer, OutboxMessage
+from .service.message_registry import MessageDeserializer, MessageTypeRegistry
+from .service.tracking import SeenModels
 
 __version__ = version("messagebus")
 
@@ -62,11 +97,15 @@ __all__ = [
     "AsyncAbstractEventstreamTransport",
     # Repository
     "AsyncAbstractRepository",
+    "SeenModels",
     # Unit of work
     "AsyncAbstractUnitOfWork",
     "TAsyncMessageStore",
     "AsyncAbstractMessageStoreRepository",
+    "AsyncAbstractOutboxMessageStoreRepository",
     "AsyncEventstreamPublisher",
+    "AsyncBackgroundEventstreamPublisher",
+    "OverflowPolicy",
     "AsyncMessageBus",
     "AsyncSinkholeMessageStoreRepository",
     "AsyncSinkholeEventstreamTransport",
@@ -87,6 +126,7 @@ __all__ = [
     "SyncAbstractUnitOfWork",
     "TSyncMessageStore",
     "SyncAbstractMessageStoreRepository",
+    "SyncAbstractOutboxMessageStoreRepository",
     "SyncEventstreamPublisher",
     "SyncMessageBus",
     "SyncSinkholeMessageStoreRepository",
@@ -98,5 +138,32 @@ __all__ = [
     "sync_listen",
     # Dependencies,
     "AsyncDependency",
+    "DependencyLifetime",
     "SyncDependency",
+    # Outbox
+    "AsyncInMemoryOutboxMessageStore",
+    "AsyncOutboxRelay",
+    "AsyncSQLiteOutboxMessageStore",
+    "OutboxMessage",
+    "SyncInMemoryOutboxMessageStore",
+    "SyncOutboxRelay",
+    "SyncSQLiteOutboxMessageStore",
+    # Dispatch queues
+    "AbstractDispatchQueue",
+    "FifoDispatchQueue",
+    "PriorityDispatchQueue",
+    # Consumer
+    "AsyncAbstractEventstreamReceiver",
+    "AsyncEventstreamConsumer",
+    "MessageDeserializer",
+    "MessageTypeRegistry",
+    "SyncAbstractEventstreamReceiver",
+    "SyncEventstreamConsumer",
+    # Replay
+    "AsyncAbstractReplayCheckpointStore",
+    "AsyncInMemoryReplayCheckpointStore",
+    "AsyncReplayRunner",
+    "SyncAbstractReplayCheckpointStore",
+    "SyncInMemoryReplayCheckpointStore",
+    "SyncReplayRunner",
 ]
@@ -0,0 +1,153 @@
+import random
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from opentelemetry import propagate, trace
+from opentelemetry.trace import INVALID_SPAN, Link, Span, TracerProvider
+
+from messagebus.domain.model import GenericCommand, GenericEvent, Message
+from messagebus.domain.model.ids import MessageId
+from messagebus.ports.observability import AbstractTracer
+from messagebus.service.eventstream import AbstractMessageSerializer, MessageSerializer
+
+_command_span: ContextVar[Span | None] = ContextVar(
+    "messagebus_command_span", default=None
+)
+
+
+def _attributes(message: Message[Any]) -> dict[str, Any]:
+    return {
+        "messaging.system": "messagebus",
+        "messaging.message.id": str(message.message_id),
+        "messagebus.message.name": message.metadata.name,
+        "messagebus.message.version": message.metadata.schema_version,
+    }
+
+
+class OpenTelemetryTracer(AbstractTracer):
+    """
+    Trace the message bus with OpenTelemetry.
+
+    Every handled command has a span, with a child span per dispatched message,
+    linked to the span of the command. Spans are not created at all for the
+    commands that are not sampled.
+
+    The trace context of the published messages is kept until they are
+    serialized by an :class:`OpenTelemetryMessageSerializer`.
+
+    :param tracer_provider: by default, the global tracer provider.
+    :param trace_hooks: also create a span per service handler call.
+    :param sample_ratio: ratio of the commands traced, the sampler of the
+        tracer provider applies after it.
+    :param max_trace_contexts: maximum number of trace contexts kept for
+        messages that have not been serialized yet, the oldest are dropped.
+    """
+
+    def __init__(
+        self,
+        tracer_provider: TracerProvider | None = None,
+        *,
+        trace_hooks: bool = False,
+        sample_ratio: float = 1.0,
+        max_trace_contexts: int = 10000,
+    ) -> None:
+        self.tracer = trace.get_tracer("messagebus", tracer_provider=tracer_provider)
+        self.trace_hooks = trace_hooks
+        self.sample_ratio = sample_ratio
+        self.max_trace_contexts = max_trace_contexts
+        self._trace_contexts: dict[MessageId, dict[str, str]] = {}
+
+    @contextmanager
+    def handle_span(self, command: GenericCommand[Any]) -> Iterator[Span]:
+        if self.sample_ratio < 1.0 and random.random() >= self.sample_ratio:
+            token = _command_span.set(INVALID_SPAN)
+            try:
+                yield INVALID_SPAN
+            finally:
+                _command_span.reset(token)
+            return
+
+        with self.tracer.start_as_current_span(
+            f"handle {command.metadata.name}", attributes=_attributes(command)
+        ) as span:
+            token = _command_span.set(span)
+            try:
+                yield span
+            finally:
+                _command_span.reset(token)
+
+    @contextmanager
+    def message_span(self, message: Message[Any]) -> Iterator[Span]:
+        command_span = _command_span.get()
+        if command_span is None or not command_span.is_recording():
+            yield INVALID_SPAN
+            return
+
+        links = (
+            [Link(command_span.get_span_context())]
+            if isinstance(message, GenericEvent)
+            else None
+        )
+        with self.tracer.start_as_current_span(
+            f"dispatch {message.metadata.name}",
+            attributes=_attributes(message),
+            links=links,
+        ) as span:
+            if message.metadata.published:
+                self._save_trace_context(message.message_id)
+            yield span
+
+    @contextmanager
+    def hook_span(self, handler_name: str, message: Message[Any]) -> Iterator[Span]:
+        command_span = _command_span.get()
+        if command_span is None or not command_span.is_recording():
+            yield INVALID_SPAN
+            return
+
+        with self.tracer.start_as_current_span(
+            handler_name, attributes=_attributes(message)
+        ) as span:
+            yield span
+
+    def _save_trace_context(self, message_id: MessageId) -> None:
+        carrier: dict[str, str] = {}
+        propagate.inject(carrier)
+        trace_contexts = self._trace_contexts
+        if len(trace_contexts) >= self.max_trace_contexts:
+            del trace_contexts[next(iter(trace_contexts))]
+        trace_contexts[message_id] = carrier
+
+    def pop_trace_context(self, message_id: MessageId) -> dict[str, str] | None:
+        """Return the trace context of a message, such as its ``traceparent``."""
+        return self._trace_contexts.pop(message_id, None)
+
+
+class OpenTelemetryMessageSerializer(AbstractMessageSerializer):
+    """
+    Add the trace context to the serialized messages.
+
+    The trace context, such as the ``traceparent``, is added next to the other
+    keys of the serialized message, in order to be sent as headers of
+    the message by the transport.
+
+    :param tracer: the tracer of the unit of work.
+    :param serializer: serialize the message, by default a
+        :class:`messagebus.service.eventstream.MessageSerializer`.
+    """
+
+    def __init__(
+        self,
+        tracer: OpenTelemetryTracer,
+        serializer: AbstractMessageSerializer | None = None,
+    ) -> None:
+        self.tracer = tracer
+        self.serializer = serializer or MessageSerializer()
+
+    def serialize_message(self, message: Message[Any]) -> Mapping[str, Any]:
+        serialized = self.serializer.serialize_message(message)
+        trace_context = self.tracer.pop_trace_context(message.message_id)
+        if trace_context:
+            return {**serialized, **trace_context}
+        return serialized
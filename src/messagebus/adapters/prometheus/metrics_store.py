@@ -1,16 +1,42 @@
 import abc
-from collections.abc import Iterator, Sequence
+import time
+from collections.abc import Hashable, Iterator, Sequence
 from contextlib import contextmanager
-from typing import Any, ClassVar
+from typing import Any, ClassVar, Generic, TypeVar
 
 from prometheus_client import REGISTRY, CollectorRegistry, Counter, Gauge
-from prometheus_client.metrics import Histogram
+from prometheus_client.metrics import Histogram, MetricWrapperBase
 
 from messagebus.domain.model import GenericCommand, Metadata, TransactionStatus
 from messagebus.ports.observability import AbstractMetricsStore
 
 DEFAULT_COMMAND_PROCESSING_SECONDS_BUCKETS = [0.01 * 2**x for x in range(10)]
 
+TMetric = TypeVar("TMetric", bound=MetricWrapperBase)
+
+
+class LabelsCache(Generic[TMetric]):
+    """
+    Keep the children of a metric, bound to their labels.
+
+    Binding labels takes a lock and converts every label value to a string,
+    the children are bound once and then looked up by a key.
+
+    :param metric: the metric with labels.
+    """
+
+    def __init__(self, metric: TMetric) -> None:
+        self.metric = metric
+        self.children: dict[Hashable, TMetric] = {}
+
+    def get(self, key: Hashable, *labelvalues: Any) -> TMetric:
+        """Return the child of the metric for the key, bound to the labels."""
+        try:
+            return self.children[key]
+        except KeyError:
+            child = self.children[key] = self.metric.labels(*labelvalues)
+            return child
+
 
 class Singleton(abc.ABCMeta):
     """
@@ -41,6 +67,9 @@ class MetricsStore(AbstractMetricsStore, metaclass=Singleton):
         command_processing_seconds_buckets: Sequence[
             float | str
         ] = DEFAULT_COMMAND_PROCESSING_SECONDS_BUCKETS,
+        handler_processing_seconds_buckets: Sequence[
+            float | str
+        ] = DEFAULT_COMMAND_PROCESSING_SECONDS_BUCKETS,
     ) -> None:
         self.transactions_started_total = Counter(
             name="messagebus_transactions_started_total",
@@ -82,6 +111,41 @@ class MetricsStore(AbstractMetricsStore, metaclass=Singleton):
             buckets=command_processing_seconds_buckets,
         )
 
+        self.handler_processing_seconds = Histogram(
+            name="messagebus_handler_processing_seconds",
+            documentation="Time spent in a service handler, per handled message",
+            labelnames=["handler", "name", "version"],
+            registry=registry,
+            buckets=handler_processing_seconds_buckets,
+        )
+
+        self.handler_failed_total = Counter(
+            name="messagebus_handler_failed_total",
+            documentation="Total number of service handler calls that raised an exception.",
+            labelnames=["handler", "name", "version"],
+            registry=registry,
+        )
+
+        self._transactions_closed = LabelsCache(self.transactions_closed_total)
+        self._messages_processed = LabelsCache(self.messages_processed_total)
+        self._command_processing = LabelsCache(self.command_processing_seconds)
+        self._handler_processing = LabelsCache(self.handler_processing_seconds)
+        self._handler_failed = LabelsCache(self.handler_failed_total)
+
+        self.eventstream_queue_full_total = Counter(
+            name="messagebus_eventstream_queue_full_total",
+            documentation="Total number of messages published while the queue of the background publisher was full.",
+            labelnames=["policy"],
+            registry=registry,
+        )
+
+        self.messages_replayed_total = Counter(
+            name="messagebus_messages_replayed_total",
+            documentation="Total number of messages read from the message store and replayed.",
+            labelnames=["replay"],
+            registry=registry,
+        )
+
     def inc_beginned_transaction_count(self) -> None:
         self.transactions_started_total.inc()
         self.transactions_in_progress.inc()
@@ -90,17 +154,41 @@ class MetricsStore(AbstractMetricsStore, metaclass=Singleton):
         self.transactions_failed_total.inc()
 
     def inc_transaction_closed_count(self, status: TransactionStatus) -> None:
-        self.transactions_closed_total.labels(status=status.name).inc()
+        self._transactions_closed.get(status, status.name).inc()
         self.transactions_in_progress.dec()
 
     def inc_messages_processed_total(self, msg_metadata: Metadata) -> None:
-        self.messages_processed_total.labels(
-            name=msg_metadata.name, version=msg_metadata.schema_version
-        ).inc()
+        name, version = msg_metadata.name, msg_metadata.schema_version
+        self._messages_processed.get((name, version), name, version).inc()
 
     @contextmanager
     def command_processing_timer(self, command: GenericCommand[Any]) -> Iterator[None]:
-        with self.command_processing_seconds.labels(
-            name=command.metadata.name, version=command.metadata.schema_version
-        ).time():
+        name, version = command.metadata.name, command.metadata.schema_version
+        histogram = self._command_processing.get((name, version), name, version)
+        start = time.perf_counter()
+        try:
             yield
+        finally:
+            histogram.observe(time.perf_counter() - start)
+
+    def observe_handler_processing_seconds(
+        self, handler_name: str, msg_metadata: Metadata, seconds: float
+    ) -> None:
+        name, version = msg_metadata.name, msg_metadata.schema_version
+        self._handler_processing.get(
+            (handler_name, name, version), handler_name, name, version
+        ).observe(seconds)
+
+    def inc_handler_failed_total(
+        self, handler_name: str, msg_metadata: Metadata
+    ) -> None:
+        name, version = msg_metadata.name, msg_metadata.schema_version
+        self._handler_failed.get(
+            (handler_name, name, version), handler_name, name, version
+        ).inc()
+
+    def inc_eventstream_queue_full_total(self, overflow_policy: str) -> None:
+        self.eventstream_queue_full_total.labels(policy=overflow_policy).inc()
+
+    def inc_messages_replayed_total(self, replay_name: str, count: int) -> None:
+        self.messages_replayed_total.labels(replay=replay_name).inc(count)
@@ -5,19 +5,82 @@ Message base classes.
 
 """
 
+import copy
+from collections.abc import Callable
 from datetime import datetime, timezone
+from functools import cache
 from typing import Any, Generic, TypeVar
 
 from lastuuid import uuid7
 from pydantic import BaseModel, Field
+from pydantic_core import PydanticUndefined
+from typing_extensions import Self
 
 from .ids import MessageId
 from .metadata import Metadata, TMetadata
 
+_CONTENT_EXCLUDE = {
+    "message_id",
+    "created_at",
+    "causation_id",
+    "correlation_id",
+    "metadata",
+}
+
+_MUTABLE_DEFAULTS = (list, dict, set)
+
+
+@cache
+def _content_fields(msg_type: type[BaseModel]) -> tuple[str, ...]:
+    """Fields that defines the content of a message."""
+    return tuple(name for name in msg_type.model_fields if name not in _CONTENT_EXCLUDE)
+
+
+def _hashable(value: Any) -> Any:
+    """Convert a value and its nested containers to a hashable value."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_hashable(val) for val in value)
+    if isinstance(value, dict):
+        return frozenset((key, _hashable(val)) for key, val in value.items())
+    if isinstance(value, set):
+        return frozenset(value)
+    if isinstance(value, BaseModel):
+        return (type(value), _hashable(list(value.__dict__.values())))
+    return value
+
+
+class _TrustedFields:
+    """Fields of a message class, prepared to build trusted messages."""
+
+    def __init__(self, msg_type: type["Message[Any]"]) -> None:
+        self.order = tuple(msg_type.model_fields)
+        self.names = set(self.order)
+        self.required: set[str] = set()
+        self.defaults: dict[str, Any] = {}
+        self.mutable_defaults: dict[str, Any] = {}
+        self.factories: dict[str, Callable[[], Any]] = {}
+        for name, field in msg_type.model_fields.items():
+            if field.default_factory is not None:
+                self.factories[name] = field.default_factory  # type: ignore
+            elif field.default is PydanticUndefined:
+                self.required.add(name)
+            elif isinstance(field.default, _MUTABLE_DEFAULTS):
+                self.mutable_defaults[name] = field.default
+            else:
+                self.defaults[name] = field.default
+        self.fast = not (
+            msg_type.__private_attributes__ or msg_type.__pydantic_post_init__
+        )
+
+
+_trusted_fields: dict[type["Message[Any]"], _TrustedFields] = {}
+
 
 class Message(BaseModel, Generic[TMetadata]):
     """Base class for messaging."""
 
+    __slots__ = ("_content_hash",)
+
     message_id: MessageId = Field(default_factory=lambda: MessageId(uuid7()))
     """Unique identifier of the message."""
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
@@ -26,6 +89,20 @@ class Message(BaseModel, Generic[TMetadata]):
 
     All messages are kept in order for observability, debug and event replay.
     """
+    causation_id: MessageId | None = None
+    """
+    Identifier of the message that caused this message.
+
+    Filled by the message bus with the message that was handled when the
+    event has been raised.
+    """
+    correlation_id: MessageId | None = None
+    """
+    Identifier of the command that started the cascade of messages.
+
+    Filled by the message bus, all the messages raised while handling a command
+    share its correlation id.
+    """
     metadata: TMetadata
     """
     Define extra fields used at serialization.
@@ -37,8 +114,58 @@ class Message(BaseModel, Generic[TMetadata]):
     metadata are defined statically at the definition of the message.
     """
 
+    @classmethod
+    def trusted(cls, **fields: Any) -> Self:
+        """
+        Build a message from trusted fields, without validating them.
+
+        Use it for messages built from already validated data, such as the events
+        raised by a domain model. The values are neither validated nor coerced,
+        they must have the type of their field. The message id and the creation
+        date are generated if they are not given.
+
+        :raises ValueError: if a required field is missing or a field is unknown.
+        """
+        try:
+            trusted_fields = _trusted_fields[cls]
+        except KeyError:
+            trusted_fields = _trusted_fields[cls] = _TrustedFields(cls)
+
+        keys = fields.keys()
+        if not (keys >= trusted_fields.required and keys <= trusted_fields.names):
+            missing = sorted(trusted_fields.required - keys)
+            unknown = sorted(keys - trusted_fields.names)
+            raise ValueError(
+                f"Invalid fields for {cls.__name__}: "
+                f"missing {missing}, unknown {unknown}"
+            )
+        if not trusted_fields.fast:
+            return cls.model_construct(**fields)
+
+        # the values are set in the order of the fields, as the validation does
+        defaults = trusted_fields.defaults
+        factories = trusted_fields.factories
+        mutable_defaults = trusted_fields.mutable_defaults
+        values: dict[str, Any] = {}
+        for name in trusted_fields.order:
+            if name in fields:
+                values[name] = fields[name]
+            elif name in defaults:
+                values[name] = defaults[name]
+            elif name in factories:
+                values[name] = factories[name]()
+            else:
+                values[name] = copy.copy(mutable_defaults[name])
+
+        message = cls.__new__(cls)
+        object.__setattr__(message, "__dict__", values)
+        object.__setattr__(message, "__pydantic_fields_set__", set(keys))
+        object.__setattr__(message, "__pydantic_extra__", None)
+        object.__setattr__(message, "__pydantic_private__", None)
+        return message
+
     def __repr__(self) -> str:
-        slf = self.model_dump(exclude={"message_id", "created_at", "metadata"})
+        slf = self.model_dump(exclude=_CONTENT_EXCLUDE)
         attrs = [f"{key}={val!r}" for key, val in slf.items()]
         return f"<{self.__class__.__name__} {' '.join(attrs)}>"
 
@@ -46,16 +173,57 @@ class Message(BaseModel, Generic[TMetadata]):
         """
         Message are equal if they have the same content
 
-        e.g. the message_id and the creation date can differ to be considered equals.
+        e.g. the message_id, the creation date and the causation and correlation ids
+        can differ to be considered equals.
 
         This message is usefull during unit tests to ensure that some message are
         properly generated without having complexity with dynamically generated content.
         """
+        if self is other:
+            return True
         if not isinstance(other, Message):
             return False
-        slf = self.model_dump(exclude={"message_id", "created_at"})
-        otr = other.model_dump(exclude={"message_id", "created_at"})
-        return slf == otr
+        # metadata are shared by the messages of a class, they are rarely dumped
+        if self.metadata is not other.metadata and self.metadata != other.metadata:
+            return False
+        fields = _content_fields(type(self))
+        if type(other) is not type(self) and fields != _content_fields(type(other)):
+            return False
+        slf, otr = self.__dict__, other.__dict__
+        for name in fields:
+            if slf[name] != otr[name]:
+                return False
+        return True
+
+    def __hash__(self) -> int:
+        """
+        Hash the content of the message, consistently with the equality.
+
+        Messages can be deduplicated in sets and used as dict keys, as long as they
+        are not mutated. The hash of frozen messages is computed once.
+        """
+        frozen = self.model_config.get("frozen")
+        if frozen:
+            try:
+                # read the slot, an unset slot fallbacks to the slow __getattr__
+                return _content_hash_slot.__get__(self)  # type: ignore
+            except AttributeError:
+                pass
+        metadata = self.metadata
+        slf = self.__dict__
+        values = [slf[name] for name in _content_fields(type(self))]
+        try:
+            content_hash = hash((metadata.name, metadata.schema_version, *values))
+        except TypeError:
+            content_hash = hash(
+                (metadata.name, metadata.schema_version, _hashable(values))
+            )
+        if frozen:
+            _content_hash_slot.__set__(self, content_hash)
+        return content_hash
+
+
+_content_hash_slot = Message.__dict__["_content_hash"]
 
 
 class GenericCommand(Message[TMetadata]):
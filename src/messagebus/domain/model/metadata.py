@@ -3,16 +3,23 @@ Metadata attribute for commands and events.
 
 """
 
-from typing import TypeVar
+from typing import Any, TypeVar
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+from typing_extensions import Self
 
 
 class Metadata(BaseModel):
     """
     Every message, commands and event have metadata used and sends while serialization.
+
+    Metadata are declared once, as the default value of the message class, and are
+    frozen. They are hashable, and shared by all the messages of the class instead
+    of being copied for every message.
     """
 
+    model_config = ConfigDict(frozen=True)
+
     name: str = Field(...)
     """
     Name of the schema.
@@ -38,5 +45,12 @@ class Metadata(BaseModel):
     changes.
     """
 
+    def __copy__(self) -> Self:
+        return self
+
+    def __deepcopy__(self, memo: dict[int, Any] | None = None) -> Self:
+        # pydantic deep copies the default values for every new model
+        return self
+
 
 TMetadata = TypeVar("TMetadata", bound=Metadata)
@@ -6,7 +6,8 @@ Message base classes.
 """
 
 from collections.abc import MutableSequence
-from typing import Any, Generic
+from functools import cache
+from typing import Any, ClassVar, Generic
 
 from pydantic import BaseModel, Field
 
@@ -14,9 +15,29 @@ from .message import Message
 from .metadata import Metadata, TMetadata
 
 
+@cache
+def _state_fields(model_type: type[BaseModel]) -> tuple[str, ...]:
+    """Fields that defines the state of a model, without its messages."""
+    return tuple(name for name in model_type.model_fields if name != "messages")
+
+
 class GenericModel(BaseModel, Generic[TMetadata]):
     """Base class for model."""
 
+    __slots__ = ("_dirty_fields",)
+
+    track_changes: ClassVar[bool] = False
+    """
+    Record the fields assigned after the model has been built.
+
+    Repositories use the :attr:`dirty_fields` to write the changes only.
+    The dirty fields are reset after the commit of the unit of work for the
+    models kept in the identity map, so it requires repositories that set
+    ``use_identity_map``, otherwise, the repository has to call
+    :meth:`mark_clean` once the changes are written.
+    Changes inside a mutable field, such as a list, are not recorded.
+    """
+
     messages: MutableSequence[Message[TMetadata]] = Field(
         default_factory=list, exclude=True
     )
@@ -27,6 +48,31 @@ class GenericModel(BaseModel, Generic[TMetadata]):
     by the unit of work during the process of an original command.
     """
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if self.track_changes and name in _state_fields(type(self)):
+            try:
+                dirty_fields = _dirty_fields_slot.__get__(self)
+            except AttributeError:
+                dirty_fields = set()
+                _dirty_fields_slot.__set__(self, dirty_fields)
+            dirty_fields.add(name)
+
+    @property
+    def dirty_fields(self) -> frozenset[str]:
+        """Fields assigned since the model has been built or marked as clean."""
+        try:
+            return frozenset(_dirty_fields_slot.__get__(self))
+        except AttributeError:
+            return frozenset()
+
+    def mark_clean(self) -> None:
+        """Forget the dirty fields, once the changes have been written."""
+        try:
+            _dirty_fields_slot.__delete__(self)
+        except AttributeError:
+            pass
+
     def __repr__(self) -> str:
         slf = self.model_dump(exclude={"messages"})
         attrs = [f"{key}={val!r}" for key, val in slf.items()]
@@ -37,9 +83,13 @@ class GenericModel(BaseModel, Generic[TMetadata]):
     def __eq__(self, other: Any) -> bool:
         if not isinstance(other, self.__class__):
             return False
-        slf = self.model_dump()
-        otr = other.model_dump()
-        return slf == otr
+        slf, otr = self.__dict__, other.__dict__
+        for name in _state_fields(type(self)):
+            if slf[name] != otr[name]:
+                return False
+        return True
+
 
+_dirty_fields_slot = GenericModel.__dict__["_dirty_fields"]
 
 Model = GenericModel[Metadata]
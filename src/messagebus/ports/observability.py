@@ -1,12 +1,24 @@
 import abc
 from collections.abc import Iterator
-from contextlib import contextmanager
+from contextlib import AbstractContextManager, contextmanager, nullcontext
 from typing import Any, TypeVar
 
-from messagebus.domain.model import GenericCommand, Metadata, TransactionStatus
+from messagebus.domain.model import (
+    GenericCommand,
+    Message,
+    Metadata,
+    TransactionStatus,
+)
 
 
 class AbstractMetricsStore(abc.ABC):
+    track_handlers: bool = True
+    """
+    Time every service handler call.
+
+    When False, the handler hooks are not called and handlers are not timed.
+    """
+
     @abc.abstractmethod
     def inc_beginned_transaction_count(self) -> None: ...
 
@@ -25,8 +37,26 @@ class AbstractMetricsStore(abc.ABC):
         self, command: GenericCommand[Any]
     ) -> Iterator[None]: ...
 
+    def observe_handler_processing_seconds(  # noqa: B027
+        self, handler_name: str, msg_metadata: Metadata, seconds: float
+    ) -> None:
+        """Observe the duration of a service handler call, by default, do nothing."""
+
+    def inc_handler_failed_total(  # noqa: B027
+        self, handler_name: str, msg_metadata: Metadata
+    ) -> None:
+        """Count a service handler call that raised, by default, do nothing."""
+
+    def inc_eventstream_queue_full_total(self, overflow_policy: str) -> None:  # noqa: B027
+        """Count a message sent to a full eventstream queue, by default, do nothing."""
+
+    def inc_messages_replayed_total(self, replay_name: str, count: int) -> None:  # noqa: B027
+        """Count the messages replayed by a replay, by default, do nothing."""
+
 
 class SinkholeMetricsStore(AbstractMetricsStore):
+    track_handlers = False
+
     def inc_beginned_transaction_count(self) -> None: ...
 
     def inc_transaction_failed(self) -> None: ...
@@ -41,3 +71,42 @@ class SinkholeMetricsStore(AbstractMetricsStore):
 
 
 TMetricsStore = TypeVar("TMetricsStore", bound=AbstractMetricsStore)
+
+
+class AbstractTracer(abc.ABC):
+    """Trace the messages handled by the bus."""
+
+    trace_hooks: bool = False
+    """Trace every service handler call, in addition to the messages."""
+
+    @abc.abstractmethod
+    def handle_span(self, command: GenericCommand[Any]) -> AbstractContextManager[Any]:
+        """Trace the handling of a command, and of all the events it raises."""
+
+    @abc.abstractmethod
+    def message_span(self, message: Message[Any]) -> AbstractContextManager[Any]:
+        """Trace the dispatch of a message to its service handlers."""
+
+    @abc.abstractmethod
+    def hook_span(
+        self, handler_name: str, message: Message[Any]
+    ) -> AbstractContextManager[Any]:
+        """Trace a service handler call, if :attr:`trace_hooks` is True."""
+
+
+_nullcontext = nullcontext()
+
+
+class SinkholeTracer(AbstractTracer):
+    """Trace nothing."""
+
+    def handle_span(self, command: GenericCommand[Any]) -> AbstractContextManager[Any]:
+        return _nullcontext
+
+    def message_span(self, message: Message[Any]) -> AbstractContextManager[Any]:
+        return _nullcontext
+
+    def hook_span(
+        self, handler_name: str, message: Message[Any]
+    ) -> AbstractContextManager[Any]:
+        return _nullcontext
@@ -0,0 +1,108 @@
+"""
+Consume the eventstream.
+
+Messages published by other services are received by batch, deserialized,
+then dispatched to the listeners of the message bus.
+"""
+
+import logging
+from collections.abc import Callable, Mapping
+from typing import Any, Generic
+
+from messagebus.domain.model import Message
+from messagebus.service._async.eventstream import AsyncAbstractEventstreamReceiver
+from messagebus.service._async.registry import AsyncMessageBus
+from messagebus.service._async.unit_of_work import TAsyncUow
+from messagebus.service.concurrency import async_gather, async_sleep
+from messagebus.service.message_registry import MessageDeserializer
+
+log = logging.getLogger(__name__)
+
+
+class AsyncEventstreamConsumer(Generic[TAsyncUow]):
+    """
+    Handle the messages received from the eventstream with the message bus.
+
+    Every message is handled in its own unit of work transaction.
+    Messages of a type that has no listener in the bus are acknowledged and
+    ignored, messages that fail are logged and not acknowledged.
+
+    :param bus: the message bus that handle the messages.
+    :param uow_factory: create a unit of work, a unit of work is created for
+        every message handled concurrently.
+    :param receiver: receive the messages from the eventstream.
+    :param deserializer: build the messages, by default, a
+        :class:`messagebus.MessageDeserializer` of the bus message types.
+    :param batch_size: maximum number of messages received at once.
+    :param concurrency: maximum number of messages handled concurrently.
+        The order of the messages is kept only with a concurrency of 1.
+    :param poll_interval: seconds to wait when there is no message to consume.
+    """
+
+    def __init__(
+        self,
+        bus: AsyncMessageBus[TAsyncUow],
+        uow_factory: Callable[[], TAsyncUow],
+        receiver: AsyncAbstractEventstreamReceiver,
+        deserializer: MessageDeserializer | None = None,
+        batch_size: int = 100,
+        concurrency: int = 1,
+        poll_interval: float = 1.0,
+    ) -> None:
+        self.bus = bus
+        self.uow_factory = uow_factory
+        self.receiver = receiver
+        self.deserializer = deserializer or MessageDeserializer(bus.message_types)
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.consumed_count = 0
+        self._running = False
+
+    async def _consume_message(self, serialized: Mapping[str, Any]) -> bool:
+        try:
+            message = self.deserializer.deserialize_message(serialized)
+            if message is not None:
+                await self._handle(message)
+        except Exception:
+            log.exception("Failed to consume message %s", serialized.get("id"))
+            return False
+        return True
+
+    async def _handle(self, message: Message[Any]) -> None:
+        async with self.uow_factory() as tuow:
+            await self.bus.receive(message, tuow)
+            await tuow.commit()
+
+    async def consume(self) -> int:
+        """Consume one batch of messages and return its size."""
+        batch = await self.receiver.receive_messages_serialized(self.batch_size)
+        consumed: list[Mapping[str, Any]] = []
+        for idx in range(0, len(batch), self.concurrency):
+            chunk = batch[idx : idx + self.concurrency]
+            results = await async_gather(
+                *[self._consume_message(serialized) for serialized in chunk]
+            )
+            consumed.extend(
+                serialized for serialized, ok in zip(chunk, results, strict=True) if ok
+            )
+        if consumed:
+            await self.receiver.acknowledge(consumed)
+        self.consumed_count += len(consumed)
+        return len(batch)
+
+    async def run(self) -> None:
+        """Consume the eventstream until :meth:`stop` is called."""
+        self._running = True
+        while self._running:
+            try:
+                count = await self.consume()
+            except Exception:
+                log.exception("Failed to consume the eventstream")
+                count = 0
+            if self._running and count < self.batch_size:
+                await async_sleep(self.poll_interval)
+
+    def stop(self) -> None:
+        """Stop the consumer after the current batch."""
+        self._running = False
@@ -1,9 +1,14 @@
 import abc
-from collections.abc import Mapping, Sequence
-from typing import Any, Generic
+import time
+from collections.abc import Iterator, Mapping, MutableMapping, Sequence
+from typing import Any, ClassVar, Generic
 
 from messagebus.domain.model.message import TMessage
-from messagebus.service._async.unit_of_work import TAsyncUow
+from messagebus.service._async.unit_of_work import (
+    AsyncUnitOfWorkTransaction,
+    TAsyncUow,
+)
+from messagebus.service.dependency import DependencyLifetime
 from messagebus.typing import AsyncMessageHandler, P
 
 
@@ -14,6 +19,9 @@ class MissingDependencyError(RuntimeError):
 class AsyncDependency(abc.ABC):
     """Describe an async dependency"""
 
+    lifetime: ClassVar[DependencyLifetime] = DependencyLifetime.transaction
+    """Define when the message bus create a new instance of the dependency."""
+
     @abc.abstractmethod
     async def on_after_commit(self) -> None:
         """Method called when the unit of work transaction is has been commited."""
@@ -23,20 +31,96 @@ class AsyncDependency(abc.ABC):
         """Method called when the unit of work transaction is has been rolled back."""
 
 
+class AsyncDependencyResolver(Mapping[str, Any]):
+    """
+    Instanciate the dependencies of the bus when a service handler request them.
+
+    Only instanciated dependencies are attached to the transaction in order to be
+    notified after the commit or the rollback.
+
+    :param factories: dependencies classes registered in the bus.
+    :param singletons: dependencies instances that lived with the bus.
+    :param uow: the transaction where the dependencies are used.
+    :param transient_dependencies: instances of dependencies passed to the handle.
+    """
+
+    def __init__(
+        self,
+        factories: Mapping[str, type[AsyncDependency]],
+        singletons: MutableMapping[str, AsyncDependency],
+        uow: AsyncUnitOfWorkTransaction[Any],
+        transient_dependencies: Mapping[str, Any],
+    ) -> None:
+        self.factories = factories
+        self.singletons = singletons
+        self.uow = uow
+        self.transient_dependencies = transient_dependencies
+        self._message_dependencies: dict[str, AsyncDependency] = {}
+
+    def clear_message_dependencies(self) -> None:
+        """Drop dependencies that have the lifetime of a message."""
+        if self._message_dependencies:
+            self._message_dependencies = {}
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.transient_dependencies:
+            return self.transient_dependencies[key]
+        if key in self._message_dependencies:
+            return self._message_dependencies[key]
+
+        factory = self.factories[key]
+        lifetime = getattr(factory, "lifetime", DependencyLifetime.transaction)
+        if lifetime == DependencyLifetime.message:
+            dependency = self.uow.add_listener(factory())
+            self._message_dependencies[key] = dependency
+            return dependency
+
+        transaction_dependencies = self.uow._dependencies
+        if factory not in transaction_dependencies:
+            if lifetime == DependencyLifetime.singleton:
+                if key not in self.singletons:
+                    self.singletons[key] = factory()
+                dependency = self.singletons[key]
+            else:
+                dependency = factory()
+            transaction_dependencies[factory] = self.uow.add_listener(dependency)
+        return transaction_dependencies[factory]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.transient_dependencies or key in self.factories
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.transient_dependencies
+        for key in self.factories:
+            if key not in self.transient_dependencies:
+                yield key
+
+    def __len__(self) -> int:
+        return len(set(self.factories) | set(self.transient_dependencies))
+
+
 class AsyncMessageHook(Generic[TMessage, TAsyncUow, P]):
     callback: AsyncMessageHandler[TMessage, "TAsyncUow", P]
     dependencies: Sequence[str]
     optional_dependencies: Sequence[str]
+    concurrent: bool
 
     def __init__(
         self,
         callback: AsyncMessageHandler[TMessage, "TAsyncUow", P],
         dependencies: Sequence[str],
         optional_dependencies: Sequence[str],
+        concurrent: bool = False,
     ) -> None:
         self.callback = callback
         self.dependencies = dependencies
         self.optional_dependencies = optional_dependencies
+        self.concurrent = concurrent
+        self.name = (
+            f"{getattr(callback, '__module__', '')}."
+            f"{getattr(callback, '__qualname__', repr(callback))}"
+        )
+        self._has_dependencies = bool(dependencies or optional_dependencies)
 
     async def __call__(
         self,
@@ -44,6 +128,41 @@ class AsyncMessageHook(Generic[TMessage, TAsyncUow, P]):
         uow: "TAsyncUow",
         dependencies: Mapping[str, AsyncDependency],
     ) -> Any:
+        tracer = uow.tracer
+        if tracer.trace_hooks:
+            with tracer.hook_span(self.name, msg):
+                return await self._observed_call(msg, uow, dependencies)
+        return await self._observed_call(msg, uow, dependencies)
+
+    async def _observed_call(
+        self,
+        msg: TMessage,
+        uow: "TAsyncUow",
+        dependencies: Mapping[str, AsyncDependency],
+    ) -> Any:
+        metrics_store = uow.metrics_store
+        if not metrics_store.track_handlers:
+            return await self._call(msg, uow, dependencies)
+
+        start = time.perf_counter()
+        try:
+            return await self._call(msg, uow, dependencies)
+        except Exception:
+            metrics_store.inc_handler_failed_total(self.name, msg.metadata)
+            raise
+        finally:
+            metrics_store.observe_handler_processing_seconds(
+                self.name, msg.metadata, time.perf_counter() - start
+            )
+
+    async def _call(
+        self,
+        msg: TMessage,
+        uow: "TAsyncUow",
+        dependencies: Mapping[str, AsyncDependency],
+    ) -> Any:
+        if not self._has_dependencies:
+            return await self.callback(msg, uow)  # type: ignore
         try:
             deps = {k: dependencies[k] for k in self.dependencies}
         except KeyError as key:
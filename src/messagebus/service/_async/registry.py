@@ -7,8 +7,9 @@ import importlib
 import inspect
 import logging
 from collections import defaultdict
-from collections.abc import Mapping
-from typing import Any, Generic, cast
+from collections.abc import Callable, Iterable, Iterator, Mapping, MutableSequence
+from pathlib import Path
+from typing import Any, Generic, NamedTuple, cast, overload
 
 import venusian
 
@@ -16,11 +17,26 @@ from messagebus.domain.model import GenericCommand, GenericEvent, Message
 from messagebus.domain.model.message import TMessage
 from messagebus.service._async.dependency import (
     AsyncDependency,
+    AsyncDependencyResolver,
     AsyncMessageHandler,
     AsyncMessageHook,
     P,
 )
 from messagebus.service._async.unit_of_work import AsyncUnitOfWorkTransaction, TAsyncUow
+from messagebus.service.concurrency import async_gather
+from messagebus.service.dispatch_queue import DispatchQueueFactory, FifoDispatchQueue
+from messagebus.service.manifest import (
+    LazyHandler,
+    ListenerManifest,
+    RegistryManifest,
+    import_path,
+    read_manifest,
+    resolve_import_path,
+    write_manifest,
+)
+from messagebus.service.message_registry import (
+    MessageTypeRegistry,
+)
 
 log = logging.getLogger(__name__)
 VENUSIAN_CATEGORY = "messagebus"
@@ -30,34 +46,122 @@ class ConfigurationError(RuntimeError):
     """Prevents bad usage of the add_listener."""
 
 
+@overload
 def async_listen(
     wrapped: AsyncMessageHandler[TMessage, TAsyncUow, P],
-) -> AsyncMessageHandler[TMessage, TAsyncUow, P]:
+) -> AsyncMessageHandler[TMessage, TAsyncUow, P]: ...
+
+
+@overload
+def async_listen(
+    *,
+    concurrent: bool = False,
+) -> Callable[
+    [AsyncMessageHandler[TMessage, TAsyncUow, P]],
+    AsyncMessageHandler[TMessage, TAsyncUow, P],
+]: ...
+
+
+def async_listen(
+    wrapped: AsyncMessageHandler[TMessage, TAsyncUow, P] | None = None,
+    *,
+    concurrent: bool = False,
+) -> Any:
     """
     Decorator to listen for a command or an event.
 
     Note that you can handle one listener for a command, and many for events.
     The command handler result is returned by the handle call of the message bus.
+
+    :param concurrent: for event listeners only, run the listener concurrently
+        with the other concurrent listeners of the same event.
+        See :meth:`AsyncMessageBus.add_listener`.
     """
 
-    def callback(
-        scanner: venusian.Scanner,
-        name: str,
-        ob: AsyncMessageHandler[TMessage, TAsyncUow, P],
-    ) -> None:
-        if not hasattr(scanner, VENUSIAN_CATEGORY):
-            return  # coverage: ignore
-        argsspec = inspect.getfullargspec(ob)
-        msg_type = argsspec.annotations[argsspec.args[0]]
-        scanner.messagebus.add_listener(msg_type, wrapped)  # type: ignore
+    def decorator(
+        wrapped: AsyncMessageHandler[TMessage, TAsyncUow, P],
+        depth: int = 1,
+    ) -> AsyncMessageHandler[TMessage, TAsyncUow, P]:
+        def callback(
+            scanner: venusian.Scanner,
+            name: str,
+            ob: AsyncMessageHandler[TMessage, TAsyncUow, P],
+        ) -> None:
+            if not hasattr(scanner, VENUSIAN_CATEGORY):
+                return  # coverage: ignore
+            argsspec = inspect.getfullargspec(ob)
+            msg_type = argsspec.annotations[argsspec.args[0]]
+            scanner.messagebus.add_listener(  # type: ignore
+                msg_type, wrapped, concurrent=concurrent
+            )
+
+        venusian.attach(  # type: ignore
+            wrapped, callback, category=VENUSIAN_CATEGORY, depth=depth
+        )
+        return wrapped
+
+    if wrapped is None:
+        return decorator
+    return decorator(wrapped, depth=2)
 
-    venusian.attach(wrapped, callback, category=VENUSIAN_CATEGORY)  # type: ignore
-    return wrapped
+
+def _caused_by(
+    message: Message[Any], events: Iterable[Message[Any]]
+) -> Iterator[Message[Any]]:
+    """Set the causation and the correlation ids of the events raised."""
+    for event in events:
+        # the ids are not part of the content of frozen messages
+        fields = event.__dict__
+        if fields["causation_id"] is None:
+            fields["causation_id"] = message.message_id
+        if fields["correlation_id"] is None:
+            fields["correlation_id"] = message.correlation_id
+        yield event
+
+
+async def _call_collecting(
+    msghook: AsyncMessageHook[Any, Any, Any],
+    message: Message[Any],
+    uow: AsyncUnitOfWorkTransaction[Any],
+    dependencies: AsyncDependencyResolver,
+) -> list[Message[Any]]:
+    """
+    Call a hook of a concurrent group and collect the events raised once it is done.
+
+    Every hook of the group gets its own buffer, the buffers are then consumed
+    in the order the hooks have been registered, whatever the order the hooks
+    complete. An event raised by a hook which is still running is collected by
+    the next hook to complete.
+    """
+    await msghook(message, uow, dependencies)
+    return list(uow.uow.collect_new_events())
+
+
+class AsyncDispatchPlan(NamedTuple):
+    """Hooks to call for a given message type, compiled by the message bus."""
+
+    is_command: bool
+    """True if the message type is a command."""
+    steps: tuple[tuple[AsyncMessageHook[Any, Any, Any], ...], ...]
+    """
+    Hooks to call, in the order they have been registered.
+
+    Consecutive concurrent hooks are grouped in the same step.
+    """
 
 
 class AsyncMessageBus(Generic[TAsyncUow]):
     """Store all the handlers for commands an events."""
 
+    dispatch_queue_factory: DispatchQueueFactory = FifoDispatchQueue
+    """
+    Create the queue of messages to dispatch while handling a command.
+
+    Override it to change the order of the dispatched events, using a
+    :class:`messagebus.PriorityDispatchQueue` wrapped in a ``functools.partial``
+    for instance.
+    """
+
     def __init__(self, **dependencies: Any) -> None:
         self.commands_registry: dict[
             type[GenericCommand[Any]], AsyncMessageHook[Any, Any, Any]
@@ -68,10 +172,33 @@ class AsyncMessageBus(Generic[TAsyncUow]):
         self.dependencies = cast(
             Mapping[str, type[AsyncDependency]], dependencies or {}
         )
+        self._dispatch_plans: dict[type[Message[Any]], AsyncDispatchPlan] = {}
+        self._singletons: dict[str, AsyncDependency] = {}
+        self.message_types = MessageTypeRegistry()
+        """Types of the listened messages, used to deserialize them."""
+        self.scanned_modules: list[str] = []
+        """Modules scanned, or loaded from a manifest, in order."""
+        self._scanning = False
+        self._scanned_hooks: list[
+            tuple[type[Message[Any]], AsyncMessageHook[Any, Any, Any]]
+        ] = []
 
     def add_listener(
-        self, msg_type: type[Message[Any]], callback: AsyncMessageHandler[Any, Any, P]
+        self,
+        msg_type: type[Message[Any]],
+        callback: AsyncMessageHandler[Any, Any, P],
+        concurrent: bool = False,
     ) -> None:
+        """
+        Register a listener for a command or an event.
+
+        :param msg_type: the type of the message to listen.
+        :param callback: the service handler.
+        :param concurrent: for event listeners only. Consecutive concurrent
+            listeners of the same event are awaited concurrently, and the events
+            they raise are collected once all of them are done.
+            Concurrent listeners must not depend on each other's writes.
+        """
         signature = inspect.signature(callback)
         dependencies: list[str] = []
         optional_dependencies: list[str] = []
@@ -87,8 +214,23 @@ class AsyncMessageBus(Generic[TAsyncUow]):
                 else:
                     optional_dependencies.append(key)
 
-        msghook = AsyncMessageHook(callback, dependencies, optional_dependencies)
+        msghook = AsyncMessageHook(
+            callback, dependencies, optional_dependencies, concurrent
+        )
+        self._add_hook(msg_type, msghook)
+
+    def _add_hook(
+        self, msg_type: type[Message[Any]], msghook: AsyncMessageHook[Any, Any, Any]
+    ) -> None:
+        concurrent = msghook.concurrent
+        if issubclass(msg_type, Message):
+            self.message_types.register(msg_type)
+        self._dispatch_plans.clear()
         if issubclass(msg_type, GenericCommand):
+            if concurrent:
+                raise ConfigurationError(
+                    f"{msg_type} command cannot be listened concurrently"
+                )
             if msg_type in self.commands_registry:
                 raise ConfigurationError(
                     f"{msg_type} command has been registered twice"
@@ -101,20 +243,24 @@ class AsyncMessageBus(Generic[TAsyncUow]):
                 f"Invalid usage of the listen decorator: "
                 f"type {msg_type} should be a command or an event"
             )
+        if self._scanning:
+            self._scanned_hooks.append((msg_type, msghook))
 
     def remove_listener(
         self, msg_type: type, callback: AsyncMessageHandler[Any, Any, P]
     ) -> None:
+        self._dispatch_plans.clear()
         if issubclass(msg_type, GenericCommand):
             if msg_type not in self.commands_registry:
                 raise ConfigurationError(f"{msg_type} command has not been registered")
-            del self.commands_registry[msg_type]
+            removed = self.commands_registry.pop(msg_type)
         elif issubclass(msg_type, GenericEvent):
             msg_hooks = [
                 v for v in self.events_registry[msg_type] if v.callback == callback
             ]
             if msg_hooks:
-                self.events_registry[msg_type].remove(msg_hooks[0])
+                removed = msg_hooks[0]
+                self.events_registry[msg_type].remove(removed)
             else:
                 raise ConfigurationError(f"{msg_type} event has not been registered")
         else:
@@ -122,40 +268,79 @@ class AsyncMessageBus(Generic[TAsyncUow]):
                 f"Invalid usage of the listen decorator: "
                 f"type {msg_type} should be a command or an event"
             )
+        self._scanned_hooks = [
+            (scanned_type, hook)
+            for scanned_type, hook in self._scanned_hooks
+            if hook is not removed
+        ]
+
+    def _compile_dispatch_plan(self, message: Message[Any]) -> AsyncDispatchPlan:
+        msg_type = type(message)
+        if issubclass(msg_type, GenericCommand):
+            cmdhook = self.commands_registry.get(msg_type)
+            plan = AsyncDispatchPlan(True, ((cmdhook,),) if cmdhook else ())
+        elif issubclass(msg_type, GenericEvent):
+            steps: list[tuple[AsyncMessageHook[Any, Any, Any], ...]] = []
+            for hook in self.events_registry.get(msg_type, []):
+                if hook.concurrent and steps and steps[-1][-1].concurrent:
+                    steps[-1] = (*steps[-1], hook)
+                else:
+                    steps.append((hook,))
+            plan = AsyncDispatchPlan(False, tuple(steps))
+        else:
+            raise RuntimeError(f"{message} was not an Event or Command")
+        self._dispatch_plans[msg_type] = plan
+        return plan
+
+    def _resolve_dependencies(
+        self,
+        uow: AsyncUnitOfWorkTransaction[TAsyncUow],
+        transient_dependencies: Mapping[str, Any],
+    ) -> AsyncDependencyResolver:
+        if transient_dependencies:
+            [uow.add_listener(d) for d in transient_dependencies.values()]
+        return AsyncDependencyResolver(
+            self.dependencies, self._singletons, uow, transient_dependencies
+        )
 
     async def _handle(
         self,
         command: GenericCommand[Any],
         uow: AsyncUnitOfWorkTransaction[TAsyncUow],
-        **transient_dependencies: Any,
+        dependencies: AsyncDependencyResolver,
+        processed_messages: MutableSequence[Message[Any]],
     ) -> Any:
-        dependencies = {k: uow.add_listener(v()) for k, v in self.dependencies.items()}
-        if transient_dependencies:
-            [uow.add_listener(d) for d in transient_dependencies.values()]
-            dependencies.update(transient_dependencies)
-        queue: list[Message[Any]] = [command]
+        queue = self.dispatch_queue_factory()
+        queue.append(command)
         idx = 0
         ret = None
+        dispatch_plans = self._dispatch_plans
+        tracer = uow.tracer
         while queue:
-            message = queue.pop(0)
-            if not isinstance(message, GenericCommand | GenericEvent):
-                raise RuntimeError(f"{message} was not an Event or Command")
-            msg_type = type(message)
-
+            message = queue.popleft()
+            plan = dispatch_plans.get(type(message)) or self._compile_dispatch_plan(
+                message
+            )
+            if idx == 0 and message.correlation_id is None:
+                message.__dict__["correlation_id"] = message.message_id
             uow.metrics_store.inc_messages_processed_total(message.metadata)
-
-            if msg_type in self.commands_registry:
-                cmdret = await self.commands_registry[msg_type](  # type: ignore
-                    cast(GenericCommand[Any], message), uow, dependencies
-                )
-                if idx == 0:
-                    ret = cmdret
-                queue.extend(uow.uow.collect_new_events())
-            elif msg_type in self.events_registry:
-                for msghook in self.events_registry[msg_type]:  # type: ignore
-                    await msghook(cast(GenericEvent[Any], message), uow, dependencies)
-                    queue.extend(uow.uow.collect_new_events())
-            await uow.messagestore.add(message)
+            dependencies.clear_message_dependencies()
+            with tracer.message_span(message):
+                for step in plan.steps:
+                    if len(step) == 1:
+                        hookret = await step[0](message, uow, dependencies)
+                        if idx == 0 and plan.is_command:
+                            ret = hookret
+                    else:
+                        for events in await async_gather(
+                            *(
+                                _call_collecting(msghook, message, uow, dependencies)
+                                for msghook in step
+                            )
+                        ):
+                            queue.extend(_caused_by(message, events))
+                    queue.extend(_caused_by(message, uow.uow.collect_new_events()))
+            processed_messages.append(message)
             idx += 1
         return ret
 
@@ -171,12 +356,130 @@ class AsyncMessageBus(Generic[TAsyncUow]):
 
         :param message: The message to handle, should be a command.
         """
-        with uow.metrics_store.command_processing_timer(command):
-            return await self._handle(command, uow, **transient_dependencies)
+        dependencies = self._resolve_dependencies(uow, transient_dependencies)
+        processed_messages: list[Message[Any]] = []
+        with (
+            uow.tracer.handle_span(command),
+            uow.metrics_store.command_processing_timer(command),
+        ):
+            ret = await self._handle(command, uow, dependencies, processed_messages)
+            await uow.messagestore.add_many(processed_messages)
+        return ret
+
+    async def handle_many(
+        self,
+        commands: Iterable[GenericCommand[Any]],
+        uow: AsyncUnitOfWorkTransaction[TAsyncUow],
+        *,
+        return_exceptions: bool = False,
+        **transient_dependencies: Any,
+    ) -> list[Any]:
+        """
+        Handle many commands in the same unit of work transaction.
+
+        Dependencies are resolved once for all the commands, and all the processed
+        messages are added to the message store in one call, after the last command.
+
+        Return the result of every command handler, in the order of the commands.
+
+        :param commands: The commands to handle.
+        :param return_exceptions: if True, an exception raised while handling
+            a command is returned in place of its result and the next commands
+            are handled. All the messages of the failing command, including the
+            command itself and the events already processed, are dropped: they
+            are neither stored nor published. The repository writes done before
+            the failure are not rolled back, the unit of work has no savepoint;
+            roll back the transaction if they must not be committed.
+            Otherwise, the exception is raised and no message is added to the
+            message store.
+        """
+        dependencies = self._resolve_dependencies(uow, transient_dependencies)
+        processed_messages: list[Message[Any]] = []
+        results: list[Any] = []
+        for command in commands:
+            start = len(processed_messages)
+            try:
+                with (
+                    uow.tracer.handle_span(command),
+                    uow.metrics_store.command_processing_timer(command),
+                ):
+                    ret = await self._handle(
+                        command, uow, dependencies, processed_messages
+                    )
+            except Exception as exc:
+                if not return_exceptions:
+                    raise
+                # drop the messages of the failing command, processed or not
+                del processed_messages[start:]
+                for _ in uow.uow.collect_new_events():
+                    pass
+                results.append(exc)
+            else:
+                results.append(ret)
+        await uow.messagestore.add_many(processed_messages)
+        return results
+
+    async def receive(
+        self,
+        message: Message[Any],
+        uow: AsyncUnitOfWorkTransaction[TAsyncUow],
+        **transient_dependencies: Any,
+    ) -> None:
+        """
+        Dispatch a message received from the eventstream to its listeners.
+
+        The received message has been stored and published by the service that
+        raised it, so it is not added to the message store, and not published
+        again. The events raised by the listeners are dispatched, stored and
+        published, like while handling a command.
+
+        :param message: The received message, usually an event.
+        """
+        dependencies = self._resolve_dependencies(uow, transient_dependencies)
+        processed_messages: list[Message[Any]] = []
+        await self._handle(
+            cast(GenericCommand[Any], message), uow, dependencies, processed_messages
+        )
+        await uow.messagestore.add_many(processed_messages[1:])
+
+    async def replay(
+        self,
+        messages: Iterable[Message[Any]],
+        uow: AsyncUnitOfWorkTransaction[TAsyncUow],
+        **transient_dependencies: Any,
+    ) -> None:
+        """
+        Dispatch messages read from the message store to their listeners.
+
+        Used to rebuild read models, the bus should only have the listeners
+        of the read models to rebuild.
+        Replayed messages are not added to the message store again, and the events
+        raised by the listeners are dropped, since the message store already
+        contains the events raised when the messages have been handled.
+
+        :param messages: The messages to replay, in the order they were handled.
+        """
+        dependencies = self._resolve_dependencies(uow, transient_dependencies)
+        dispatch_plans = self._dispatch_plans
+        for message in messages:
+            plan = dispatch_plans.get(type(message)) or self._compile_dispatch_plan(
+                message
+            )
+            dependencies.clear_message_dependencies()
+            for step in plan.steps:
+                if len(step) == 1:
+                    await step[0](message, uow, dependencies)
+                else:
+                    await async_gather(
+                        *(msghook(message, uow, dependencies) for msghook in step)
+                    )
+            for _ in uow.uow.collect_new_events():
+                pass
 
     def scan(
         self,
         *mods: str,
+        manifest: str | Path | None = None,
     ) -> None:
         """
         Scan the module (or modules) containing service handlers.
@@ -184,12 +487,97 @@ class AsyncMessageBus(Generic[TAsyncUow]):
         when a message is handled by the bus, the bus propagate the message
         to hook functions, called :term:`Service Handler` that receive the message,
         and a :term:`Unit Of Work` to process it has a business transaction.
+
+        :param manifest: path of a manifest written by :meth:`export_manifest`.
+            The listeners are registered from the manifest, and the service handlers
+            are imported when they are called for the first time. The modules are
+            scanned if the manifest is missing, stale, or refers to message types
+            that can't be imported anymore.
         """
-        scanner = venusian.Scanner(messagebus=self)
         for modname in mods:
             if modname.startswith("."):
                 raise ValueError(
                     f"scan error: relative package unsupported for {modname}"
                 )
-            mod = importlib.import_module(modname)
-            scanner.scan(mod, categories=[VENUSIAN_CATEGORY])  # type: ignore
+
+        # the listeners registered while scanning are the ones of the manifest
+        self._scanning = True
+        try:
+            if manifest is not None:
+                registry_manifest = read_manifest(manifest, mods)
+                if registry_manifest and self._load_manifest(registry_manifest):
+                    self.scanned_modules.extend(mods)
+                    return
+                log.info("Manifest %s is missing or stale, scanning modules", manifest)
+
+            scanner = venusian.Scanner(messagebus=self)
+            for modname in mods:
+                mod = importlib.import_module(modname)
+                scanner.scan(mod, categories=[VENUSIAN_CATEGORY])  # type: ignore
+            self.scanned_modules.extend(mods)
+        finally:
+            self._scanning = False
+
+    def _load_manifest(self, manifest: RegistryManifest) -> bool:
+        """
+        Register the listeners of the manifest.
+
+        :return: False, without registering any listener, if a message type of
+            the manifest can't be imported, e.g. it has been moved to another
+            module that is not scanned.
+        """
+        try:
+            message_types = [
+                resolve_import_path(listener["message"])
+                for listener in manifest["listeners"]
+            ]
+        except (ImportError, AttributeError):
+            return False
+        for message_type, listener in zip(
+            message_types, manifest["listeners"], strict=True
+        ):
+            handler = cast(
+                AsyncMessageHandler[Any, Any, ...], LazyHandler(listener["handler"])
+            )
+            msghook: AsyncMessageHook[Any, Any, Any] = AsyncMessageHook(
+                handler,
+                listener["dependencies"],
+                listener["optional_dependencies"],
+                listener["concurrent"],
+            )
+            self._add_hook(message_type, msghook)
+        return True
+
+    def export_manifest(self, path: str | Path) -> None:
+        """
+        Write the manifest of the listeners registered by the scanned modules.
+
+        The manifest is written at build time, to be loaded by :meth:`scan`.
+        The listeners added with :meth:`add_listener` are not part of the
+        manifest, they are added again by the code that builds the bus.
+
+        :raises ConfigurationError: if a listener can't be imported from
+            its module.
+        """
+        listeners: list[ListenerManifest] = []
+        for msg_type, hook in self._scanned_hooks:
+            callback = hook.callback
+            try:
+                handler = (
+                    callback.path
+                    if isinstance(callback, LazyHandler)
+                    else import_path(callback)
+                )
+                message = import_path(msg_type)
+            except ValueError as exc:
+                raise ConfigurationError(str(exc)) from exc
+            listeners.append(
+                {
+                    "message": message,
+                    "handler": handler,
+                    "dependencies": list(hook.dependencies),
+                    "optional_dependencies": list(hook.optional_dependencies),
+                    "concurrent": hook.concurrent,
+                }
+            )
+        write_manifest(path, self.scanned_modules, listeners)
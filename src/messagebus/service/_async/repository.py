@@ -8,28 +8,139 @@ storage.
 """
 
 import abc
-from collections.abc import MutableSequence
-from typing import Any, Generic, TypeVar
+from collections.abc import (
+    AsyncIterator,
+    Collection,
+    Hashable,
+    Iterable,
+    Mapping,
+    MutableMapping,
+    MutableSequence,
+    Sequence,
+)
+from datetime import datetime
+from typing import Any, ClassVar, Generic, TypeVar
 
 from messagebus.domain.model import GenericModel, Message
-from messagebus.service._async.eventstream import AsyncEventstreamPublisher
+from messagebus.domain.model.ids import MessageId
+from messagebus.service._async.eventstream import (
+    AsyncEventstreamPublisher,
+    default_serializer,
+)
+from messagebus.service.eventstream import AbstractMessageSerializer, OutboxMessage
+from messagebus.service.tracking import SeenModels
 
 TModel_contra = TypeVar("TModel_contra", bound=GenericModel[Any], contravariant=True)
 
 
 class AsyncAbstractRepository(abc.ABC, Generic[TModel_contra]):
-    """Abstract Base Classe for Repository pattern."""
+    """
+    Abstract Base Classe for Repository pattern.
+
+    The models are tracked in :attr:`seen` in order to collect their messages.
+    When :attr:`use_identity_map` is set, the tracked models are also kept by
+    identity in :attr:`identity_map` until the end of the transaction, in order
+    to be served without querying the storage backend again.
+    """
+
+    use_identity_map: ClassVar[bool] = False
+    """Keep the tracked models in the identity map."""
 
     def __init__(self) -> None:
-        self.seen = []
+        self.seen = SeenModels()
+        self.identity_map = {}
+
+    _seen: SeenModels[Any]
+    identity_map: MutableMapping[Hashable, TModel_contra]
+
+    @property
+    def seen(self) -> MutableSequence[TModel_contra]:
+        """Models tracked during the transaction, to collect their messages."""
+        return self._seen
+
+    @seen.setter
+    def seen(self, models: Iterable[TModel_contra]) -> None:
+        # the models are wrapped and keep the hook of the unit of work, in order
+        # to flag the repository as dirty even if the sequence is replaced.
+        previous = self.__dict__.get("_seen")
+        self._seen = SeenModels(
+            models, on_track=previous.on_track if previous is not None else None
+        )
+
+    def identity(self, model: TModel_contra) -> Hashable:
+        """Key of the model in the identity map, by default, its ``id`` field."""
+        return model.id  # type: ignore
+
+    def track(self, model: TModel_contra) -> None:
+        """
+        Track a model added or fetched by the repository.
+
+        The model is added to :attr:`seen` once, and to the identity map
+        if :attr:`use_identity_map` is set.
+        A model served by the identity map must be tracked again, its messages
+        may have been collected already.
+        """
+        self.seen.append(model)
+        if self.use_identity_map:
+            self.identity_map[self.identity(model)] = model
+
+    def mark_clean(self) -> None:
+        """
+        Mark the models of the identity map as clean, after the commit.
+
+        The dirty fields of the models that track their changes are written by
+        the repository during the commit, see
+        :attr:`messagebus.GenericModel.track_changes`. The models that are not
+        in the identity map, when :attr:`use_identity_map` is not set, are not
+        marked as clean.
+        """
+        for model in self.identity_map.values():
+            model.mark_clean()
 
-    seen: MutableSequence[TModel_contra]
+    def clear_identity_map(self) -> None:
+        """Forget the models of the identity map, at the end of the transaction."""
+        self.identity_map.clear()
 
 
 class AsyncAbstractMessageStoreRepository(abc.ABC):
-    def __init__(self, publisher: AsyncEventstreamPublisher | None = None) -> None:
+    """
+    Store every message processed by the message bus.
+
+    :param publisher: publish the messages to the eventstream after the commit.
+    :param buffered: if True, messages are accumulated during the transaction and
+        written with a single call of :meth:`_add_many` before the commit.
+    :param serializer: serialize the messages, by default, the serializer of
+        the publisher.
+    """
+
+    def __init__(
+        self,
+        publisher: AsyncEventstreamPublisher | None = None,
+        buffered: bool = False,
+        serializer: AbstractMessageSerializer | None = None,
+    ) -> None:
         self.publisher = publisher
+        self.buffered = buffered
+        self.serializer = serializer or (
+            publisher.serializer if publisher else default_serializer
+        )
         self.stream_buffer: MutableSequence[Message[Any]] = []
+        self.write_buffer: MutableSequence[Message[Any]] = []
+        self._serialized_messages: dict[MessageId, Mapping[str, Any]] = {}
+
+    def serialize_message(self, message: Message[Any]) -> Mapping[str, Any]:
+        """
+        Serialize the message once per transaction.
+
+        The serialized message is kept until the eventstream is published,
+        in order to be shared by the storage backend and the eventstream.
+        """
+        try:
+            return self._serialized_messages[message.message_id]
+        except KeyError:
+            serialized = self.serializer.serialize_message(message)
+            self._serialized_messages[message.message_id] = serialized
+            return serialized
 
     @abc.abstractmethod
     async def _add(self, message: Message[Any]) -> None:
@@ -37,6 +148,38 @@ class AsyncAbstractMessageStoreRepository(abc.ABC):
         Add a message to the storage backend of event repository.
         """
 
+    async def _add_many(self, messages: Sequence[Message[Any]]) -> None:
+        """
+        Add many messages to the storage backend of event repository.
+
+        Override it to write all the messages at once, such as a multi-row insert.
+        By default, messages are added one by one using :meth:`_add`.
+        """
+        for message in messages:
+            await self._add(message)
+
+    async def iter_messages(
+        self,
+        since: datetime | tuple[datetime, MessageId] | None = None,
+        types: Collection[type[Message[Any]]] | None = None,
+        correlation_id: MessageId | None = None,
+    ) -> AsyncIterator[Message[Any]]:
+        """
+        Stream the stored messages, in the order they have been created.
+
+        Override it to read back the storage backend, in order to replay the
+        messages. By default, the message store has no message to read back,
+        like the sinkhole message store.
+
+        :param since: only the messages created after this date, or, after the
+            message at this ``(created_at, message_id)`` position, in order to
+            resume after a message that shares its date with the next ones.
+        :param types: only the messages of those types.
+        :param correlation_id: only the messages of the cascade of this command.
+        """
+        return
+        yield  # coverage: ignore
+
     async def add(self, message: Message[Any]) -> None:
         """
         Add the message to the storage backend and mark as seen
@@ -46,19 +189,60 @@ class AsyncAbstractMessageStoreRepository(abc.ABC):
         If the transaction is rollback, then, message will be dropped too from the
         eventstream.
         """
-        await self._add(message)
+        if self.buffered:
+            self.write_buffer.append(message)
+        else:
+            await self._add(message)
         self.stream_buffer.append(message)
 
+    async def add_many(self, messages: Sequence[Message[Any]]) -> None:
+        """
+        Add many messages to the storage backend and mark them as seen.
+
+        The message bus add all the messages processed while handling commands
+        in one call.
+        """
+        if self.buffered:
+            self.write_buffer.extend(messages)
+        elif messages:
+            await self._add_many(messages)
+        self.stream_buffer.extend(messages)
+
+    async def flush(self) -> None:
+        """
+        Write the buffered messages to the storage backend.
+
+        Called by the unit of work transaction before the commit.
+        """
+        write_buffer, self.write_buffer = self.write_buffer, []
+        if write_buffer:
+            await self._add_many(write_buffer)
+
+    def discard(self) -> None:
+        """
+        Drop the buffered messages that have not been written yet.
+
+        Called by the unit of work transaction on rollback.
+        """
+        self.write_buffer = []
+        self._serialized_messages = {}
+
     async def publish_eventstream(self) -> None:
         """
         Publish seen message to the eventstream.
         """
         stream_buffer, self.stream_buffer = self.stream_buffer, []
         if not self.publisher:
+            self._serialized_messages = {}
             return
 
-        for message in stream_buffer:
-            await self.publisher.send_message(message)
+        serialized = [
+            self.serialize_message(message)
+            for message in stream_buffer
+            if message.metadata.published
+        ]
+        self._serialized_messages = {}
+        await self.publisher.send_serialized_messages(serialized)
 
 
 class AsyncSinkholeMessageStoreRepository(AsyncAbstractMessageStoreRepository):
@@ -66,3 +250,37 @@ class AsyncSinkholeMessageStoreRepository(AsyncAbstractMessageStoreRepository):
 
     async def _add(self, message: Message[Any]) -> None:
         """Do nothing. The sinkhole drop every message."""
+
+
+class AsyncAbstractOutboxMessageStoreRepository(AsyncAbstractMessageStoreRepository):
+    """
+    Message store implementing the transactional outbox pattern.
+
+    The messages flagged as published must be stored as pending by :meth:`_add`,
+    in the same transaction as the message itself. They are not published after
+    the commit but later, by an :class:`messagebus.AsyncOutboxRelay`,
+    that guarantees an at least once delivery.
+
+    :param serializer: serialize the messages to publish.
+    :param buffered: see :class:`AsyncAbstractMessageStoreRepository`.
+    """
+
+    def __init__(
+        self,
+        serializer: AbstractMessageSerializer = default_serializer,
+        buffered: bool = False,
+    ) -> None:
+        super().__init__(publisher=None, buffered=buffered, serializer=serializer)
+
+    async def publish_eventstream(self) -> None:
+        """Do nothing, pending messages are published by the outbox relay."""
+        self.stream_buffer = []
+        self._serialized_messages = {}
+
+    @abc.abstractmethod
+    async def fetch_pending_messages(self, limit: int) -> Sequence[OutboxMessage]:
+        """Return the oldest messages waiting to be published."""
+
+    @abc.abstractmethod
+    async def mark_published(self, message_ids: Sequence[MessageId]) -> None:
+        """Remove the published messages from the pending messages."""
@@ -1,5 +1,5 @@
 import abc
-from collections.abc import Mapping
+from collections.abc import Mapping, Sequence
 from typing import Any
 
 from messagebus.domain.model import Message
@@ -15,6 +15,16 @@ class SyncAbstractEventstreamTransport(abc.ABC):
     def send_message_serialized(self, message: Mapping[str, Any]) -> None:
         """Publish a serialized message to the eventstream."""
 
+    def send_messages_serialized(self, messages: Sequence[Mapping[str, Any]]) -> None:
+        """
+        Publish many serialized messages to the eventstream.
+
+        Override it to publish all the messages in one round trip,
+        by default, messages are sent one by one.
+        """
+        for message in messages:
+            self.send_message_serialized(message)
+
 
 class SyncSinkholeEventstreamTransport(SyncAbstractEventstreamTransport):
     """
@@ -27,6 +37,26 @@ class SyncSinkholeEventstreamTransport(SyncAbstractEventstreamTransport):
         """Do nothing."""
 
 
+class SyncAbstractEventstreamReceiver(abc.ABC):
+    """
+    Receive serialized messages from the event stream.
+    """
+
+    @abc.abstractmethod
+    def receive_messages_serialized(
+        self, max_count: int
+    ) -> Sequence[Mapping[str, Any]]:
+        """
+        Receive up to ``max_count`` serialized messages from the eventstream.
+
+        Return an empty sequence if there is no message available.
+        """
+
+    @abc.abstractmethod
+    def acknowledge(self, messages: Sequence[Mapping[str, Any]]) -> None:
+        """Acknowledge the messages that have been processed."""
+
+
 default_serializer = MessageSerializer()
 
 
@@ -61,3 +91,22 @@ class SyncEventstreamPublisher:
             return
         evt = self.serializer.serialize_message(message)
         self.transport.send_message_serialized(evt)
+
+    def send_messages(self, messages: Sequence[Message[Any]]) -> None:
+        """
+        Publish many messages to the eventstream in one call of the transport.
+
+        Only the messages flagged as published are sent.
+        """
+        evts = [
+            self.serializer.serialize_message(message)
+            for message in messages
+            if message.metadata.published
+        ]
+        if evts:
+            self.transport.send_messages_serialized(evts)
+
+    def send_serialized_messages(self, messages: Sequence[Mapping[str, Any]]) -> None:
+        """Publish messages that have already been serialized."""
+        if messages:
+            self.transport.send_messages_serialized(messages)
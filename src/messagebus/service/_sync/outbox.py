@@ -0,0 +1,341 @@
+"""
+Transactional outbox.
+
+Messages to publish are stored in the message store, in the same transaction
+as the changes of the models, then a relay read them from the message store
+and publish them to the eventstream.
+"""
+
+import base64
+import json
+import logging
+import sqlite3
+import uuid
+from collections.abc import Collection, Iterator, Mapping, Sequence
+from datetime import datetime
+from typing import Any, Generic
+
+from messagebus.domain.model import Message, Metadata
+from messagebus.domain.model.ids import MessageId
+from messagebus.service._sync.eventstream import (
+    SyncEventstreamPublisher,
+    default_serializer,
+)
+from messagebus.service._sync.repository import (
+    SyncAbstractOutboxMessageStoreRepository,
+)
+from messagebus.service._sync.unit_of_work import TSyncUow
+from messagebus.service.concurrency import sync_sleep
+from messagebus.service.eventstream import (
+    PAYLOAD_EXCLUDE,
+    AbstractMessageSerializer,
+    OutboxMessage,
+)
+from messagebus.service.message_registry import (
+    MessageDeserializer,
+    MessageTypeRegistry,
+    get_message_metadata,
+)
+
+log = logging.getLogger(__name__)
+
+
+def _dump_serialized(serialized: Mapping[str, Any]) -> str:
+    # binary serializers produce bytes, such as the frame of the message
+    def default(obj: Any) -> Any:
+        if isinstance(obj, bytes):
+            return {"__bytes__": base64.b64encode(obj).decode()}
+        raise TypeError(f"Object of type {type(obj).__name__} is not serializable")
+
+    return json.dumps(serialized, default=default)
+
+
+def _load_serialized(data: str) -> Mapping[str, Any]:
+    def object_hook(obj: dict[str, Any]) -> Any:
+        if obj.keys() == {"__bytes__"}:
+            return base64.b64decode(obj["__bytes__"])
+        return obj
+
+    return json.loads(data, object_hook=object_hook)
+
+
+class SyncOutboxRelay(Generic[TSyncUow]):
+    """
+    Publish the pending messages of an outbox message store.
+
+    A message is removed from the outbox after the transport has sent it,
+    if the relay stop in between, the message will be sent again.
+
+    :param uow: the unit of work where the message store is.
+        Its ``messagestore`` must be an
+        :class:`messagebus.AsyncAbstractOutboxMessageStoreRepository`.
+    :param publisher: publish the messages to the eventstream.
+    :param batch_size: maximum number of messages published per transaction.
+    :param poll_interval: seconds to wait when the outbox is empty.
+    """
+
+    def __init__(
+        self,
+        uow: TSyncUow,
+        publisher: SyncEventstreamPublisher,
+        batch_size: int = 100,
+        poll_interval: float = 1.0,
+    ) -> None:
+        self.uow = uow
+        self.publisher = publisher
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.published_count = 0
+        self._running = False
+
+    def relay(self) -> int:
+        """Publish one batch of pending messages and return its size."""
+        with self.uow as tuow:
+            messagestore: SyncAbstractOutboxMessageStoreRepository = (
+                tuow.messagestore  # type: ignore
+            )
+            pending = messagestore.fetch_pending_messages(self.batch_size)
+            if pending:
+                self.publisher.send_serialized_messages(
+                    [msg.serialized for msg in pending]
+                )
+                messagestore.mark_published([msg.message_id for msg in pending])
+            tuow.commit()
+        self.published_count += len(pending)
+        return len(pending)
+
+    def run(self) -> None:
+        """Publish the pending messages until :meth:`stop` is called."""
+        self._running = True
+        while self._running:
+            try:
+                count = self.relay()
+            except Exception:
+                log.exception("Failed to relay the outbox")
+                count = 0
+            if self._running and count < self.batch_size:
+                sync_sleep(self.poll_interval)
+
+    def stop(self) -> None:
+        """Stop the relay after the current batch."""
+        self._running = False
+
+
+class SyncInMemoryOutboxMessageStore(SyncAbstractOutboxMessageStoreRepository):
+    """
+    Outbox message store that keep the messages in memory.
+
+    Messages are buffered until the commit in order to be dropped on rollback.
+    """
+
+    def __init__(
+        self, serializer: AbstractMessageSerializer = default_serializer
+    ) -> None:
+        super().__init__(serializer, buffered=True)
+        self.messages: list[Message[Any]] = []
+        self.pending: dict[MessageId, OutboxMessage] = {}
+
+    def _add(self, message: Message[Any]) -> None:
+        self.messages.append(message)
+        if message.metadata.published:
+            self.pending[message.message_id] = OutboxMessage(
+                message.message_id, self.serialize_message(message)
+            )
+
+    def iter_messages(
+        self,
+        since: datetime | tuple[datetime, MessageId] | None = None,
+        types: Collection[type[Message[Any]]] | None = None,
+        correlation_id: MessageId | None = None,
+    ) -> Iterator[Message[Any]]:
+        for message in sorted(
+            self.messages, key=lambda msg: (msg.created_at, msg.message_id)
+        ):
+            if isinstance(since, tuple):
+                if (message.created_at, message.message_id) <= since:
+                    continue
+            elif since is not None and message.created_at <= since:
+                continue
+            if types is not None and type(message) not in types:
+                continue
+            if correlation_id is not None and message.correlation_id != correlation_id:
+                continue
+            yield message
+
+    def fetch_pending_messages(self, limit: int) -> Sequence[OutboxMessage]:
+        pending: list[OutboxMessage] = []
+        for msg in self.pending.values():
+            if len(pending) >= limit:
+                break
+            pending.append(msg)
+        return pending
+
+    def mark_published(self, message_ids: Sequence[MessageId]) -> None:
+        for message_id in message_ids:
+            self.pending.pop(message_id, None)
+
+
+class SyncSQLiteOutboxMessageStore(SyncAbstractOutboxMessageStoreRepository):
+    """
+    Outbox message store using an SQLite database.
+
+    The connection is shared with the unit of work that commit or rollback it.
+    This is a reference implementation, the sqlite3 module of the standard library
+    is blocking.
+
+    :param connection: the sqlite3 connection.
+    :param serializer: serialize the messages to publish, the serialized messages
+        are stored as JSON, with their bytes, such as binary frames, base64 encoded.
+    :param message_types: the types of the messages read by :meth:`iter_messages`
+        when no types are given, usually the ``message_types`` of the bus.
+    :param fetch_size: number of rows fetched at once by :meth:`iter_messages`.
+    """
+
+    def __init__(
+        self,
+        connection: sqlite3.Connection,
+        serializer: AbstractMessageSerializer = default_serializer,
+        message_types: MessageTypeRegistry | None = None,
+        fetch_size: int = 1000,
+    ) -> None:
+        super().__init__(serializer)
+        self.connection = connection
+        self.message_types = message_types
+        self.fetch_size = fetch_size
+        self._metadata_json: dict[Metadata, str] = {}
+
+    def create_tables(self) -> None:
+        """Create the messages table if it does not exists."""
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS messages ("
+            "  id TEXT PRIMARY KEY,"
+            "  created_at TEXT NOT NULL,"
+            "  metadata TEXT NOT NULL,"
+            "  payload TEXT NOT NULL,"
+            "  causation_id TEXT,"
+            "  correlation_id TEXT,"
+            "  outbox TEXT"
+            ")"
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS messages_correlation_id "
+            "ON messages (correlation_id)"
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS messages_outbox "
+            "ON messages (created_at) WHERE outbox IS NOT NULL"
+        )
+
+    def _dump_metadata(self, metadata: Metadata) -> str:
+        # metadata are shared by the messages of a class, they are dumped once
+        try:
+            return self._metadata_json[metadata]
+        except KeyError:
+            dumped = self._metadata_json[metadata] = metadata.model_dump_json()
+            return dumped
+
+    def _format_message(
+        self, message: Message[Any]
+    ) -> tuple[str, str, str, str, str | None, str | None, str | None]:
+        causation_id, correlation_id = message.causation_id, message.correlation_id
+        return (
+            str(message.message_id),
+            message.created_at.isoformat(),
+            self._dump_metadata(message.metadata),
+            message.model_dump_json(exclude=PAYLOAD_EXCLUDE),
+            str(causation_id) if causation_id else None,
+            str(correlation_id) if correlation_id else None,
+            _dump_serialized(self.serialize_message(message))
+            if message.metadata.published
+            else None,
+        )
+
+    def _add(self, message: Message[Any]) -> None:
+        self._add_many([message])
+
+    def _add_many(self, messages: Sequence[Message[Any]]) -> None:
+        self.connection.executemany(
+            "INSERT INTO messages "
+            "(id, created_at, metadata, payload, causation_id, correlation_id, outbox) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [self._format_message(message) for message in messages],
+        )
+
+    def iter_messages(
+        self,
+        since: datetime | tuple[datetime, MessageId] | None = None,
+        types: Collection[type[Message[Any]]] | None = None,
+        correlation_id: MessageId | None = None,
+    ) -> Iterator[Message[Any]]:
+        conditions: list[str] = []
+        params: list[Any] = []
+        if isinstance(since, tuple):
+            conditions.append("(created_at, id) > (?, ?)")
+            params.extend([since[0].isoformat(), str(since[1])])
+        elif since is not None:
+            conditions.append("created_at > ?")
+            params.append(since.isoformat())
+        if correlation_id is not None:
+            conditions.append("correlation_id = ?")
+            params.append(str(correlation_id))
+        if types is not None:
+            message_types = MessageTypeRegistry()
+            type_names: list[str] = []
+            for msg_type in types:
+                message_types.register(msg_type)
+                msg_metadata = get_message_metadata(msg_type)
+                if msg_metadata:
+                    type_names.append(
+                        f"{msg_metadata.name}_v{msg_metadata.schema_version}"
+                    )
+            conditions.append(
+                "json_extract(metadata, '$.name') || '_v' || "
+                "json_extract(metadata, '$.schema_version') "
+                f"IN ({', '.join('?' * len(type_names))})"
+            )
+            params.extend(type_names)
+        elif self.message_types is not None:
+            message_types = self.message_types
+        else:
+            raise ValueError("Missing message types to read the messages")
+        deserializer = MessageDeserializer(message_types)
+
+        query = (
+            "SELECT id, created_at, metadata, payload, causation_id, correlation_id "
+            "FROM messages"
+        )
+        if conditions:
+            query += f" WHERE {' AND '.join(conditions)}"
+        cursor = self.connection.execute(f"{query} ORDER BY created_at, id", params)
+        while rows := cursor.fetchmany(self.fetch_size):
+            for row in rows:
+                metadata = json.loads(row[2])
+                message = deserializer.deserialize_message(
+                    {
+                        "id": row[0],
+                        "created_at": row[1],
+                        "type": f"{metadata['name']}_v{metadata['schema_version']}",
+                        "payload": row[3],
+                        "causation_id": row[4],
+                        "correlation_id": row[5],
+                    }
+                )
+                if message is not None:
+                    yield message
+
+    def fetch_pending_messages(self, limit: int) -> Sequence[OutboxMessage]:
+        rows = self.connection.execute(
+            "SELECT id, outbox FROM messages WHERE outbox IS NOT NULL "
+            "ORDER BY created_at, id LIMIT ?",
+            (limit,),
+        )
+        return [
+            OutboxMessage(MessageId(uuid.UUID(row[0])), _load_serialized(row[1]))
+            for row in rows
+        ]
+
+    def mark_published(self, message_ids: Sequence[MessageId]) -> None:
+        self.connection.executemany(
+            "UPDATE messages SET outbox = NULL WHERE id = ?",
+            [(str(message_id),) for message_id in message_ids],
+        )
@@ -0,0 +1,139 @@
+"""
+Replay the message store.
+
+Messages read from the message store are dispatched to the listeners of a
+message bus, in order to rebuild read models.
+"""
+
+import abc
+import logging
+from collections.abc import Collection
+from datetime import datetime
+from typing import Any, Generic
+
+from messagebus.domain.model import Message
+from messagebus.domain.model.ids import MessageId
+from messagebus.service._sync.registry import SyncMessageBus
+from messagebus.service._sync.repository import SyncAbstractMessageStoreRepository
+from messagebus.service._sync.unit_of_work import TSyncUow
+
+log = logging.getLogger(__name__)
+
+ReplayCheckpoint = tuple[datetime, MessageId]
+"""Creation date and id of the last replayed message."""
+
+
+class SyncAbstractReplayCheckpointStore(abc.ABC):
+    """
+    Store the position of the last replayed message, in order to resume a replay.
+
+    The position of a message is its creation date and its id, the order of
+    the messages in the message store.
+    """
+
+    @abc.abstractmethod
+    def load_checkpoint(self, name: str) -> ReplayCheckpoint | None:
+        """Return the checkpoint of the replay, None if it has never run."""
+
+    @abc.abstractmethod
+    def save_checkpoint(self, name: str, checkpoint: ReplayCheckpoint) -> None:
+        """Save the checkpoint of the replay."""
+
+
+class SyncInMemoryReplayCheckpointStore(SyncAbstractReplayCheckpointStore):
+    """Keep the checkpoints in memory."""
+
+    def __init__(self) -> None:
+        self.checkpoints: dict[str, ReplayCheckpoint] = {}
+
+    def load_checkpoint(self, name: str) -> ReplayCheckpoint | None:
+        return self.checkpoints.get(name)
+
+    def save_checkpoint(self, name: str, checkpoint: ReplayCheckpoint) -> None:
+        self.checkpoints[name] = checkpoint
+
+
+class SyncReplayRunner(Generic[TSyncUow]):
+    """
+    Stream the messages of the message store to the listeners of a bus.
+
+    Messages are replayed by batch, every batch is replayed in its own unit of
+    work transaction, and the checkpoint is saved before the commit.
+    A replay that stopped resumes after the last committed batch.
+
+    :param name: name of the replay, identify its checkpoint and its metrics.
+    :param bus: the message bus with the listeners of the read models to rebuild.
+    :param uow: the unit of work of the read models.
+    :param messagestore: the message store to read, by default, the message
+        store of the unit of work.
+    :param checkpoint_store: store the checkpoint of the replay, by default,
+        the checkpoint is kept in memory.
+    :param types: types of the message to replay, by default, the message types
+        listened by the bus.
+    :param batch_size: number of messages replayed per transaction.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        bus: SyncMessageBus[TSyncUow],
+        uow: TSyncUow,
+        messagestore: SyncAbstractMessageStoreRepository | None = None,
+        checkpoint_store: SyncAbstractReplayCheckpointStore | None = None,
+        types: Collection[type[Message[Any]]] | None = None,
+        batch_size: int = 1000,
+    ) -> None:
+        self.name = name
+        self.bus = bus
+        self.uow = uow
+        self.messagestore = messagestore or uow.messagestore
+        self.checkpoint_store = checkpoint_store or SyncInMemoryReplayCheckpointStore()
+        self.types = (
+            types
+            if types is not None
+            else [
+                *bus.commands_registry,
+                *bus.events_registry,
+            ]
+        )
+        self.batch_size = batch_size
+        self.replayed_count = 0
+        self.checkpoint: ReplayCheckpoint | None = None
+
+    def run(self) -> int:
+        """
+        Replay the messages created after the checkpoint.
+
+        Return the number of replayed messages.
+        """
+        self.checkpoint = self.checkpoint_store.load_checkpoint(self.name)
+        count = 0
+        batch: list[Message[Any]] = []
+        for message in self.messagestore.iter_messages(
+            since=self.checkpoint, types=self.types
+        ):
+            batch.append(message)
+            if len(batch) >= self.batch_size:
+                self._replay(batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            self._replay(batch)
+            count += len(batch)
+        return count
+
+    def _replay(self, batch: list[Message[Any]]) -> None:
+        with self.uow as tuow:
+            self.bus.replay(batch, tuow)
+            checkpoint = (batch[-1].created_at, batch[-1].message_id)
+            self.checkpoint_store.save_checkpoint(self.name, checkpoint)
+            tuow.commit()
+        self.checkpoint = checkpoint
+        self.replayed_count += len(batch)
+        self.uow.metrics_store.inc_messages_replayed_total(self.name, len(batch))
+        log.info(
+            "Replay %s: %d messages replayed, checkpoint %s",
+            self.name,
+            self.replayed_count,
+            self.checkpoint[0].isoformat(),
+        )
@@ -5,14 +5,16 @@ from __future__ import annotations
 import abc
 from collections.abc import Iterator
 from types import TracebackType
-from typing import TYPE_CHECKING, Any, Generic, TypeVar
+from typing import TYPE_CHECKING, Any, Generic, TypeVar, cast
 
 from typing_extensions import Self
 
 from messagebus.domain.model import Message
 from messagebus.ports.observability import (
     AbstractMetricsStore,
+    AbstractTracer,
     SinkholeMetricsStore,
+    SinkholeTracer,
     TMetricsStore,
 )
 
@@ -24,6 +26,7 @@ from messagebus.service._sync.repository import (
     SyncAbstractRepository,
     SyncSinkholeMessageStoreRepository,
 )
+from messagebus.service.tracking import SeenModels, drain
 
 TSyncMessageStore = TypeVar(
     "TSyncMessageStore", bound=SyncAbstractMessageStoreRepository
@@ -47,23 +50,66 @@ class SyncAbstractUnitOfWork(
     """
 
     metrics_store: TMetricsStore = SinkholeMetricsStore()  # type: ignore
+    tracer: AbstractTracer = SinkholeTracer()
     messagestore: TSyncMessageStore = SyncSinkholeMessageStoreRepository()  # type: ignore
     __transaction: SyncUnitOfWorkTransaction[Self]
+    _repositories: dict[str, SyncAbstractRepository[Any]]
+    _dirty_repositories: dict[str, SyncAbstractRepository[Any]]
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        repositories = self.__dict__.setdefault("_repositories", {})
+        if isinstance(value, SyncAbstractRepository):
+            self._register_repository(name, value)
+        elif name in repositories:
+            del repositories[name]
+            self.__dict__.get("_dirty_repositories", {}).pop(name, None)
+
+    def _register_repository(
+        self, name: str, repo: SyncAbstractRepository[Any]
+    ) -> None:
+        """
+        Register a repository assigned to the unit of work.
+
+        The repository is flagged as dirty when a model is tracked in its seen
+        models, then, only the dirty repositories are scanned to collect the
+        new events.
+        """
+        dirty = self.__dict__.setdefault("_dirty_repositories", {})
+        self.__dict__["_repositories"][name] = repo
+        dirty.pop(name, None)
+
+        def mark_dirty() -> None:
+            dirty.setdefault(name, repo)
+
+        cast(SeenModels[Any], repo.seen).on_track = mark_dirty
+        if repo.seen:
+            mark_dirty()
 
     def collect_new_events(self) -> Iterator[Message[Any]]:
+        dirty = self.__dict__.get("_dirty_repositories", {})
+        while dirty:
+            repo = dirty.pop(next(iter(dirty)))
+            for model in drain(repo.seen):
+                messages = model.messages
+                while messages:
+                    yield from drain(messages)
+
+    def _mark_models_clean(self) -> None:
+        for repo in self._iter_repositories():
+            # repositories that don't call super().__init__() have no identity map
+            if hasattr(repo, "identity_map"):
+                repo.mark_clean()
+
+    def _clear_identity_maps(self) -> None:
         for repo in self._iter_repositories():
-            while repo.seen:
-                model = repo.seen.pop(0)
-                while model.messages:
-                    yield model.messages.pop(0)
+            if hasattr(repo, "identity_map"):
+                repo.clear_identity_map()
 
     def _iter_repositories(
         self,
     ) -> Iterator[SyncAbstractRepository[Any]]:
-        for member_name in self.__dict__.keys():
-            member = getattr(self, member_name)
-            if isinstance(member, SyncAbstractRepository):
-                yield member
+        yield from self.__dict__.get("_repositories", {}).values()
 
     def __enter__(self) -> SyncUnitOfWorkTransaction[Self]:
         self.__transaction = SyncUnitOfWorkTransaction(self)
@@ -113,6 +159,7 @@ class SyncUnitOfWorkTransaction(Generic[TSyncUow]):
         self.status = TransactionStatus.running
         self.uow = uow
         self._hooks: list[Any] = []
+        self._dependencies: dict[type[SyncDependency], SyncDependency] = {}
 
     def __getattr__(self, name: str) -> Any:
         return getattr(self.uow, name)  # type: ignore
@@ -125,6 +172,10 @@ class SyncUnitOfWorkTransaction(Generic[TSyncUow]):
     def metrics_store(self) -> AbstractMetricsStore:
         return self.uow.metrics_store
 
+    @property
+    def tracer(self) -> AbstractTracer:
+        return self.uow.tracer
+
     def add_listener(self, listener: SyncDependency) -> SyncDependency:
         self._hooks.append(listener)
         return listener
@@ -141,7 +192,9 @@ class SyncUnitOfWorkTransaction(Generic[TSyncUow]):
         """Commit the transaction, if things has been written"""
         if self.status != TransactionStatus.running:
             raise TransactionError(f"Transaction already closed ({self.status.value}).")
+        self.uow.messagestore.flush()
         self.uow.commit()
+        self.uow._mark_models_clean()
         self.status = TransactionStatus.committed
         self._on_after_commit()
 
@@ -149,6 +202,8 @@ class SyncUnitOfWorkTransaction(Generic[TSyncUow]):
         """
         Rollback the transaction, preferred way to finalize a read only transaction.
         """
+        self.uow.messagestore.discard()
+        self.uow._clear_identity_maps()
         self.uow.rollback()
         self.status = TransactionStatus.rolledback
         self._on_after_rollback()
@@ -193,6 +248,7 @@ class SyncUnitOfWorkTransaction(Generic[TSyncUow]):
             )
         if self.status == TransactionStatus.committed:
             self.uow.messagestore.publish_eventstream()
+        self.uow._clear_identity_maps()
 
         self.uow.metrics_store.inc_transaction_closed_count(self.status)
         self.status = TransactionStatus.closed
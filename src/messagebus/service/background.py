@@ -0,0 +1,143 @@
+"""
+Publish the eventstream from a background task.
+
+The publisher is asyncio only, there is no sync version of it.
+"""
+
+import asyncio
+import enum
+import logging
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+from messagebus.domain.model import Message
+from messagebus.ports.observability import AbstractMetricsStore, SinkholeMetricsStore
+from messagebus.service._async.eventstream import (
+    AsyncAbstractEventstreamTransport,
+    AsyncEventstreamPublisher,
+    default_serializer,
+)
+from messagebus.service.eventstream import AbstractMessageSerializer
+
+log = logging.getLogger(__name__)
+
+
+class OverflowPolicy(enum.Enum):
+    """What to do with a message when the queue of the publisher is full."""
+
+    block = "block"
+    """Wait until the queue has room for the message, the default."""
+    drop_newest = "drop_newest"
+    """Drop the message."""
+    drop_oldest = "drop_oldest"
+    """Drop the oldest message of the queue to make room for the message."""
+
+
+class AsyncBackgroundEventstreamPublisher(AsyncEventstreamPublisher):
+    """
+    Publish messages to the event stream from a background task.
+
+    Messages are serialized and queued when the transaction is committed,
+    then a background task send them to the transport by batch.
+    The background task is started on the first published message, and
+    :meth:`shutdown` must be called to stop it gracefully.
+
+    :param transport: Used to send the serialized message to the eventstream.
+    :param serializer: Used to serialize the Message
+    :param max_queue_size: maximum number of messages waiting to be sent.
+    :param batch_size: maximum number of messages sent to the transport at once.
+    :param batch_timeout: seconds to wait for more messages before sending
+        a batch that is not full.
+    :param overflow_policy: what to do with messages when the queue is full.
+    :param metrics_store: track the messages that overflow the queue.
+    """
+
+    def __init__(
+        self,
+        transport: AsyncAbstractEventstreamTransport,
+        serializer: AbstractMessageSerializer = default_serializer,
+        *,
+        max_queue_size: int = 1000,
+        batch_size: int = 100,
+        batch_timeout: float = 0.05,
+        overflow_policy: OverflowPolicy = OverflowPolicy.block,
+        metrics_store: AbstractMetricsStore | None = None,
+    ) -> None:
+        super().__init__(transport, serializer)
+        self.batch_size = batch_size
+        self.batch_timeout = batch_timeout
+        self.overflow_policy = overflow_policy
+        self.metrics_store = metrics_store or SinkholeMetricsStore()
+        self.queue: asyncio.Queue[Mapping[str, Any]] = asyncio.Queue(max_queue_size)
+        self._worker: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        """Start the background task if it is not running."""
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.ensure_future(self._run())
+
+    async def send_message(self, message: Message[Any]) -> None:
+        """Queue the message to publish if it is flagged as published."""
+        if message.metadata.published:
+            await self._enqueue(self.serializer.serialize_message(message))
+
+    async def send_messages(self, messages: Sequence[Message[Any]]) -> None:
+        """Queue the messages flagged as published."""
+        for message in messages:
+            await self.send_message(message)
+
+    async def send_serialized_messages(
+        self, messages: Sequence[Mapping[str, Any]]
+    ) -> None:
+        """Queue messages that have already been serialized."""
+        for message in messages:
+            await self._enqueue(message)
+
+    async def flush(self) -> None:
+        """Wait until all the queued messages have been sent to the transport."""
+        if not self.queue.empty():
+            self.start()
+        await self.queue.join()
+
+    async def shutdown(self) -> None:
+        """Send the queued messages then stop the background task."""
+        await self.flush()
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    async def _enqueue(self, message: Mapping[str, Any]) -> None:
+        self.start()
+        if not self.queue.full():
+            self.queue.put_nowait(message)
+            return
+
+        self.metrics_store.inc_eventstream_queue_full_total(self.overflow_policy.value)
+        match self.overflow_policy:
+            case OverflowPolicy.block:
+                await self.queue.put(message)
+            case OverflowPolicy.drop_oldest:
+                self.queue.get_nowait()
+                self.queue.task_done()
+                self.queue.put_nowait(message)
+            case OverflowPolicy.drop_newest:
+                pass
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self.queue.get()]
+            if self.batch_timeout and self.queue.qsize() < self.batch_size - 1:
+                await asyncio.sleep(self.batch_timeout)
+            while len(batch) < self.batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            try:
+                await self.transport.send_messages_serialized(batch)
+            except Exception:
+                log.exception("Failed to publish %d messages", len(batch))
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
@@ -0,0 +1,47 @@
+"""
+Run service handlers concurrently.
+
+The sync message bus is generated from the async one, so both versions of
+the helpers share the same signature.
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable
+from typing import Any
+
+
+async def async_gather(*aws: Awaitable[Any]) -> list[Any]:
+    """
+    Await all the awaitables concurrently and return their results in order.
+
+    If one of them fails, the other ones are cancelled before the exception
+    is raised.
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+def sync_gather(*results: Any) -> list[Any]:
+    """
+    Sync version of :func:`async_gather`.
+
+    Results have already been computed sequentially while building the arguments.
+    """
+    return list(results)
+
+
+async def async_sleep(delay: float) -> None:
+    """Sleep without blocking the event loop."""
+    await asyncio.sleep(delay)
+
+
+def sync_sleep(delay: float) -> None:
+    """Sync version of :func:`async_sleep`."""
+    time.sleep(delay)
@@ -0,0 +1,17 @@
+import enum
+
+
+class DependencyLifetime(enum.Enum):
+    """
+    Lifetime of the dependencies of the message bus.
+
+    Dependencies are always instanciated on demand, the first time a service
+    handler request them, their lifetime define when they are instanciated again.
+    """
+
+    singleton = "singleton"
+    """One instance per message bus."""
+    transaction = "transaction"
+    """One instance per unit of work transaction, the default."""
+    message = "message"
+    """One instance for every message processed by the bus."""
@@ -0,0 +1,88 @@
+"""
+Queues of messages waiting to be dispatched by the message bus.
+
+While handling a command, the bus pushes every event raised by the handlers in
+a dispatch queue, and process them until the queue is empty.
+"""
+
+import abc
+import heapq
+import itertools
+from collections import deque
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from messagebus.domain.model import Message
+
+
+class AbstractDispatchQueue(abc.ABC):
+    """Queue of messages consumed by the message bus."""
+
+    @abc.abstractmethod
+    def append(self, message: Message[Any]) -> None:
+        """Push a message to dispatch."""
+
+    @abc.abstractmethod
+    def popleft(self) -> Message[Any]:
+        """Pop the next message to dispatch."""
+
+    @abc.abstractmethod
+    def __len__(self) -> int:
+        """Number of message waiting to be dispatched."""
+
+    def extend(self, messages: Iterable[Message[Any]]) -> None:
+        """Push many messages to dispatch."""
+        for message in messages:
+            self.append(message)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+
+class FifoDispatchQueue(AbstractDispatchQueue):
+    """
+    Default dispatch queue, messages are dispatched in the order they are raised.
+    """
+
+    def __init__(self) -> None:
+        self._queue: deque[Message[Any]] = deque()
+
+    def append(self, message: Message[Any]) -> None:
+        self._queue.append(message)
+
+    def extend(self, messages: Iterable[Message[Any]]) -> None:
+        self._queue.extend(messages)
+
+    def popleft(self) -> Message[Any]:
+        return self._queue.popleft()
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+
+class PriorityDispatchQueue(AbstractDispatchQueue):
+    """
+    Dispatch queue that dispatch messages with the lowest priority first.
+
+    Messages with the same priority are dispatched in the order they are raised.
+
+    :param key: return the priority of a message.
+    """
+
+    def __init__(self, key: Callable[[Message[Any]], int]) -> None:
+        self.key = key
+        self._queue: list[tuple[int, int, Message[Any]]] = []
+        self._counter = itertools.count()
+
+    def append(self, message: Message[Any]) -> None:
+        heapq.heappush(self._queue, (self.key(message), next(self._counter), message))
+
+    def popleft(self) -> Message[Any]:
+        return heapq.heappop(self._queue)[2]
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+
+DispatchQueueFactory = Callable[[], AbstractDispatchQueue]
+"""Create a new dispatch queue, called for every command handled by the bus."""
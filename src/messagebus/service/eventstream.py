@@ -1,8 +1,12 @@
 import abc
+import importlib
+import uuid
 from collections.abc import Mapping
-from typing import Any
+from datetime import datetime, timedelta, timezone
+from typing import Any, Literal, NamedTuple
 
-from messagebus.domain.model import Message
+from messagebus.domain.model import Message, Metadata
+from messagebus.domain.model.ids import MessageId
 
 
 class AbstractMessageSerializer(abc.ABC):
@@ -15,16 +19,216 @@ class AbstractMessageSerializer(abc.ABC):
         """Publish a message to the eventstream."""
 
 
+PAYLOAD_EXCLUDE = {
+    "message_id",
+    "created_at",
+    "causation_id",
+    "correlation_id",
+    "metadata",
+}
+"""Fields of the message that are not part of its payload."""
+
+
 class MessageSerializer(AbstractMessageSerializer):
     """Default message serializer"""
 
+    def __init__(self) -> None:
+        self._message_types: dict[tuple[str, int], str] = {}
+
+    def message_type(self, metadata: Metadata) -> str:
+        """Return the type of the serialized message, built from its metadata."""
+        key = (metadata.name, metadata.schema_version)
+        try:
+            return self._message_types[key]
+        except KeyError:
+            message_type = self._message_types[key] = f"{key[0]}_v{key[1]}"
+            return message_type
+
     def serialize_message(self, message: Message[Any]) -> Mapping[str, Any]:
         """Publish a message to the eventstream."""
+        causation_id, correlation_id = message.causation_id, message.correlation_id
         return {
             "id": str(message.message_id),
             "created_at": message.created_at.isoformat(),
-            "type": f"{message.metadata.name}_v{message.metadata.schema_version}",
-            "payload": message.model_dump_json(
-                exclude={"message_id", "created_at", "metadata"}
+            "causation_id": str(causation_id) if causation_id else None,
+            "correlation_id": str(correlation_id) if correlation_id else None,
+            "type": self.message_type(message.metadata),
+            "payload": message.__pydantic_serializer__.to_json(
+                message, exclude=PAYLOAD_EXCLUDE
+            ).decode(),
+        }
+
+
+FRAME_VERSION = 1
+"""Version of the binary frame format, first byte of every frame."""
+
+Compression = Literal["zstd", "lz4"]
+"""Compression algorithms supported by the binary serializers."""
+
+_COMPRESSION_FLAGS: dict[Compression | None, int] = {None: 0, "zstd": 1, "lz4": 2}
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _import_optional(module: str, extra: str) -> Any:
+    try:
+        return importlib.import_module(module)
+    except ImportError:
+        raise ImportError(
+            f"{module} is required, install it using the messagebus[{extra}] extra"
+        ) from None
+
+
+def _compress(compression: Compression, data: bytes) -> bytes:
+    if compression == "zstd":
+        return _import_optional("zstandard", "zstd").ZstdCompressor().compress(data)  # type: ignore
+    return _import_optional("lz4.frame", "lz4").compress(data)  # type: ignore
+
+
+def _decompress(flag: int, data: bytes) -> bytes:
+    if flag == _COMPRESSION_FLAGS["zstd"]:
+        return _import_optional("zstandard", "zstd").ZstdDecompressor().decompress(data)  # type: ignore
+    if flag == _COMPRESSION_FLAGS["lz4"]:
+        return _import_optional("lz4.frame", "lz4").decompress(data)  # type: ignore
+    raise ValueError(f"Unknown compression flag {flag}")
+
+
+class AbstractBinaryMessageSerializer(MessageSerializer):
+    """
+    Serialize a message in a single binary frame.
+
+    The serialized message contains the id and the type of the message, that can be
+    used as routing keys by the transport, and the ``frame``, that is two bytes,
+    the version of the frame format and the compression flag, followed by
+    the encoded id, creation date, type, payload, causation and correlation ids
+    of the message.
+
+    :param compression: compress the frames larger than the compression threshold.
+    :param compression_threshold: size in bytes from which frames are compressed.
+    """
+
+    def __init__(
+        self,
+        compression: Compression | None = None,
+        compression_threshold: int = 1024,
+    ) -> None:
+        super().__init__()
+        self.compression = compression
+        self.compression_threshold = compression_threshold
+        if compression:
+            # fail early if the compression library is missing
+            _compress(compression, b"")
+
+    @abc.abstractmethod
+    def dumps(self, obj: Any) -> bytes:
+        """Encode python native types to bytes."""
+
+    @abc.abstractmethod
+    def loads(self, data: bytes) -> Any:
+        """Decode bytes encoded by :meth:`dumps`."""
+
+    def encode_message(self, message: Message[Any]) -> bytes:
+        """
+        Encode the message in a binary frame.
+
+        The creation date is encoded as UTC, a naive creation date is considered
+        to be UTC.
+        """
+        created_at = message.created_at
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        body = self.dumps(
+            [
+                message.message_id.bytes,
+                (created_at - _EPOCH) // timedelta(microseconds=1),
+                self.message_type(message.metadata),
+                message.model_dump(mode="json", exclude=PAYLOAD_EXCLUDE),
+                message.causation_id.bytes if message.causation_id else None,
+                message.correlation_id.bytes if message.correlation_id else None,
+            ]
+        )
+        compression = None
+        if self.compression and len(body) >= self.compression_threshold:
+            compression = self.compression
+            body = _compress(compression, body)
+        return bytes((FRAME_VERSION, _COMPRESSION_FLAGS[compression])) + body
+
+    def decode_frame(self, frame: bytes) -> Mapping[str, Any]:
+        """
+        Decode a binary frame.
+
+        Return the message using the format of the :class:`MessageSerializer`,
+        except that the payload is decoded.
+        """
+        if frame[0] != FRAME_VERSION:
+            raise ValueError(f"Unsupported frame version {frame[0]}")
+        body = frame[2:]
+        if frame[1]:
+            body = _decompress(frame[1], body)
+        message_id, created_at, message_type, payload, causation_id, correlation_id = (
+            self.loads(body)
+        )
+        return {
+            "id": str(uuid.UUID(bytes=message_id)),
+            "created_at": (_EPOCH + timedelta(microseconds=created_at)).isoformat(),
+            "causation_id": str(uuid.UUID(bytes=causation_id))
+            if causation_id
+            else None,
+            "correlation_id": (
+                str(uuid.UUID(bytes=correlation_id)) if correlation_id else None
             ),
+            "type": message_type,
+            "payload": payload,
         }
+
+    def serialize_message(self, message: Message[Any]) -> Mapping[str, Any]:
+        """Publish a message to the eventstream."""
+        return {
+            "id": str(message.message_id),
+            "type": self.message_type(message.metadata),
+            "frame": self.encode_message(message),
+        }
+
+
+class MsgpackMessageSerializer(AbstractBinaryMessageSerializer):
+    """Serialize messages using MessagePack, requires the msgpack extra."""
+
+    def __init__(
+        self,
+        compression: Compression | None = None,
+        compression_threshold: int = 1024,
+    ) -> None:
+        super().__init__(compression, compression_threshold)
+        self.msgpack = _import_optional("msgpack", "msgpack")
+
+    def dumps(self, obj: Any) -> bytes:
+        return self.msgpack.packb(obj, use_bin_type=True)  # type: ignore
+
+    def loads(self, data: bytes) -> Any:
+        return self.msgpack.unpackb(data, raw=False)
+
+
+class CborMessageSerializer(AbstractBinaryMessageSerializer):
+    """Serialize messages using CBOR, requires the cbor extra."""
+
+    def __init__(
+        self,
+        compression: Compression | None = None,
+        compression_threshold: int = 1024,
+    ) -> None:
+        super().__init__(compression, compression_threshold)
+        self.cbor2 = _import_optional("cbor2", "cbor")
+
+    def dumps(self, obj: Any) -> bytes:
+        return self.cbor2.dumps(obj)  # type: ignore
+
+    def loads(self, data: bytes) -> Any:
+        return self.cbor2.loads(data)
+
+
+class OutboxMessage(NamedTuple):
+    """A serialized message stored in the outbox, waiting to be published."""
+
+    message_id: MessageId
+    """Identifier of the message."""
+    serialized: Mapping[str, Any]
+    """The message, serialized by the serializer of the message store."""
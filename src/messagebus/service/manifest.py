@@ -0,0 +1,170 @@
+"""
+Manifest of the listeners registered by scanning modules.
+
+Scanning imports every module of the service handlers, and inspects every
+listener. The manifest saves the result of a scan, in order to register the
+listeners at startup without scanning, and to import the service handlers
+lazily, when they are called for the first time.
+"""
+
+import hashlib
+import importlib
+import importlib.util
+import json
+import os
+from collections.abc import Iterable, Sequence
+from importlib.metadata import version
+from pathlib import Path
+from typing import Any, TypedDict
+
+MANIFEST_VERSION = 1
+
+
+class ListenerManifest(TypedDict):
+    """A listener registered in the manifest."""
+
+    message: str
+    """Import path of the message type."""
+    handler: str
+    """Import path of the service handler."""
+    dependencies: list[str]
+    optional_dependencies: list[str]
+    concurrent: bool
+
+
+class RegistryManifest(TypedDict):
+    """Listeners registered by scanning modules, saved in a manifest file."""
+
+    version: int
+    messagebus_version: str
+    modules: list[str]
+    """Modules that have been scanned."""
+    fingerprint: str
+    """Fingerprint of the source files of the scanned modules."""
+    listeners: list[ListenerManifest]
+
+
+def import_path(obj: Any) -> str:
+    """
+    Return the import path of a class or a function, such as ``pkg.mod:Class``.
+
+    :raises ValueError: if the object can't be imported back from its path.
+    """
+    path = f"{obj.__module__}:{obj.__qualname__}"
+    try:
+        imported = resolve_import_path(path)
+    except (ImportError, AttributeError):
+        imported = None
+    if imported is not obj:
+        raise ValueError(f"{obj!r} can't be imported from {path}")
+    return path
+
+
+def resolve_import_path(path: str) -> Any:
+    """Import an object from its import path, such as ``pkg.mod:Class``."""
+    modname, _, qualname = path.partition(":")
+    obj: Any = importlib.import_module(modname)
+    for name in qualname.split("."):
+        obj = getattr(obj, name)
+    return obj
+
+
+def _source_files(modname: str) -> Iterable[tuple[str, Path]]:
+    spec = importlib.util.find_spec(modname)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {modname!r}")
+    if spec.submodule_search_locations:
+        for location in spec.submodule_search_locations:
+            root = Path(location)
+            for dirpath, dirnames, filenames in os.walk(root):
+                dirnames.sort()
+                for filename in sorted(filenames):
+                    if filename.endswith(".py"):
+                        path = Path(dirpath) / filename
+                        yield f"{modname}/{path.relative_to(root)}", path
+    elif spec.origin:
+        yield modname, Path(spec.origin)
+
+
+def fingerprint_modules(modules: Sequence[str]) -> str:
+    """
+    Fingerprint the source files of modules and packages, without importing them.
+
+    The fingerprint changes when a source file is added, removed, or has its
+    content changed. It does not depend on the modification time of the files,
+    so reinstalling the same sources keeps the manifest up to date.
+    """
+    digest = hashlib.sha256()
+    for modname in modules:
+        for name, path in _source_files(modname):
+            content = path.read_bytes()
+            digest.update(f"{name}:{len(content)}\n".encode())
+            digest.update(content)
+    return digest.hexdigest()
+
+
+def write_manifest(
+    path: str | Path, modules: Sequence[str], listeners: list[ListenerManifest]
+) -> None:
+    """Write the manifest of the listeners registered by scanning modules."""
+    manifest: RegistryManifest = {
+        "version": MANIFEST_VERSION,
+        "messagebus_version": version("messagebus"),
+        "modules": list(modules),
+        "fingerprint": fingerprint_modules(modules),
+        "listeners": listeners,
+    }
+    Path(path).write_text(json.dumps(manifest, indent=2))
+
+
+def read_manifest(path: str | Path, modules: Sequence[str]) -> RegistryManifest | None:
+    """
+    Read the manifest of the listeners registered by scanning modules.
+
+    :return: None if the manifest is missing, corrupted, or is stale: the modules
+        have changed since it has been written.
+    """
+    try:
+        manifest: RegistryManifest = json.loads(Path(path).read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if not isinstance(manifest, dict) or (
+        manifest.get("version") != MANIFEST_VERSION
+        or manifest.get("messagebus_version") != version("messagebus")
+        or manifest.get("modules") != list(modules)
+        or manifest.get("fingerprint") != fingerprint_modules(modules)
+    ):
+        return None
+    return manifest
+
+
+class LazyHandler:
+    """
+    Service handler imported when it is called for the first time.
+
+    :param path: import path of the service handler.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.__module__, _, self.__qualname__ = path.partition(":")
+        self.handler: Any = None
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        if self.handler is None:
+            self.handler = resolve_import_path(self.path)
+        return self.handler(*args, **kwargs)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, LazyHandler):
+            return self.path == other.path
+        return (
+            getattr(other, "__module__", None) == self.__module__
+            and getattr(other, "__qualname__", None) == self.__qualname__
+        )
+
+    def __hash__(self) -> int:
+        return hash(self.path)
+
+    def __repr__(self) -> str:
+        return f"<LazyHandler {self.path}>"
@@ -0,0 +1,147 @@
+"""
+Registry of the message types known by the message bus.
+
+The registry is used to find the message class of a serialized message
+received from the eventstream.
+"""
+
+import json
+import uuid
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any, cast
+
+from messagebus.domain.model import Message, Metadata
+from messagebus.service.eventstream import AbstractBinaryMessageSerializer
+
+
+def _uuid_or_none(value: str | None) -> uuid.UUID | None:
+    return uuid.UUID(value) if value else None
+
+
+class DuplicateMessageTypeError(RuntimeError):
+    """Raised if two message classes have the same name and schema version."""
+
+
+def get_message_metadata(msg_type: type[Message[Any]]) -> Metadata | None:
+    """Return the metadata defined statically on the message class."""
+    field = msg_type.model_fields.get("metadata")
+    if field is None or not isinstance(field.default, Metadata):
+        return None
+    return field.default
+
+
+class MessageTypeRegistry:
+    """
+    Map the name and the schema version of messages to their classes.
+
+    Two classes registered with the same name and schema version can't be told
+    apart once serialized. They can still be registered, and listened by the bus,
+    but looking them up raises a :class:`DuplicateMessageTypeError`.
+    """
+
+    def __init__(self) -> None:
+        self._types: dict[tuple[str, int], type[Message[Any]]] = {}
+        self._serialized_types: dict[str, type[Message[Any]]] = {}
+        self._duplicates: dict[tuple[str, int], list[type[Message[Any]]]] = {}
+
+    def register(self, msg_type: type[Message[Any]]) -> None:
+        """
+        Register a message class.
+
+        Messages without static metadata can't be deserialized and are ignored.
+        """
+        metadata = get_message_metadata(msg_type)
+        if metadata is None:
+            return
+        key = (metadata.name, metadata.schema_version)
+        registered = self._types.setdefault(key, msg_type)
+        if registered is not msg_type:
+            duplicates = self._duplicates.setdefault(key, [registered])
+            if msg_type not in duplicates:
+                duplicates.append(msg_type)
+            return
+        self._serialized_types[f"{key[0]}_v{key[1]}"] = msg_type
+
+    def _check_duplicates(self, key: tuple[str, int]) -> None:
+        duplicates = self._duplicates.get(key)
+        if duplicates:
+            raise DuplicateMessageTypeError(
+                f"{', '.join(map(str, duplicates))} are all registered as "
+                f"{key[0]} version {key[1]}"
+            )
+
+    def get(self, name: str, schema_version: int) -> type[Message[Any]] | None:
+        """
+        Return the message class registered for the name and version.
+
+        :raises DuplicateMessageTypeError: if many classes are registered for
+            the name and version.
+        """
+        key = (name, schema_version)
+        self._check_duplicates(key)
+        return self._types.get(key)
+
+    def get_by_serialized_type(self, message_type: str) -> type[Message[Any]] | None:
+        """
+        Return the message class of a serialized type, such as ``name_v1``.
+
+        :raises DuplicateMessageTypeError: if many classes are registered for
+            the serialized type.
+        """
+        msg_type = self._serialized_types.get(message_type)
+        if msg_type is not None:
+            metadata = cast(Metadata, get_message_metadata(msg_type))
+            self._check_duplicates((metadata.name, metadata.schema_version))
+        return msg_type
+
+    def __contains__(self, msg_type: object) -> bool:
+        return msg_type in self._serialized_types.values()
+
+    def __len__(self) -> int:
+        return len(self._types)
+
+
+class MessageDeserializer:
+    """
+    Build messages from the messages serialized by a message serializer.
+
+    The id, the creation date and the metadata of the message are trusted,
+    they are not validated again, only the payload is validated.
+
+    :param registry: the known message types.
+    :param binary_serializer: decode the binary frames, if the messages
+        has been serialized by a binary serializer.
+    """
+
+    def __init__(
+        self,
+        registry: MessageTypeRegistry,
+        binary_serializer: AbstractBinaryMessageSerializer | None = None,
+    ) -> None:
+        self.registry = registry
+        self.binary_serializer = binary_serializer
+
+    def deserialize_message(self, serialized: Mapping[str, Any]) -> Message[Any] | None:
+        """Return the message, or None if its type is not registered."""
+        if "frame" in serialized:
+            if self.binary_serializer is None:
+                raise ValueError("Missing binary serializer to decode the frame")
+            serialized = self.binary_serializer.decode_frame(serialized["frame"])
+
+        msg_type = self.registry.get_by_serialized_type(serialized["type"])
+        if msg_type is None:
+            return None
+        payload = serialized["payload"]
+        if isinstance(payload, str | bytes):
+            payload = json.loads(payload)
+        return msg_type.model_validate(
+            {
+                **payload,
+                "message_id": uuid.UUID(serialized["id"]),
+                "created_at": datetime.fromisoformat(serialized["created_at"]),
+                "causation_id": _uuid_or_none(serialized.get("causation_id")),
+                "correlation_id": _uuid_or_none(serialized.get("correlation_id")),
+                "metadata": get_message_metadata(msg_type),
+            }
+        )
@@ -0,0 +1,105 @@
+"""Models tracked by the repositories during a transaction."""
+
+from collections.abc import Callable, Iterable, Iterator, MutableSequence, Sequence
+from typing import Any, TypeVar, overload
+
+from messagebus.domain.model import GenericModel
+
+T = TypeVar("T")
+TModel = TypeVar("TModel", bound=GenericModel[Any])
+
+
+def drain(items: MutableSequence[T]) -> list[T]:
+    """
+    Remove all the items of a sequence, and return them in order.
+
+    The items are swapped out at once instead of being popped from the head
+    of the sequence one by one, which is quadratic.
+    """
+    drained = list(items)
+    items.clear()
+    return drained
+
+
+class SeenModels(MutableSequence[TModel]):
+    """
+    Sequence of the models seen by a repository, in the order they are seen.
+
+    A model is tracked once, adding a model which is already in the sequence
+    is ignored, in order to collect its messages once, even if it has been
+    fetched or added many times during the transaction.
+
+    :param models: the initial models.
+    :param on_track: called when a model is tracked, used by the unit of work
+        to collect the messages of the repositories that have tracked models.
+    """
+
+    def __init__(
+        self,
+        models: Iterable[TModel] = (),
+        on_track: Callable[[], None] | None = None,
+    ) -> None:
+        self._models: list[TModel] = []
+        self._ids: set[int] = set()
+        self.on_track = on_track
+        self.extend(models)
+
+    @overload
+    def __getitem__(self, index: int) -> TModel: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> MutableSequence[TModel]: ...
+
+    def __getitem__(self, index: int | slice) -> TModel | MutableSequence[TModel]:
+        if isinstance(index, slice):
+            return SeenModels(self._models[index])
+        return self._models[index]
+
+    @overload
+    def __setitem__(self, index: int, value: TModel) -> None: ...
+
+    @overload
+    def __setitem__(self, index: slice, value: Iterable[TModel]) -> None: ...
+
+    def __setitem__(self, index: int | slice, value: Any) -> None:
+        del self[index]
+        if isinstance(index, slice):
+            for offset, model in enumerate(value):
+                self.insert((index.start or 0) + offset, model)
+        else:
+            self.insert(index, value)
+
+    def __delitem__(self, index: int | slice) -> None:
+        removed = self._models[index] if isinstance(index, slice) else [self[index]]
+        del self._models[index]
+        for model in removed:
+            self._ids.discard(id(model))
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+    def __iter__(self) -> Iterator[TModel]:
+        return iter(self._models)
+
+    def __contains__(self, value: object) -> bool:
+        return id(value) in self._ids
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Sequence):
+            return self._models == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._models!r})"
+
+    def clear(self) -> None:
+        self._models = []
+        self._ids = set()
+
+    def insert(self, index: int, value: TModel) -> None:
+        if id(value) in self._ids:
+            return
+        self._ids.add(id(value))
+        self._models.insert(index, value)
+        if self.on_track:
+            self.on_track()
@@ -30,3 +30,9 @@ async def handler_with_dependency_injection(
     uow: AsyncAbstractUnitOfWork[Any, Any, Any],
     notifier: Notifier,
 ): ...
+
+
+@async_listen(concurrent=True)
+async def handler_evt3(
+    command: DummyEvent, uow: AsyncAbstractUnitOfWork[Any, Any, Any]
+): ...
@@ -0,0 +1,182 @@
+from collections.abc import Mapping, Sequence
+from typing import Any, ClassVar
+
+import pytest
+
+from messagebus import GenericEvent
+from messagebus.service._async.consumer import AsyncEventstreamConsumer
+from messagebus.service._async.eventstream import (
+    AsyncAbstractEventstreamReceiver,
+    AsyncEventstreamPublisher,
+)
+from messagebus.service._async.registry import AsyncMessageBus
+from messagebus.service._async.unit_of_work import AsyncUnitOfWorkTransaction
+from messagebus.service.eventstream import MessageSerializer
+from tests._async.conftest import (
+    AsyncDummyMessageStore,
+    AsyncDummyUnitOfWork,
+    AsyncEventstreamTransport,
+    DummyModel,
+)
+from tests.conftest import AnotherDummyCommand, DummyEvent, MyMetadata
+
+
+class DummyConsumed(GenericEvent[MyMetadata]):
+    id: str
+    metadata: MyMetadata = MyMetadata(
+        name="dummy_consumed", schema_version=1, published=True, custom_field="foo"
+    )
+
+
+class AsyncListReceiver(AsyncAbstractEventstreamReceiver):
+    consumer: AsyncEventstreamConsumer[Any]
+
+    def __init__(self, messages: Sequence[Mapping[str, Any]]) -> None:
+        self.messages = list(messages)
+        self.acknowledged: list[Mapping[str, Any]] = []
+
+    async def receive_messages_serialized(
+        self, max_count: int
+    ) -> Sequence[Mapping[str, Any]]:
+        batch, self.messages = self.messages[:max_count], self.messages[max_count:]
+        if not batch:
+            self.consumer.stop()
+        return batch
+
+    async def acknowledge(self, messages: Sequence[Mapping[str, Any]]) -> None:
+        self.acknowledged.extend(messages)
+
+
+class AsyncRecordingUnitOfWork(AsyncDummyUnitOfWork):
+    units: ClassVar[list["AsyncRecordingUnitOfWork"]] = []
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.units.append(self)
+
+
+async def listen_event(
+    evt: DummyEvent, uow: AsyncUnitOfWorkTransaction[AsyncRecordingUnitOfWork]
+) -> None:
+    if evt.id == "fail":
+        raise ValueError("Boom")
+    await uow.foos.add(DummyModel(id=evt.id, counter=evt.increment))
+
+
+def serialize_events(*ids: str) -> list[Mapping[str, Any]]:
+    serializer = MessageSerializer()
+    return [
+        serializer.serialize_message(DummyEvent(id=id, increment=idx))
+        for idx, id in enumerate(ids)
+    ]
+
+
+@pytest.fixture
+def consumer_bus() -> AsyncMessageBus[AsyncRecordingUnitOfWork]:
+    AsyncRecordingUnitOfWork.units = []
+    bus: AsyncMessageBus[AsyncRecordingUnitOfWork] = AsyncMessageBus()
+    bus.add_listener(DummyEvent, listen_event)
+    return bus
+
+
+@pytest.mark.parametrize("concurrency", [1, 2])
+async def test_consume(
+    consumer_bus: AsyncMessageBus[AsyncRecordingUnitOfWork], concurrency: int
+):
+    messages = serialize_events("foo", "bar", "baz")
+    receiver = AsyncListReceiver(messages)
+    consumer = AsyncEventstreamConsumer(
+        consumer_bus,
+        AsyncRecordingUnitOfWork,
+        receiver,
+        batch_size=10,
+        concurrency=concurrency,
+    )
+    assert await consumer.consume() == 3
+    assert receiver.acknowledged == messages
+    assert consumer.consumed_count == 3
+
+    units = AsyncRecordingUnitOfWork.units
+    assert [uow.status for uow in units] == ["committed"] * 3
+    assert sorted(
+        (model.id, model.counter) for uow in units for model in uow.foos.models.values()
+    ) == [
+        ("bar", 1),
+        ("baz", 2),
+        ("foo", 0),
+    ]
+
+
+async def test_consume_not_published_again(
+    consumer_bus: AsyncMessageBus[AsyncRecordingUnitOfWork],
+):
+    transport = AsyncEventstreamTransport()
+
+    def uow_factory() -> AsyncRecordingUnitOfWork:
+        uow = AsyncRecordingUnitOfWork()
+        uow.messagestore = AsyncDummyMessageStore(AsyncEventstreamPublisher(transport))
+        return uow
+
+    async def consume_event(
+        evt: DummyEvent, uow: AsyncUnitOfWorkTransaction[AsyncRecordingUnitOfWork]
+    ) -> None:
+        foo = DummyModel(id=f"{evt.id}-consumed", counter=0)
+        foo.messages.append(DummyConsumed(id=evt.id))
+        await uow.foos.add(foo)
+
+    consumer_bus.add_listener(DummyEvent, consume_event)
+    messages = serialize_events("foo")
+    consumer = AsyncEventstreamConsumer(
+        consumer_bus, uow_factory, AsyncListReceiver(messages)
+    )
+    assert await consumer.consume() == 1
+
+    # the consumed event is neither stored nor published again, the events raised
+    # by its listeners are.
+    (uow,) = AsyncRecordingUnitOfWork.units
+    assert uow.messagestore.messages == [DummyConsumed(id="foo")]
+    assert str(uow.messagestore.messages[0].causation_id) == messages[0]["id"]
+    assert [evt["type"] for evt in transport.events] == ["dummy_consumed_v1"]
+    assert uow.metrics_store.processing_time == 0
+
+
+async def test_consume_failure(
+    consumer_bus: AsyncMessageBus[AsyncRecordingUnitOfWork],
+):
+    messages = serialize_events("foo", "fail", "bar")
+    receiver = AsyncListReceiver(messages)
+    consumer = AsyncEventstreamConsumer(
+        consumer_bus, AsyncRecordingUnitOfWork, receiver
+    )
+    assert await consumer.consume() == 3
+    assert receiver.acknowledged == [messages[0], messages[2]]
+    assert [uow.status for uow in AsyncRecordingUnitOfWork.units] == [
+        "committed",
+        "aborted",
+        "committed",
+    ]
+
+
+async def test_consume_unknown_message(
+    consumer_bus: AsyncMessageBus[AsyncRecordingUnitOfWork],
+):
+    messages = [MessageSerializer().serialize_message(AnotherDummyCommand(id="foo"))]
+    receiver = AsyncListReceiver(messages)
+    consumer = AsyncEventstreamConsumer(
+        consumer_bus, AsyncRecordingUnitOfWork, receiver
+    )
+    assert await consumer.consume() == 1
+    assert receiver.acknowledged == messages
+    assert AsyncRecordingUnitOfWork.units == []
+
+
+async def test_consumer_run(
+    consumer_bus: AsyncMessageBus[AsyncRecordingUnitOfWork],
+):
+    receiver = AsyncListReceiver(serialize_events(*[f"foo{i}" for i in range(5)]))
+    consumer = AsyncEventstreamConsumer(
+        consumer_bus, AsyncRecordingUnitOfWork, receiver, batch_size=2, poll_interval=0
+    )
+    receiver.consumer = consumer
+    await consumer.run()
+    assert consumer.consumed_count == 5
@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, ClassVar
 
 import pytest
 
@@ -8,6 +8,7 @@ from messagebus.service._async.unit_of_work import (
     AsyncAbstractUnitOfWork,
     AsyncUnitOfWorkTransaction,
 )
+from messagebus.service.dependency import DependencyLifetime
 from tests._async.conftest import (
     AsyncDummyUnitOfWork,
     AsyncDummyUnitOfWorkWithEvents,
@@ -135,3 +136,87 @@ async def test_optional_dependency_missing(
         await bus.handle(dummy_command, tuow)
         await tuow.commit()
     # we tests that there is no issue here
+
+
+class CountedDependency(AsyncDependency):
+    instances: ClassVar[int] = 0
+
+    def __init__(self) -> None:
+        type(self).instances += 1
+        self.committed = 0
+
+    async def on_after_commit(self) -> None:
+        self.committed += 1
+
+    async def on_after_rollback(self) -> None: ...
+
+
+class SingletonDependency(CountedDependency):
+    instances: ClassVar[int] = 0
+    lifetime = DependencyLifetime.singleton
+
+
+class TransactionDependency(CountedDependency):
+    instances: ClassVar[int] = 0
+
+
+class MessageDependency(CountedDependency):
+    instances: ClassVar[int] = 0
+    lifetime = DependencyLifetime.message
+
+
+async def listen_command_with_lifetimes(
+    cmd: DummyCommand,
+    uow: AsyncUnitOfWorkTransaction[AsyncDummyUnitOfWork],
+    single: SingletonDependency,
+    trans: TransactionDependency,
+    msg: MessageDependency,
+) -> DummyModel:
+    foo = DummyModel(id=cmd.id, counter=0)
+    foo.messages.append(DummyEvent(id=foo.id, increment=10))
+    await uow.foos.add(foo)
+    return foo
+
+
+async def listen_event_with_lifetimes(
+    evt: DummyEvent,
+    uow: AsyncUnitOfWorkTransaction[AsyncDummyUnitOfWork],
+    single: SingletonDependency,
+    trans: TransactionDependency,
+    msg: MessageDependency,
+) -> None: ...
+
+
+async def test_dependency_lifetimes(
+    uow_with_messagestore: AsyncDummyUnitOfWorkWithEvents,
+):
+    bus = AsyncMessageBus[AsyncDummyUnitOfWorkWithEvents](
+        single=SingletonDependency,
+        trans=TransactionDependency,
+        msg=MessageDependency,
+        unused=CountedDependency,
+    )
+    bus.add_listener(DummyCommand, listen_command_with_lifetimes)
+    bus.add_listener(DummyEvent, listen_event_with_lifetimes)
+    bus.add_listener(DummyEvent, listen_event_with_lifetimes)
+
+    async with uow_with_messagestore as tuow:
+        await bus.handle(DummyCommand(id="foo"), tuow)
+        await bus.handle(DummyCommand(id="bar"), tuow)
+        await tuow.commit()
+
+    assert CountedDependency.instances == 0
+    assert SingletonDependency.instances == 1
+    assert TransactionDependency.instances == 1
+    assert MessageDependency.instances == 4
+    single = bus._singletons["single"]
+    assert single.committed == 1  # type: ignore
+
+    async with uow_with_messagestore as tuow:
+        await bus.handle(DummyCommand(id="baz"), tuow)
+        await tuow.commit()
+
+    assert SingletonDependency.instances == 1
+    assert TransactionDependency.instances == 2
+    assert MessageDependency.instances == 6
+    assert single.committed == 2  # type: ignore
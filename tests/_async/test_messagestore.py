@@ -1,6 +1,15 @@
+import sqlite3
+from collections.abc import Sequence
+from typing import Any
+
+import pytest
+
+from messagebus.domain.model import Message
 from messagebus.service._async.registry import AsyncMessageBus
+from messagebus.service._async.repository import AsyncAbstractMessageStoreRepository
 from messagebus.service._async.unit_of_work import AsyncUnitOfWorkTransaction
 from tests._async.conftest import (
+    AsyncDummyMessageStore,
     AsyncDummyUnitOfWork,
     AsyncDummyUnitOfWorkWithEvents,
     AsyncEventstreamTransport,
@@ -47,10 +56,13 @@ async def test_store_events_and_publish(
             increment=10,
         ),
     ]
+    cmd: DummyCommand = uow_with_messagestore.messagestore.messages[0]  # type: ignore
     evt: DummyEvent = uow_with_messagestore.messagestore.messages[1]  # type: ignore
     assert eventstream_transport.events == [
         {
             "created_at": evt.created_at.isoformat(),
+            "causation_id": str(cmd.message_id),
+            "correlation_id": str(cmd.message_id),
             "id": str(evt.message_id),
             "payload": '{"id":"dummy_cmd","increment":10}',
             "type": "dummied_v1",
@@ -69,3 +81,198 @@ async def test_store_events_and_rollback(
         await bus.handle(dummy_command, tuow)
         await tuow.rollback()
     assert eventstream_transport.events == []
+
+
+async def listen_command_failing(
+    cmd: DummyCommand,
+    uow: AsyncUnitOfWorkTransaction[AsyncDummyUnitOfWork],
+) -> DummyModel:
+    foo = await listen_command(cmd, uow)
+    if cmd.id == "boom":
+        raise ValueError("Boom")
+    return foo
+
+
+async def test_handle_many(
+    bus: AsyncMessageBus[AsyncDummyUnitOfWorkWithEvents],
+    eventstream_transport: AsyncEventstreamTransport,
+    uow_with_messagestore: AsyncDummyUnitOfWorkWithEvents,
+):
+    bus.add_listener(DummyCommand, listen_command)
+    async with uow_with_messagestore as tuow:
+        results = await bus.handle_many(
+            [DummyCommand(id="foo"), DummyCommand(id="bar")], tuow
+        )
+        await tuow.commit()
+
+    assert results == [
+        DummyModel(id="foo", counter=0),
+        DummyModel(id="bar", counter=0),
+    ]
+    assert uow_with_messagestore.messagestore.messages == [  # type: ignore
+        DummyCommand(id="foo"),
+        DummyEvent(id="foo", increment=10),
+        DummyCommand(id="bar"),
+        DummyEvent(id="bar", increment=10),
+    ]
+    assert [evt["type"] for evt in eventstream_transport.events] == [
+        "dummied_v1",
+        "dummied_v1",
+    ]
+    assert uow_with_messagestore.metrics_store.processed_count == {
+        ("dummy", 1): 2,
+        ("dummied", 1): 2,
+    }
+
+
+async def test_handle_many_return_exceptions(
+    bus: AsyncMessageBus[AsyncDummyUnitOfWorkWithEvents],
+    uow_with_messagestore: AsyncDummyUnitOfWorkWithEvents,
+):
+    bus.add_listener(DummyCommand, listen_command_failing)
+    async with uow_with_messagestore as tuow:
+        results = await bus.handle_many(
+            [DummyCommand(id="foo"), DummyCommand(id="boom")],
+            tuow,
+            return_exceptions=True,
+        )
+        await tuow.commit()
+
+    assert results[0] == DummyModel(id="foo", counter=0)
+    assert isinstance(results[1], ValueError)
+    assert uow_with_messagestore.messagestore.messages == [  # type: ignore
+        DummyCommand(id="foo"),
+        DummyEvent(id="foo", increment=10),
+    ]
+    # the repository writes of the failing command are not rolled back
+    assert set(uow_with_messagestore.foos.models) == {"foo", "boom"}
+
+
+async def listen_event_failing(
+    evt: DummyEvent,
+    uow: AsyncUnitOfWorkTransaction[AsyncDummyUnitOfWork],
+) -> None:
+    if evt.id == "bad":
+        raise ValueError("Bad")
+
+
+async def test_handle_many_return_exceptions_from_event(
+    bus: AsyncMessageBus[AsyncDummyUnitOfWorkWithEvents],
+    eventstream_transport: AsyncEventstreamTransport,
+    uow_with_messagestore: AsyncDummyUnitOfWorkWithEvents,
+):
+    bus.add_listener(DummyCommand, listen_command)
+    bus.add_listener(DummyEvent, listen_event_failing)
+    async with uow_with_messagestore as tuow:
+        results = await bus.handle_many(
+            [DummyCommand(id="ok"), DummyCommand(id="bad")],
+            tuow,
+            return_exceptions=True,
+        )
+        await tuow.commit()
+
+    assert results[0] == DummyModel(id="ok", counter=0)
+    assert isinstance(results[1], ValueError)
+    assert uow_with_messagestore.messagestore.messages == [  # type: ignore
+        DummyCommand(id="ok"),
+        DummyEvent(id="ok", increment=10),
+    ]
+    assert [evt["payload"] for evt in eventstream_transport.events] == [
+        '{"id":"ok","increment":10}',
+    ]
+    # the repository writes of the failing command are not rolled back
+    assert set(uow_with_messagestore.foos.models) == {"ok", "bad"}
+
+
+async def test_handle_many_raise(
+    bus: AsyncMessageBus[AsyncDummyUnitOfWorkWithEvents],
+    uow_with_messagestore: AsyncDummyUnitOfWorkWithEvents,
+):
+    bus.add_listener(DummyCommand, listen_command_failing)
+    with pytest.raises(ValueError):
+        async with uow_with_messagestore as tuow:
+            await bus.handle_many(
+                [DummyCommand(id="foo"), DummyCommand(id="boom")], tuow
+            )
+    assert uow_with_messagestore.messagestore.messages == []  # type: ignore
+
+
+class AsyncSQLiteMessageStore(AsyncAbstractMessageStoreRepository):
+    def __init__(self, buffered: bool) -> None:
+        super().__init__(buffered=buffered)
+        self.conn = sqlite3.connect(":memory:")
+        self.conn.execute(
+            "CREATE TABLE messages (id TEXT, created_at TEXT, type TEXT, payload TEXT)"
+        )
+        self.queries = 0
+
+    def _row(self, message: Message[Any]) -> tuple[str, str, str, str]:
+        return (
+            str(message.message_id),
+            message.created_at.isoformat(),
+            message.metadata.name,
+            message.model_dump_json(exclude={"message_id", "created_at", "metadata"}),
+        )
+
+    async def _add(self, message: Message[Any]) -> None:
+        self.queries += 1
+        self.conn.execute(
+            "INSERT INTO messages VALUES (?, ?, ?, ?)", self._row(message)
+        )
+
+    async def _add_many(self, messages: Sequence[Message[Any]]) -> None:
+        self.queries += 1
+        self.conn.executemany(
+            "INSERT INTO messages VALUES (?, ?, ?, ?)",
+            [self._row(message) for message in messages],
+        )
+
+    def count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM messages").fetchone()[0]
+
+
+@pytest.mark.parametrize("buffered", [True, False])
+async def test_sqlite_add_many(
+    bus: AsyncMessageBus[AsyncDummyUnitOfWorkWithEvents],
+    buffered: bool,
+):
+    bus.add_listener(DummyCommand, listen_command)
+    messagestore = AsyncSQLiteMessageStore(buffered=buffered)
+    uow = AsyncDummyUnitOfWorkWithEvents(publisher=None)
+    uow.messagestore = messagestore
+    async with uow as tuow:
+        for idx in range(5):
+            await bus.handle(DummyCommand(id=f"foo{idx}"), tuow)
+        assert messagestore.count() == (0 if buffered else 10)
+        await tuow.commit()
+
+    assert messagestore.count() == 10
+    assert messagestore.queries == (1 if buffered else 5)
+
+
+async def test_buffered_rollback(
+    bus: AsyncMessageBus[AsyncDummyUnitOfWorkWithEvents],
+):
+    bus.add_listener(DummyCommand, listen_command)
+    messagestore = AsyncSQLiteMessageStore(buffered=True)
+    uow = AsyncDummyUnitOfWorkWithEvents(publisher=None)
+    uow.messagestore = messagestore
+    async with uow as tuow:
+        await bus.handle(DummyCommand(id="foo"), tuow)
+        await tuow.rollback()
+
+    assert messagestore.count() == 0
+    assert messagestore.write_buffer == []
+
+
+async def test_serialize_message_once(
+    messagestore: AsyncDummyMessageStore,
+    eventstream_transport: AsyncEventstreamTransport,
+    dummy_event: DummyEvent,
+):
+    serialized = messagestore.serialize_message(dummy_event)
+    assert messagestore.serialize_message(dummy_event) is serialized
+    await messagestore.add(dummy_event)
+    await messagestore.publish_eventstream()
+    assert eventstream_transport.events == [serialized]
+    assert messagestore.serialize_message(dummy_event) is not serialized
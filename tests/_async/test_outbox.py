@@ -0,0 +1,186 @@
+import sqlite3
+from collections.abc import Iterator, Mapping, Sequence
+from typing import Any
+
+import pytest
+
+from messagebus.service._async.eventstream import AsyncEventstreamPublisher
+from messagebus.service._async.outbox import (
+    AsyncInMemoryOutboxMessageStore,
+    AsyncOutboxRelay,
+    AsyncSQLiteOutboxMessageStore,
+)
+from messagebus.service._async.registry import AsyncMessageBus
+from messagebus.service._async.repository import (
+    AsyncAbstractOutboxMessageStoreRepository,
+)
+from messagebus.service._async.unit_of_work import (
+    AsyncAbstractUnitOfWork,
+    AsyncUnitOfWorkTransaction,
+)
+from messagebus.service.eventstream import MsgpackMessageSerializer
+from tests._async.conftest import (
+    AsyncDummyRepository,
+    AsyncEventstreamTransport,
+    AsyncFooRepository,
+    DummyMetricsStore,
+    DummyModel,
+)
+from tests.conftest import DummyCommand, DummyEvent
+
+
+class AsyncOutboxUnitOfWork(AsyncAbstractUnitOfWork[Any, Any, Any]):
+    def __init__(
+        self,
+        messagestore: AsyncAbstractOutboxMessageStoreRepository,
+        connection: sqlite3.Connection | None = None,
+    ) -> None:
+        self.foos = AsyncFooRepository()
+        self.bars = AsyncDummyRepository()
+        self.messagestore = messagestore
+        self.metrics_store = DummyMetricsStore()
+        self.connection = connection
+
+    async def commit(self) -> None:
+        if self.connection:
+            self.connection.commit()
+
+    async def rollback(self) -> None:
+        if self.connection:
+            self.connection.rollback()
+
+
+class AsyncFailingTransport(AsyncEventstreamTransport):
+    async def send_messages_serialized(
+        self, messages: Sequence[Mapping[str, Any]]
+    ) -> None:
+        raise ConnectionError("Broker unavailable")
+
+
+class AsyncStoppingTransport(AsyncEventstreamTransport):
+    relay: AsyncOutboxRelay[Any]
+
+    async def send_messages_serialized(
+        self, messages: Sequence[Mapping[str, Any]]
+    ) -> None:
+        self.events.extend(messages)
+        self.relay.stop()
+
+
+async def listen_command(
+    cmd: DummyCommand,
+    uow: AsyncUnitOfWorkTransaction[AsyncOutboxUnitOfWork],
+) -> DummyModel:
+    foo = DummyModel(id=cmd.id, counter=0)
+    foo.messages.append(DummyEvent(id=foo.id, increment=10))
+    await uow.foos.add(foo)
+    return foo
+
+
+@pytest.fixture
+def connection() -> Iterator[sqlite3.Connection]:
+    connection = sqlite3.connect(":memory:")
+    yield connection
+    connection.close()
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def outbox_uow(
+    request: pytest.FixtureRequest, connection: sqlite3.Connection
+) -> AsyncOutboxUnitOfWork:
+    if request.param == "memory":
+        return AsyncOutboxUnitOfWork(AsyncInMemoryOutboxMessageStore())
+    messagestore = AsyncSQLiteOutboxMessageStore(connection)
+    messagestore.create_tables()
+    return AsyncOutboxUnitOfWork(messagestore, connection)
+
+
+async def handle_commands(
+    bus: AsyncMessageBus[Any], uow: AsyncOutboxUnitOfWork, *ids: str
+) -> None:
+    bus.add_listener(DummyCommand, listen_command)
+    async with uow as tuow:
+        await bus.handle_many([DummyCommand(id=id) for id in ids], tuow)
+        await tuow.commit()
+
+
+async def test_outbox_relay(
+    bus: AsyncMessageBus[Any],
+    outbox_uow: AsyncOutboxUnitOfWork,
+):
+    await handle_commands(bus, outbox_uow, "foo", "bar", "baz")
+
+    transport = AsyncEventstreamTransport()
+    relay = AsyncOutboxRelay(
+        outbox_uow, AsyncEventstreamPublisher(transport), batch_size=2
+    )
+    assert transport.events == []
+    assert await relay.relay() == 2
+    assert await relay.relay() == 1
+    assert await relay.relay() == 0
+    assert [evt["payload"] for evt in transport.events] == [
+        '{"id":"foo","increment":10}',
+        '{"id":"bar","increment":10}',
+        '{"id":"baz","increment":10}',
+    ]
+    assert relay.published_count == 3
+
+
+async def test_outbox_binary_serializer(
+    bus: AsyncMessageBus[Any], connection: sqlite3.Connection
+):
+    serializer = MsgpackMessageSerializer()
+    messagestore = AsyncSQLiteOutboxMessageStore(connection, serializer)
+    messagestore.create_tables()
+    await handle_commands(bus, AsyncOutboxUnitOfWork(messagestore, connection), "foo")
+
+    (pending,) = await messagestore.fetch_pending_messages(10)
+    frame = pending.serialized["frame"]
+    assert isinstance(frame, bytes)
+    assert serializer.decode_frame(frame)["payload"] == {"id": "foo", "increment": 10}
+
+
+async def test_outbox_rollback(
+    bus: AsyncMessageBus[Any],
+    outbox_uow: AsyncOutboxUnitOfWork,
+):
+    bus.add_listener(DummyCommand, listen_command)
+    async with outbox_uow as tuow:
+        await bus.handle(DummyCommand(id="foo"), tuow)
+        await tuow.rollback()
+
+    transport = AsyncEventstreamTransport()
+    relay = AsyncOutboxRelay(outbox_uow, AsyncEventstreamPublisher(transport))
+    assert await relay.relay() == 0
+
+
+async def test_outbox_at_least_once(
+    bus: AsyncMessageBus[Any],
+    outbox_uow: AsyncOutboxUnitOfWork,
+):
+    await handle_commands(bus, outbox_uow, "foo")
+
+    relay = AsyncOutboxRelay(
+        outbox_uow, AsyncEventstreamPublisher(AsyncFailingTransport())
+    )
+    with pytest.raises(ConnectionError):
+        await relay.relay()
+
+    transport = AsyncEventstreamTransport()
+    relay = AsyncOutboxRelay(outbox_uow, AsyncEventstreamPublisher(transport))
+    assert await relay.relay() == 1
+
+
+async def test_outbox_run(
+    bus: AsyncMessageBus[Any],
+    outbox_uow: AsyncOutboxUnitOfWork,
+):
+    await handle_commands(bus, outbox_uow, "foo", "bar")
+
+    transport = AsyncStoppingTransport()
+    relay = AsyncOutboxRelay(
+        outbox_uow, AsyncEventstreamPublisher(transport), poll_interval=0
+    )
+    transport.relay = relay
+    await relay.run()
+    assert len(transport.events) == 2
@@ -1,8 +1,16 @@
+import functools
+import json
+from pathlib import Path
 from typing import Any
 
 import pytest
+from result import UnwrapError
 
+from messagebus import FifoDispatchQueue, GenericCommand, PriorityDispatchQueue
 from messagebus.service._async.registry import AsyncMessageBus, ConfigurationError
+from messagebus.service.concurrency import async_sleep
+from messagebus.service.manifest import LazyHandler
+from messagebus.service.message_registry import DuplicateMessageTypeError
 from tests._async.conftest import (
     AsyncDummyUnitOfWork,
     AsyncUnitOfWorkTransaction,
@@ -11,7 +19,7 @@ from tests._async.conftest import (
     Notifier,
 )
 from tests._async.handlers import dummy
-from tests.conftest import DummyCommand, DummyEvent
+from tests.conftest import AnotherDummyCommand, DummyCommand, DummyEvent, MyMetadata
 
 conftest_mod = __name__.replace("test_registry", "conftest")
 
@@ -88,6 +96,26 @@ async def test_messagebus(
     }
 
 
+async def test_messagebus_handler_metrics(
+    bus: AsyncMessageBus[AsyncDummyUnitOfWork],
+    tuow: AsyncUnitOfWorkTransaction[AsyncDummyUnitOfWork],
+    metrics: DummyMetricsStore,
+):
+    bus.add_listener(DummyCommand, listen_command)
+    bus.add_listener(DummyEvent, listen_event)
+    await bus.handle(DummyCommand(id="foo"), tuow)
+    assert metrics.handler_processed == [
+        (f"{__name__}.listen_command", "dummy"),
+        (f"{__name__}.listen_event", "dummied"),
+    ]
+    assert metrics.handler_failed == []
+
+    with pytest.raises(UnwrapError):
+        await bus.handle(DummyEvent(id="unknown", increment=1), tuow)  # type: ignore
+    assert metrics.handler_failed == [(f"{__name__}.listen_event", "dummied")]
+    assert len(metrics.handler_processed) == 3
+
+
 async def test_messagebus_handle_only_message(
     bus: AsyncMessageBus[AsyncDummyUnitOfWork],
     tuow: AsyncUnitOfWorkTransaction[AsyncDummyUnitOfWork],
@@ -168,9 +196,34 @@ def test_scan(bus: AsyncMessageBus[Any]):
     assert bus.commands_registry[DummyCommand].callback == dummy.handler
 
     assert DummyEvent in bus.events_registry
-    assert len(bus.events_registry[DummyEvent]) == 2
+    assert len(bus.events_registry[DummyEvent]) == 3
     assert bus.events_registry[DummyEvent][0].callback == dummy.handler_evt1
     assert bus.events_registry[DummyEvent][1].callback == dummy.handler_evt2
+    assert bus.events_registry[DummyEvent][2].callback == dummy.handler_evt3
+    assert [hook.concurrent for hook in bus.events_registry[DummyEvent]] == [
+        False,
+        False,
+        True,
+    ]
+    assert bus.message_types.get("dummy", 1) is DummyCommand
+    assert bus.message_types.get("dummied", 1) is DummyEvent
+
+
+def test_messagebus_message_type_conflict(
+    bus: AsyncMessageBus[AsyncDummyUnitOfWork],
+):
+    class ConflictingCommand(GenericCommand[MyMetadata]):
+        metadata: MyMetadata = MyMetadata(
+            name="dummy", schema_version=1, custom_field="bar"
+        )
+
+    bus.add_listener(DummyCommand, listen_command)
+    # the conflict matters only when the bus deserializes messages
+    bus.add_listener(ConflictingCommand, listen_command)
+    assert ConflictingCommand in bus.commands_registry
+    with pytest.raises(DuplicateMessageTypeError) as ctx:
+        bus.message_types.get("dummy", 1)
+    assert "dummy version 1" in str(ctx.value)
 
 
 def test_scan_relative(bus: AsyncMessageBus[Any]):
@@ -205,3 +258,380 @@ async def test_messagebus_dependency(
     )
     assert bus.commands_registry[DummyCommand].dependencies == ["dummy_dep"]
     assert bus.commands_registry[DummyCommand].optional_dependencies == ["dummy_dep2"]
+
+
+async def listen_cascading_event(
+    evt: DummyEvent,
+    uow: AsyncUnitOfWorkTransaction[AsyncDummyUnitOfWork],
+) -> None:
+    """Raise a new event until the increment reach 10k."""
+    foo = (await uow.foos.get(evt.id)).unwrap()
+    foo.counter += 1
+    if evt.increment < 10_000:
+        foo.messages.append(DummyEvent(id=foo.id, increment=evt.increment + 1))
+        uow.foos.seen.append(foo)
+
+
+async def test_messagebus_cascading_events(
+    bus: AsyncMessageBus[AsyncDummyUnitOfWork],
+    tuow: AsyncUnitOfWorkTransaction[AsyncDummyUnitOfWork],
+    metrics: DummyMetricsStore,
+):
+    async def listen_cascading_command(
+        cmd: DummyCommand,
+        uow: AsyncUnitOfWorkTransaction[AsyncDummyUnitOfWork],
+    ) -> DummyModel:
+        foo = DummyModel(id=cmd.id, counter=0)
+        foo.messages.append(DummyEvent(id=foo.id, increment=1))
+        await uow.foos.add(foo)
+        return foo
+
+    bus.add_listener(DummyCommand, listen_cascading_command)
+    bus.add_listener(DummyEvent, listen_cascading_event)
+    foo = await bus.handle(DummyCommand(id="foo"), tuow)
+    assert foo.counter == 10_000
+    assert metrics.processed_count == {("dummy", 1): 1, ("dummied", 1): 10_000}
+
+
+async def test_messagebus_fan_out_events(
+    bus: AsyncMessageBus[AsyncDummyUnitOfWork],
+    tuow: AsyncUnitOfWorkTransaction[AsyncDummyUnitOfWork],
+    metrics: DummyMetricsStore,
+):
+    queue_sizes: list[int] = []
+
+    class SizedDispatchQueue(FifoDispatchQueue):
+        def popleft(self) -> Any:
+            queue_sizes.append(len(self))
+            return super().popleft()
+
+    async def listen_fan_out_command(
+        cmd: DummyCommand,
+        uow: AsyncUnitOfWorkTransaction[AsyncDummyUnitOfWork],
+    ) -> DummyModel:
+        foo = DummyModel(id=cmd.id, counter=0)
+        foo.messages.extend(DummyEvent(id=foo.id, increment=1) for _ in range(10_000))
+        await uow.foos.add(foo)
+        return foo
+
+    async def listen_fan_out_event(
+        evt: DummyEvent,
+        uow: AsyncUnitOfWorkTransaction[AsyncDummyUnitOfWork],
+    ) -> None:
+        foo = (await uow.foos.get(evt.id)).unwrap()
+        foo.counter += evt.increment
+
+    bus.dispatch_queue_factory = SizedDispatchQueue
+    bus.add_listener(DummyCommand, listen_fan_out_command)
+    bus.add_listener(DummyEvent, listen_fan_out_event)
+    foo = await bus.handle(DummyCommand(id="foo"), tuow)
+    assert foo.counter == 10_000
+    assert metrics.processed_count == {("dummy", 1): 1, ("dummied", 1): 10_000}
+    # the 10k events are pending in the queue at once
+    assert max(queue_sizes) == 10_000
+
+
+async def test_messagebus_causation_ids(
+    bus: AsyncMessageBus[AsyncDummyUnitOfWork],
+    tuow: AsyncUnitOfWorkTransaction[AsyncDummyUnitOfWork],
+):
+    events: list[DummyEvent] = []
+
+    async def listen_cascading_event(
+        evt: DummyEvent,
+        uow: AsyncUnitOfWorkTransaction[AsyncDummyUnitOfWork],
+    ) -> None:
+        events.append(evt)
+        if evt.increment < 12:
+            foo = DummyModel(id=evt.id, counter=0)
+            foo.messages.append(DummyEvent(id=foo.id, increment=evt.increment + 1))
+            uow.foos.seen.append(foo)
+
+    bus.add_listener(DummyCommand, listen_command)
+    bus.add_listener(DummyEvent, listen_cascading_event)
+    cmd = DummyCommand(id="foo")
+    await bus.handle(cmd, tuow)
+
+    assert cmd.causation_id is None
+    assert cmd.correlation_id == cmd.message_id
+    assert [evt.increment for evt in events] == [10, 11, 12]
+    assert [evt.causation_id for evt in events] == [
+        cmd.message_id,
+        events[0].message_id,
+        events[1].message_id,
+    ]
+    assert [evt.correlation_id for evt in events] == [cmd.message_id] * 3
+
+
+async def test_messagebus_dispatch_queue_factory(
+    tuow: AsyncUnitOfWorkTransaction[AsyncDummyUnitOfWork],
+):
+    handled: list[str] = []
+
+    async def listen_other_command(
+        cmd: AnotherDummyCommand,
+        uow: AsyncUnitOfWorkTransaction[AsyncDummyUnitOfWork],
+    ) -> None:
+        foo = DummyModel(id=cmd.id, counter=0)
+        foo.messages.extend(
+            [
+                DummyEvent(id="low", increment=2),
+                DummyEvent(id="high", increment=1),
+            ]
+        )
+        uow.foos.seen.append(foo)
+
+    async def listen_event(
+        evt: DummyEvent,
+        uow: AsyncUnitOfWorkTransaction[AsyncDummyUnitOfWork],
+    ) -> None:
+        handled.append(evt.id)
+
+    class PriorityMessageBus(AsyncMessageBus[AsyncDummyUnitOfWork]):
+        dispatch_queue_factory = functools.partial(
+            PriorityDispatchQueue,
+            key=lambda msg: getattr(msg, "increment", 0),
+        )
+
+    bus = PriorityMessageBus()
+    bus.add_listener(AnotherDummyCommand, listen_other_command)
+    bus.add_listener(DummyEvent, listen_event)
+    await bus.handle(AnotherDummyCommand(id="foo"), tuow)
+    assert handled == ["high", "low"]
+
+
+async def test_messagebus_dispatch_plans(
+    bus: AsyncMessageBus[AsyncDummyUnitOfWork],
+    tuow: AsyncUnitOfWorkTransaction[AsyncDummyUnitOfWork],
+):
+    bus.add_listener(DummyCommand, listen_command)
+    await bus.handle(DummyCommand(id="foo"), tuow)
+    assert bus._dispatch_plans == {
+        DummyCommand: (True, ((bus.commands_registry[DummyCommand],),)),
+        DummyEvent: (False, ()),
+    }
+
+    bus.add_listener(DummyEvent, listen_event)
+    assert bus._dispatch_plans == {}
+
+    foo = await bus.handle(DummyCommand(id="foo2"), tuow)
+    assert foo.counter == 10
+    assert bus._dispatch_plans[DummyEvent] == (
+        False,
+        ((bus.events_registry[DummyEvent][0],),),
+    )
+
+    bus.remove_listener(DummyEvent, listen_event)
+    assert bus._dispatch_plans == {}
+
+
+async def test_messagebus_concurrent_listeners(
+    bus: AsyncMessageBus[AsyncDummyUnitOfWork],
+    tuow: AsyncUnitOfWorkTransaction[AsyncDummyUnitOfWork],
+):
+    handled: list[str] = []
+
+    async def listen_event_seq(
+        evt: DummyEvent,
+        uow: AsyncUnitOfWorkTransaction[AsyncDummyUnitOfWork],
+    ) -> None:
+        handled.append(f"seq {evt.increment}")
+
+    async def listen_event_conc1(
+        evt: DummyEvent,
+        uow: AsyncUnitOfWorkTransaction[AsyncDummyUnitOfWork],
+    ) -> None:
+        handled.append(f"conc1 {evt.increment}")
+        if evt.increment == 10:
+            foo = (await uow.foos.get(evt.id)).unwrap()
+            foo.messages.append(DummyEvent(id=foo.id, increment=1))
+            uow.foos.seen.append(foo)
+
+    async def listen_event_conc2(
+        evt: DummyEvent,
+        uow: AsyncUnitOfWorkTransaction[AsyncDummyUnitOfWork],
+    ) -> None:
+        handled.append(f"conc2 {evt.increment}")
+
+    bus.add_listener(DummyCommand, listen_command)
+    bus.add_listener(DummyEvent, listen_event_seq)
+    bus.add_listener(DummyEvent, listen_event_conc1, concurrent=True)
+    bus.add_listener(DummyEvent, listen_event_conc2, concurrent=True)
+
+    await bus.handle(DummyCommand(id="foo"), tuow)
+    hooks = bus.events_registry[DummyEvent]
+    assert bus._dispatch_plans[DummyEvent].steps == (
+        (hooks[0],),
+        (hooks[1], hooks[2]),
+    )
+    assert handled == [
+        "seq 10",
+        "conc1 10",
+        "conc2 10",
+        "seq 1",
+        "conc1 1",
+        "conc2 1",
+    ]
+
+
+async def test_messagebus_concurrent_listeners_events_order(
+    bus: AsyncMessageBus[AsyncDummyUnitOfWork],
+    tuow: AsyncUnitOfWorkTransaction[AsyncDummyUnitOfWork],
+):
+    handled: list[str] = []
+
+    async def listen_event_conc1(
+        evt: DummyEvent,
+        uow: AsyncUnitOfWorkTransaction[AsyncDummyUnitOfWork],
+    ) -> None:
+        if evt.id == "foo":
+            # completes after conc2, its event must be handled first anyway
+            await async_sleep(0.01)
+            await uow.foos.add(DummyModel(id="from_conc1", counter=0))
+            model = (await uow.foos.get("from_conc1")).unwrap()
+            model.messages.append(DummyEvent(id="from_conc1", increment=1))
+
+    async def listen_event_conc2(
+        evt: DummyEvent,
+        uow: AsyncUnitOfWorkTransaction[AsyncDummyUnitOfWork],
+    ) -> None:
+        if evt.id == "foo":
+            await uow.foos.add(DummyModel(id="from_conc2", counter=0))
+            model = (await uow.foos.get("from_conc2")).unwrap()
+            model.messages.append(DummyEvent(id="from_conc2", increment=1))
+
+    async def listen_event_seq(
+        evt: DummyEvent,
+        uow: AsyncUnitOfWorkTransaction[AsyncDummyUnitOfWork],
+    ) -> None:
+        handled.append(evt.id)
+
+    bus.add_listener(DummyCommand, listen_command)
+    bus.add_listener(DummyEvent, listen_event_conc1, concurrent=True)
+    bus.add_listener(DummyEvent, listen_event_conc2, concurrent=True)
+    bus.add_listener(DummyEvent, listen_event_seq)
+
+    await bus.handle(DummyCommand(id="foo"), tuow)
+    assert handled == ["foo", "from_conc1", "from_conc2"]
+
+
+def test_messagebus_concurrent_command(
+    bus: AsyncMessageBus[AsyncDummyUnitOfWork],
+):
+    with pytest.raises(ConfigurationError) as ctx:
+        bus.add_listener(DummyCommand, listen_command, concurrent=True)
+    assert (
+        str(ctx.value) == "<class 'tests.conftest.DummyCommand'> command "
+        "cannot be listened concurrently"
+    )
+
+
+async def test_scan_manifest(
+    bus: AsyncMessageBus[Any],
+    tuow: AsyncUnitOfWorkTransaction[AsyncDummyUnitOfWork],
+    tmp_path: Path,
+):
+    manifest = tmp_path / "manifest.json"
+    bus.scan("tests._async.handlers", manifest=manifest)
+    assert bus.commands_registry[DummyCommand].callback == dummy.handler
+    bus.export_manifest(manifest)
+
+    loaded: AsyncMessageBus[Any] = AsyncMessageBus()
+    loaded.scan("tests._async.handlers", manifest=manifest)
+    assert loaded.scanned_modules == ["tests._async.handlers"]
+    handler = loaded.commands_registry[DummyCommand].callback
+    assert isinstance(handler, LazyHandler)
+    assert handler.handler is None
+    assert loaded.commands_registry[DummyCommand].name == (
+        bus.commands_registry[DummyCommand].name
+    )
+    assert [hook.callback for hook in loaded.events_registry[DummyEvent]] == [
+        dummy.handler_evt1,
+        dummy.handler_evt2,
+        dummy.handler_evt3,
+    ]
+    assert [hook.concurrent for hook in loaded.events_registry[DummyEvent]] == [
+        False,
+        False,
+        True,
+    ]
+    hook = loaded.commands_registry[AnotherDummyCommand]
+    assert hook.dependencies == ["notifier"]
+    assert loaded.message_types.get("dummied", 1) is DummyEvent
+
+    await loaded.handle(DummyCommand(id="foo"), tuow)
+    assert handler.handler is dummy.handler
+
+    # a bus loaded from a manifest exports the same manifest
+    reexported = tmp_path / "reexported.json"
+    loaded.export_manifest(reexported)
+    assert json.loads(reexported.read_text()) == json.loads(manifest.read_text())
+
+
+def test_scan_stale_manifest(bus: AsyncMessageBus[Any], tmp_path: Path):
+    manifest = tmp_path / "manifest.json"
+    bus.scan("tests._async.handlers")
+    bus.export_manifest(manifest)
+    data = json.loads(manifest.read_text())
+    manifest.write_text(json.dumps({**data, "fingerprint": "stale"}))
+
+    scanned: AsyncMessageBus[Any] = AsyncMessageBus()
+    scanned.scan("tests._async.handlers", manifest=manifest)
+    assert scanned.commands_registry[DummyCommand].callback is dummy.handler
+
+
+def test_scan_manifest_message_moved(bus: AsyncMessageBus[Any], tmp_path: Path):
+    manifest = tmp_path / "manifest.json"
+    bus.scan("tests._async.handlers")
+    bus.export_manifest(manifest)
+    data = json.loads(manifest.read_text())
+    # the message type of the last listener has been moved since the export
+    data["listeners"][-1]["message"] = "tests.conftest:MovedCommand"
+    manifest.write_text(json.dumps(data))
+
+    scanned: AsyncMessageBus[Any] = AsyncMessageBus()
+    scanned.scan("tests._async.handlers", manifest=manifest)
+    assert scanned.commands_registry[DummyCommand].callback is dummy.handler
+
+
+def test_export_manifest_scanned_listeners(
+    bus: AsyncMessageBus[Any],
+    tmp_path: Path,
+):
+    async def listen_closure(
+        evt: DummyEvent, uow: AsyncUnitOfWorkTransaction[AsyncDummyUnitOfWork]
+    ) -> None: ...
+
+    def build_bus(manifest: Path) -> AsyncMessageBus[Any]:
+        bus: AsyncMessageBus[Any] = AsyncMessageBus()
+        bus.add_listener(DummyEvent, listen_closure)
+        bus.scan("tests._async.handlers", manifest=manifest)
+        return bus
+
+    manifest = tmp_path / "manifest.json"
+    bus = build_bus(manifest)
+    bus.remove_listener(DummyEvent, dummy.handler_evt3)
+    # listeners added by hand are added again when the bus is built
+    bus.export_manifest(manifest)
+    data = json.loads(manifest.read_text())
+    handlers = [listener["handler"] for listener in data["listeners"]]
+    assert f"{dummy.__name__}:handler_evt1" in handlers
+    assert f"{dummy.__name__}:handler_evt3" not in handlers
+    assert not [handler for handler in handlers if "listen_closure" in handler]
+
+    loaded = build_bus(manifest)
+    assert [hook.callback for hook in loaded.events_registry[DummyEvent]] == [
+        listen_closure,
+        dummy.handler_evt1,
+        dummy.handler_evt2,
+    ]
+
+
+def test_export_manifest_not_importable(
+    bus: AsyncMessageBus[Any], tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    bus.scan("tests._async.handlers")
+    monkeypatch.delattr(dummy, "handler_evt1")
+    with pytest.raises(ConfigurationError) as ctx:
+        bus.export_manifest(tmp_path / "manifest.json")
+    assert "can't be imported from" in str(ctx.value)
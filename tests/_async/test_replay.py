@@ -0,0 +1,227 @@
+import sqlite3
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from typing import Any
+
+import pytest
+
+from messagebus.service._async.outbox import (
+    AsyncInMemoryOutboxMessageStore,
+    AsyncSQLiteOutboxMessageStore,
+)
+from messagebus.service._async.registry import AsyncMessageBus
+from messagebus.service._async.replay import (
+    AsyncInMemoryReplayCheckpointStore,
+    AsyncReplayRunner,
+)
+from messagebus.service._async.repository import (
+    AsyncAbstractOutboxMessageStoreRepository,
+    AsyncSinkholeMessageStoreRepository,
+)
+from messagebus.service._async.unit_of_work import (
+    AsyncAbstractUnitOfWork,
+    AsyncUnitOfWorkTransaction,
+)
+from messagebus.service.message_registry import MessageTypeRegistry
+from tests._async.conftest import (
+    AsyncDummyRepository,
+    AsyncFooRepository,
+    DummyMetricsStore,
+    DummyModel,
+)
+from tests.conftest import DummyCommand, DummyEvent
+
+
+class AsyncReplayUnitOfWork(AsyncAbstractUnitOfWork[Any, Any, Any]):
+    def __init__(
+        self,
+        messagestore: AsyncAbstractOutboxMessageStoreRepository,
+        connection: sqlite3.Connection | None = None,
+    ) -> None:
+        self.foos = AsyncFooRepository()
+        self.bars = AsyncDummyRepository()
+        self.messagestore = messagestore
+        self.metrics_store = DummyMetricsStore()
+        self.connection = connection
+
+    async def commit(self) -> None:
+        if self.connection:
+            self.connection.commit()
+
+    async def rollback(self) -> None:
+        if self.connection:
+            self.connection.rollback()
+
+
+async def listen_command(
+    cmd: DummyCommand,
+    uow: AsyncUnitOfWorkTransaction[AsyncReplayUnitOfWork],
+) -> None:
+    foo = DummyModel(id=cmd.id, counter=0)
+    foo.messages.append(DummyEvent(id=foo.id, increment=10))
+    await uow.foos.add(foo)
+
+
+async def project_event(
+    evt: DummyEvent,
+    uow: AsyncUnitOfWorkTransaction[AsyncReplayUnitOfWork],
+) -> None:
+    bar = DummyModel(id=evt.id, counter=evt.increment)
+    bar.messages.append(DummyEvent(id=bar.id, increment=1))
+    await uow.bars.add(bar)
+
+
+@pytest.fixture
+def connection() -> Iterator[sqlite3.Connection]:
+    connection = sqlite3.connect(":memory:")
+    yield connection
+    connection.close()
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def replay_uow(
+    request: pytest.FixtureRequest, connection: sqlite3.Connection
+) -> AsyncReplayUnitOfWork:
+    if request.param == "memory":
+        return AsyncReplayUnitOfWork(AsyncInMemoryOutboxMessageStore())
+    messagestore = AsyncSQLiteOutboxMessageStore(connection, fetch_size=2)
+    messagestore.create_tables()
+    return AsyncReplayUnitOfWork(messagestore, connection)
+
+
+@pytest.fixture
+def projection_bus() -> AsyncMessageBus[AsyncReplayUnitOfWork]:
+    bus: AsyncMessageBus[AsyncReplayUnitOfWork] = AsyncMessageBus()
+    bus.add_listener(DummyEvent, project_event)
+    return bus
+
+
+async def handle_commands(uow: AsyncReplayUnitOfWork, *ids: str) -> None:
+    bus: AsyncMessageBus[AsyncReplayUnitOfWork] = AsyncMessageBus()
+    bus.add_listener(DummyCommand, listen_command)
+    async with uow as tuow:
+        await bus.handle_many([DummyCommand(id=id) for id in ids], tuow)
+        await tuow.commit()
+
+
+async def test_iter_messages(replay_uow: AsyncReplayUnitOfWork):
+    await handle_commands(replay_uow, "foo", "bar")
+    messagestore = replay_uow.messagestore
+
+    messages = [
+        msg
+        async for msg in messagestore.iter_messages(types=[DummyCommand, DummyEvent])
+    ]
+    # messages are read in the order they have been created
+    assert messages == [
+        DummyCommand(id="foo"),
+        DummyCommand(id="bar"),
+        DummyEvent(id="foo", increment=10),
+        DummyEvent(id="bar", increment=10),
+    ]
+
+    events = [msg async for msg in messagestore.iter_messages(types=[DummyEvent])]
+    assert events == [
+        DummyEvent(id="foo", increment=10),
+        DummyEvent(id="bar", increment=10),
+    ]
+
+    since = messages[1].created_at
+    assert [
+        msg
+        async for msg in messagestore.iter_messages(
+            since=since, types=[DummyCommand, DummyEvent]
+        )
+    ] == messages[2:]
+
+
+async def test_iter_messages_correlation_id(replay_uow: AsyncReplayUnitOfWork):
+    await handle_commands(replay_uow, "foo", "bar")
+    messagestore = replay_uow.messagestore
+    cmd = [msg async for msg in messagestore.iter_messages(types=[DummyCommand])][1]
+    assert cmd.correlation_id == cmd.message_id
+    messages = [
+        msg
+        async for msg in messagestore.iter_messages(
+            types=[DummyCommand, DummyEvent], correlation_id=cmd.message_id
+        )
+    ]
+    assert messages == [DummyCommand(id="bar"), DummyEvent(id="bar", increment=10)]
+    assert messages[1].causation_id == cmd.message_id
+
+
+async def test_iter_messages_registry(connection: sqlite3.Connection):
+    registry = MessageTypeRegistry()
+    registry.register(DummyEvent)
+    messagestore = AsyncSQLiteOutboxMessageStore(connection, message_types=registry)
+    messagestore.create_tables()
+    await handle_commands(AsyncReplayUnitOfWork(messagestore, connection), "foo")
+    assert [msg async for msg in messagestore.iter_messages()] == [
+        DummyEvent(id="foo", increment=10)
+    ]
+
+    messagestore.message_types = None
+    with pytest.raises(ValueError):
+        [msg async for msg in messagestore.iter_messages()]
+
+
+async def test_iter_messages_default():
+    messagestore = AsyncSinkholeMessageStoreRepository()
+    assert [msg async for msg in messagestore.iter_messages()] == []
+
+
+async def test_replay(
+    projection_bus: AsyncMessageBus[AsyncReplayUnitOfWork],
+    replay_uow: AsyncReplayUnitOfWork,
+):
+    await handle_commands(replay_uow, "foo", "bar", "baz")
+    checkpoint_store = AsyncInMemoryReplayCheckpointStore()
+    runner = AsyncReplayRunner(
+        "bars",
+        projection_bus,
+        replay_uow,
+        checkpoint_store=checkpoint_store,
+        batch_size=2,
+    )
+    assert runner.types == [DummyEvent]
+    assert await runner.run() == 3
+    assert runner.replayed_count == 3
+    assert list(replay_uow.bars.models) == ["foo", "bar", "baz"]
+    assert replay_uow.bars.seen == []
+    assert checkpoint_store.checkpoints["bars"] == runner.checkpoint
+
+    # replayed messages and the events raised while replaying are not stored
+    events = replay_uow.messagestore.iter_messages(types=[DummyEvent])
+    assert len([msg async for msg in events]) == 3
+
+    assert await runner.run() == 0
+
+    await handle_commands(replay_uow, "qux")
+    assert await runner.run() == 1
+    assert list(replay_uow.bars.models) == ["foo", "bar", "baz", "qux"]
+    assert runner.replayed_count == 4
+
+
+async def test_replay_same_created_at(
+    projection_bus: AsyncMessageBus[AsyncReplayUnitOfWork],
+    replay_uow: AsyncReplayUnitOfWork,
+):
+    created_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    events = [
+        DummyEvent(id=id, increment=1, created_at=created_at)
+        for id in ("foo", "bar", "baz")
+    ]
+    async with replay_uow as tuow:
+        await tuow.messagestore.add_many(events)
+        await tuow.commit()
+    events.sort(key=lambda evt: evt.message_id)
+
+    checkpoint_store = AsyncInMemoryReplayCheckpointStore()
+    # a previous run stopped between the messages created at the same date
+    await checkpoint_store.save_checkpoint("bars", (created_at, events[0].message_id))
+    runner = AsyncReplayRunner(
+        "bars", projection_bus, replay_uow, checkpoint_store=checkpoint_store
+    )
+    assert await runner.run() == 2
+    assert list(replay_uow.bars.models) == [evt.id for evt in events[1:]]
+    assert runner.checkpoint == (created_at, events[-1].message_id)
@@ -1,5 +1,16 @@
+from typing import Any, ClassVar
+
 from messagebus import Model
+from messagebus.service._async.registry import AsyncMessageBus
 from messagebus.service._async.repository import AsyncAbstractRepository
+from messagebus.service._async.unit_of_work import AsyncUnitOfWorkTransaction
+from tests._async.conftest import (
+    AsyncDummyRepository,
+    AsyncDummyUnitOfWork,
+    AsyncFooRepository,
+    DummyModel,
+)
+from tests.conftest import DummyCommand, DummyEvent
 
 
 class Dummy(Model): ...
@@ -11,3 +22,95 @@ class DummyRepository(AsyncAbstractRepository[Dummy]): ...
 def test_repository_instanciate():
     repo = DummyRepository()
     assert repo.seen == []
+
+
+class AsyncIdentityMapRepository(AsyncFooRepository):
+    use_identity_map: ClassVar[bool] = True
+
+
+async def test_repository_seen():
+    repo = AsyncDummyRepository()
+    foo = DummyModel(id="foo", counter=0)
+    await repo.add(foo)
+    (await repo.get("foo")).unwrap()
+    (await repo.get("foo")).unwrap()
+    assert repo.seen == [foo]
+    assert repo.identity_map == {}
+
+
+async def test_repository_identity_map():
+    repo = AsyncIdentityMapRepository()
+    repo.models["foo"] = DummyModel(id="foo", counter=0)
+    foo = (await repo.get("foo")).unwrap()
+    assert repo.identity_map == {"foo": foo}
+
+    # served by the identity map, not by the storage
+    repo.models["foo"] = DummyModel(id="foo", counter=42)
+    assert (await repo.get("foo")).unwrap() is foo
+    assert repo.seen == [foo]
+
+    repo.clear_identity_map()
+    assert (await repo.get("foo")).unwrap().counter == 42
+
+
+async def test_identity_map_cleared_on_close(uow: AsyncDummyUnitOfWork):
+    uow.foos = AsyncIdentityMapRepository()
+    async with uow as tuow:
+        await tuow.foos.add(DummyModel(id="foo", counter=0))
+        assert list(uow.foos.identity_map) == ["foo"]
+        await tuow.commit()
+    assert uow.foos.identity_map == {}
+
+    async with uow as tuow:
+        (await tuow.foos.get("foo")).unwrap()
+        await tuow.rollback()
+    assert uow.foos.identity_map == {}
+
+
+async def test_identity_map_cascade(uow: AsyncDummyUnitOfWork):
+    uow.foos = AsyncIdentityMapRepository()
+    increments: list[int] = []
+
+    async def listen_command(
+        cmd: DummyCommand, uow: AsyncUnitOfWorkTransaction[AsyncDummyUnitOfWork]
+    ) -> None:
+        foo = DummyModel(id=cmd.id, counter=0)
+        foo.messages.append(DummyEvent(id=foo.id, increment=10))
+        await uow.foos.add(foo)
+
+    async def listen_event(
+        evt: DummyEvent, uow: AsyncUnitOfWorkTransaction[AsyncDummyUnitOfWork]
+    ) -> None:
+        increments.append(evt.increment)
+        if evt.increment == 10:
+            # served by the identity map, after its first event has been collected
+            foo = (await uow.foos.get(evt.id)).unwrap()
+            foo.messages.append(DummyEvent(id=foo.id, increment=1))
+
+    bus: AsyncMessageBus[Any] = AsyncMessageBus()
+    bus.add_listener(DummyCommand, listen_command)
+    bus.add_listener(DummyEvent, listen_event)
+    async with uow as tuow:
+        await bus.handle(DummyCommand(id="foo"), tuow)
+        await tuow.commit()
+    assert increments == [10, 1]
+
+
+class TrackedModel(DummyModel):
+    track_changes: ClassVar[bool] = True
+
+
+async def test_dirty_fields_reset_on_commit(uow: AsyncDummyUnitOfWork):
+    uow.foos = AsyncIdentityMapRepository()
+    uow.foos.models["foo"] = TrackedModel(id="foo", counter=0)
+    async with uow as tuow:
+        foo = (await tuow.foos.get("foo")).unwrap()
+        foo.counter += 1
+        assert foo.dirty_fields == {"counter"}
+        await tuow.rollback()
+    assert foo.dirty_fields == {"counter"}
+
+    async with uow as tuow:
+        foo = (await tuow.foos.get("foo")).unwrap()
+        await tuow.commit()
+    assert foo.dirty_fields == frozenset()
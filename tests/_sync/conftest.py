@@ -73,6 +73,21 @@ class DummyMetricsStore(AbstractMetricsStore):
         else:
             self.processed_count[(msg_metadata.name, msg_metadata.schema_version)] = 1
 
+    def __post_init__(self) -> None:
+        # not dumped, handlers are timed in the tests of the hooks
+        self.handler_processed: list[tuple[str, str]] = []
+        self.handler_failed: list[tuple[str, str]] = []
+
+    def observe_handler_processing_seconds(
+        self, handler_name: str, msg_metadata: Metadata, seconds: float
+    ) -> None:
+        self.handler_processed.append((handler_name, msg_metadata.name))
+
+    def inc_handler_failed_total(
+        self, handler_name: str, msg_metadata: Metadata
+    ) -> None:
+        self.handler_failed.append((handler_name, msg_metadata.name))
+
     def dump(self) -> dict[str, int]:
         return asdict(self)
 
@@ -114,21 +129,27 @@ class SyncDummyRepository(SyncAbstractRepository[DummyModel]):
     models: MutableMapping[str, DummyModel]
 
     def __init__(self) -> None:
-        self.seen = []
+        super().__init__()
         self.models = {}
 
     def add(self, model: DummyModel) -> DummyRepositoryOperationResult:
         if model.id in self.models:
             return Err(DummyError.integrity_error)
         self.models[model.id] = model
-        self.seen.append(model)
+        self.track(model)
         return Ok(...)
 
     def get(self, id: str) -> DummyRepositoryResult:
+        if id in self.identity_map:
+            model = self.identity_map[id]
+            self.track(model)
+            return Ok(model)
         try:
-            return Ok(self.models[id])
+            model = self.models[id]
         except KeyError:
             return Err(DummyError.not_found)
+        self.track(model)
+        return Ok(model)
 
     def find(self, id: str | None = None) -> Iterator[DummyModel]:
         for model in self.models.values():
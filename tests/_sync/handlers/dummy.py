@@ -24,3 +24,7 @@ def handler_with_dependency_injection(
     uow: SyncAbstractUnitOfWork[Any, Any, Any],
     notifier: Notifier,
 ): ...
+
+
+@sync_listen(concurrent=True)
+def handler_evt3(command: DummyEvent, uow: SyncAbstractUnitOfWork[Any, Any, Any]): ...
@@ -0,0 +1,178 @@
+from collections.abc import Mapping, Sequence
+from typing import Any, ClassVar
+
+import pytest
+
+from messagebus import GenericEvent
+from messagebus.service._sync.consumer import SyncEventstreamConsumer
+from messagebus.service._sync.eventstream import (
+    SyncAbstractEventstreamReceiver,
+    SyncEventstreamPublisher,
+)
+from messagebus.service._sync.registry import SyncMessageBus
+from messagebus.service._sync.unit_of_work import SyncUnitOfWorkTransaction
+from messagebus.service.eventstream import MessageSerializer
+from tests._sync.conftest import (
+    DummyModel,
+    SyncDummyMessageStore,
+    SyncDummyUnitOfWork,
+    SyncEventstreamTransport,
+)
+from tests.conftest import AnotherDummyCommand, DummyEvent, MyMetadata
+
+
+class DummyConsumed(GenericEvent[MyMetadata]):
+    id: str
+    metadata: MyMetadata = MyMetadata(
+        name="dummy_consumed", schema_version=1, published=True, custom_field="foo"
+    )
+
+
+class SyncListReceiver(SyncAbstractEventstreamReceiver):
+    consumer: SyncEventstreamConsumer[Any]
+
+    def __init__(self, messages: Sequence[Mapping[str, Any]]) -> None:
+        self.messages = list(messages)
+        self.acknowledged: list[Mapping[str, Any]] = []
+
+    def receive_messages_serialized(
+        self, max_count: int
+    ) -> Sequence[Mapping[str, Any]]:
+        batch, self.messages = self.messages[:max_count], self.messages[max_count:]
+        if not batch:
+            self.consumer.stop()
+        return batch
+
+    def acknowledge(self, messages: Sequence[Mapping[str, Any]]) -> None:
+        self.acknowledged.extend(messages)
+
+
+class SyncRecordingUnitOfWork(SyncDummyUnitOfWork):
+    units: ClassVar[list["SyncRecordingUnitOfWork"]] = []
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.units.append(self)
+
+
+def listen_event(
+    evt: DummyEvent, uow: SyncUnitOfWorkTransaction[SyncRecordingUnitOfWork]
+) -> None:
+    if evt.id == "fail":
+        raise ValueError("Boom")
+    uow.foos.add(DummyModel(id=evt.id, counter=evt.increment))
+
+
+def serialize_events(*ids: str) -> list[Mapping[str, Any]]:
+    serializer = MessageSerializer()
+    return [
+        serializer.serialize_message(DummyEvent(id=id, increment=idx))
+        for idx, id in enumerate(ids)
+    ]
+
+
+@pytest.fixture
+def consumer_bus() -> SyncMessageBus[SyncRecordingUnitOfWork]:
+    SyncRecordingUnitOfWork.units = []
+    bus: SyncMessageBus[SyncRecordingUnitOfWork] = SyncMessageBus()
+    bus.add_listener(DummyEvent, listen_event)
+    return bus
+
+
+@pytest.mark.parametrize("concurrency", [1, 2])
+def test_consume(
+    consumer_bus: SyncMessageBus[SyncRecordingUnitOfWork], concurrency: int
+):
+    messages = serialize_events("foo", "bar", "baz")
+    receiver = SyncListReceiver(messages)
+    consumer = SyncEventstreamConsumer(
+        consumer_bus,
+        SyncRecordingUnitOfWork,
+        receiver,
+        batch_size=10,
+        concurrency=concurrency,
+    )
+    assert consumer.consume() == 3
+    assert receiver.acknowledged == messages
+    assert consumer.consumed_count == 3
+
+    units = SyncRecordingUnitOfWork.units
+    assert [uow.status for uow in units] == ["committed"] * 3
+    assert sorted(
+        (model.id, model.counter) for uow in units for model in uow.foos.models.values()
+    ) == [
+        ("bar", 1),
+        ("baz", 2),
+        ("foo", 0),
+    ]
+
+
+def test_consume_not_published_again(
+    consumer_bus: SyncMessageBus[SyncRecordingUnitOfWork],
+):
+    transport = SyncEventstreamTransport()
+
+    def uow_factory() -> SyncRecordingUnitOfWork:
+        uow = SyncRecordingUnitOfWork()
+        uow.messagestore = SyncDummyMessageStore(SyncEventstreamPublisher(transport))
+        return uow
+
+    def consume_event(
+        evt: DummyEvent, uow: SyncUnitOfWorkTransaction[SyncRecordingUnitOfWork]
+    ) -> None:
+        foo = DummyModel(id=f"{evt.id}-consumed", counter=0)
+        foo.messages.append(DummyConsumed(id=evt.id))
+        uow.foos.add(foo)
+
+    consumer_bus.add_listener(DummyEvent, consume_event)
+    messages = serialize_events("foo")
+    consumer = SyncEventstreamConsumer(
+        consumer_bus, uow_factory, SyncListReceiver(messages)
+    )
+    assert consumer.consume() == 1
+
+    # the consumed event is neither stored nor published again, the events raised
+    # by its listeners are.
+    (uow,) = SyncRecordingUnitOfWork.units
+    assert uow.messagestore.messages == [DummyConsumed(id="foo")]
+    assert str(uow.messagestore.messages[0].causation_id) == messages[0]["id"]
+    assert [evt["type"] for evt in transport.events] == ["dummy_consumed_v1"]
+    assert uow.metrics_store.processing_time == 0
+
+
+def test_consume_failure(
+    consumer_bus: SyncMessageBus[SyncRecordingUnitOfWork],
+):
+    messages = serialize_events("foo", "fail", "bar")
+    receiver = SyncListReceiver(messages)
+    consumer = SyncEventstreamConsumer(consumer_bus, SyncRecordingUnitOfWork, receiver)
+    assert consumer.consume() == 3
+    assert receiver.acknowledged == [messages[0], messages[2]]
+    assert [uow.status for uow in SyncRecordingUnitOfWork.units] == [
+        "committed",
+        "aborted",
+        "committed",
+    ]
+
+
+def test_consume_unknown_message(
+    consumer_bus: SyncMessageBus[SyncRecordingUnitOfWork],
+):
+    messages = [MessageSerializer().serialize_message(AnotherDummyCommand(id="foo"))]
+    receiver = SyncListReceiver(messages)
+    consumer = SyncEventstreamConsumer(consumer_bus, SyncRecordingUnitOfWork, receiver)
+    assert consumer.consume() == 1
+    assert receiver.acknowledged == messages
+    assert SyncRecordingUnitOfWork.units == []
+
+
+def test_consumer_run(
+    consumer_bus: SyncMessageBus[SyncRecordingUnitOfWork],
+):
+    receiver = SyncListReceiver(serialize_events(*[f"foo{i}" for i in range(5)]))
+    consumer = SyncEventstreamConsumer(
+        consumer_bus, SyncRecordingUnitOfWork, receiver, batch_size=2, poll_interval=0
+    )
+    receiver.consumer = consumer
+    consumer.run()
+    assert consumer.consumed_count == 5
@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, ClassVar
 
 import pytest
 
@@ -8,6 +8,7 @@ from messagebus.service._sync.unit_of_work import (
     SyncAbstractUnitOfWork,
     SyncUnitOfWorkTransaction,
 )
+from messagebus.service.dependency import DependencyLifetime
 from tests._sync.conftest import (
     DummyModel,
     Notifier,
@@ -135,3 +136,87 @@ def test_optional_dependency_missing(
         bus.handle(dummy_command, tuow)
         tuow.commit()
     # we tests that there is no issue here
+
+
+class CountedDependency(SyncDependency):
+    instances: ClassVar[int] = 0
+
+    def __init__(self) -> None:
+        type(self).instances += 1
+        self.committed = 0
+
+    def on_after_commit(self) -> None:
+        self.committed += 1
+
+    def on_after_rollback(self) -> None: ...
+
+
+class SingletonDependency(CountedDependency):
+    instances: ClassVar[int] = 0
+    lifetime = DependencyLifetime.singleton
+
+
+class TransactionDependency(CountedDependency):
+    instances: ClassVar[int] = 0
+
+
+class MessageDependency(CountedDependency):
+    instances: ClassVar[int] = 0
+    lifetime = DependencyLifetime.message
+
+
+def listen_command_with_lifetimes(
+    cmd: DummyCommand,
+    uow: SyncUnitOfWorkTransaction[SyncDummyUnitOfWork],
+    single: SingletonDependency,
+    trans: TransactionDependency,
+    msg: MessageDependency,
+) -> DummyModel:
+    foo = DummyModel(id=cmd.id, counter=0)
+    foo.messages.append(DummyEvent(id=foo.id, increment=10))
+    uow.foos.add(foo)
+    return foo
+
+
+def listen_event_with_lifetimes(
+    evt: DummyEvent,
+    uow: SyncUnitOfWorkTransaction[SyncDummyUnitOfWork],
+    single: SingletonDependency,
+    trans: TransactionDependency,
+    msg: MessageDependency,
+) -> None: ...
+
+
+def test_dependency_lifetimes(
+    uow_with_messagestore: SyncDummyUnitOfWorkWithEvents,
+):
+    bus = SyncMessageBus[SyncDummyUnitOfWorkWithEvents](
+        single=SingletonDependency,
+        trans=TransactionDependency,
+        msg=MessageDependency,
+        unused=CountedDependency,
+    )
+    bus.add_listener(DummyCommand, listen_command_with_lifetimes)
+    bus.add_listener(DummyEvent, listen_event_with_lifetimes)
+    bus.add_listener(DummyEvent, listen_event_with_lifetimes)
+
+    with uow_with_messagestore as tuow:
+        bus.handle(DummyCommand(id="foo"), tuow)
+        bus.handle(DummyCommand(id="bar"), tuow)
+        tuow.commit()
+
+    assert CountedDependency.instances == 0
+    assert SingletonDependency.instances == 1
+    assert TransactionDependency.instances == 1
+    assert MessageDependency.instances == 4
+    single = bus._singletons["single"]
+    assert single.committed == 1  # type: ignore
+
+    with uow_with_messagestore as tuow:
+        bus.handle(DummyCommand(id="baz"), tuow)
+        tuow.commit()
+
+    assert SingletonDependency.instances == 1
+    assert TransactionDependency.instances == 2
+    assert MessageDependency.instances == 6
+    assert single.committed == 2  # type: ignore
@@ -1,4 +1,4 @@
-from collections.abc import Mapping, MutableSequence
+from collections.abc import Mapping, MutableSequence, Sequence
 from typing import Any
 
 from messagebus.service._sync.eventstream import (
@@ -27,3 +27,60 @@ def test_send_message(dummy_command: DummyCommand, dummy_event: DummyEvent):
     stream.send_message(dummy_event)
 
     assert transport.queue == [srlz.serialize_message(dummy_event)]
+
+
+class SyncDummyBatchEventstreamTransport(SyncDummyEventstreamTransport):
+    batches: MutableSequence[Sequence[Mapping[str, Any]]]
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.batches = []
+
+    def send_messages_serialized(self, messages: Sequence[Mapping[str, Any]]) -> None:
+        self.batches.append(messages)
+
+
+def test_send_messages(dummy_command: DummyCommand, dummy_event: DummyEvent):
+    srlz = MessageSerializer()
+    transport = SyncDummyEventstreamTransport()
+    stream = SyncEventstreamPublisher(transport, srlz)
+    stream.send_messages([dummy_command, dummy_event, dummy_event])
+    assert transport.queue == [
+        srlz.serialize_message(dummy_event),
+        srlz.serialize_message(dummy_event),
+    ]
+
+
+def test_send_messages_batch(dummy_command: DummyCommand, dummy_event: DummyEvent):
+    srlz = MessageSerializer()
+    transport = SyncDummyBatchEventstreamTransport()
+    stream = SyncEventstreamPublisher(transport, srlz)
+    stream.send_messages([dummy_command])
+    assert transport.batches == []
+    stream.send_messages([dummy_command, dummy_event, dummy_event])
+    assert transport.batches == [
+        [srlz.serialize_message(dummy_event), srlz.serialize_message(dummy_event)]
+    ]
+    assert transport.queue == []
+
+
+def test_serializer_message_type(dummy_event: DummyEvent):
+    srlz = MessageSerializer()
+    assert srlz.message_type(dummy_event.metadata) == "dummied_v1"
+    assert srlz._message_types == {("dummied", 1): "dummied_v1"}
+    assert srlz.serialize_message(dummy_event) == {
+        "id": str(dummy_event.message_id),
+        "created_at": dummy_event.created_at.isoformat(),
+        "causation_id": None,
+        "correlation_id": None,
+        "type": "dummied_v1",
+        "payload": dummy_event.model_dump_json(
+            exclude={
+                "message_id",
+                "created_at",
+                "causation_id",
+                "correlation_id",
+                "metadata",
+            }
+        ),
+    }
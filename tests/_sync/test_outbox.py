@@ -0,0 +1,182 @@
+import sqlite3
+from collections.abc import Iterator, Mapping, Sequence
+from typing import Any
+
+import pytest
+
+from messagebus.service._sync.eventstream import SyncEventstreamPublisher
+from messagebus.service._sync.outbox import (
+    SyncInMemoryOutboxMessageStore,
+    SyncOutboxRelay,
+    SyncSQLiteOutboxMessageStore,
+)
+from messagebus.service._sync.registry import SyncMessageBus
+from messagebus.service._sync.repository import (
+    SyncAbstractOutboxMessageStoreRepository,
+)
+from messagebus.service._sync.unit_of_work import (
+    SyncAbstractUnitOfWork,
+    SyncUnitOfWorkTransaction,
+)
+from messagebus.service.eventstream import MsgpackMessageSerializer
+from tests._sync.conftest import (
+    DummyMetricsStore,
+    DummyModel,
+    SyncDummyRepository,
+    SyncEventstreamTransport,
+    SyncFooRepository,
+)
+from tests.conftest import DummyCommand, DummyEvent
+
+
+class SyncOutboxUnitOfWork(SyncAbstractUnitOfWork[Any, Any, Any]):
+    def __init__(
+        self,
+        messagestore: SyncAbstractOutboxMessageStoreRepository,
+        connection: sqlite3.Connection | None = None,
+    ) -> None:
+        self.foos = SyncFooRepository()
+        self.bars = SyncDummyRepository()
+        self.messagestore = messagestore
+        self.metrics_store = DummyMetricsStore()
+        self.connection = connection
+
+    def commit(self) -> None:
+        if self.connection:
+            self.connection.commit()
+
+    def rollback(self) -> None:
+        if self.connection:
+            self.connection.rollback()
+
+
+class SyncFailingTransport(SyncEventstreamTransport):
+    def send_messages_serialized(self, messages: Sequence[Mapping[str, Any]]) -> None:
+        raise ConnectionError("Broker unavailable")
+
+
+class SyncStoppingTransport(SyncEventstreamTransport):
+    relay: SyncOutboxRelay[Any]
+
+    def send_messages_serialized(self, messages: Sequence[Mapping[str, Any]]) -> None:
+        self.events.extend(messages)
+        self.relay.stop()
+
+
+def listen_command(
+    cmd: DummyCommand,
+    uow: SyncUnitOfWorkTransaction[SyncOutboxUnitOfWork],
+) -> DummyModel:
+    foo = DummyModel(id=cmd.id, counter=0)
+    foo.messages.append(DummyEvent(id=foo.id, increment=10))
+    uow.foos.add(foo)
+    return foo
+
+
+@pytest.fixture
+def connection() -> Iterator[sqlite3.Connection]:
+    connection = sqlite3.connect(":memory:")
+    yield connection
+    connection.close()
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def outbox_uow(
+    request: pytest.FixtureRequest, connection: sqlite3.Connection
+) -> SyncOutboxUnitOfWork:
+    if request.param == "memory":
+        return SyncOutboxUnitOfWork(SyncInMemoryOutboxMessageStore())
+    messagestore = SyncSQLiteOutboxMessageStore(connection)
+    messagestore.create_tables()
+    return SyncOutboxUnitOfWork(messagestore, connection)
+
+
+def handle_commands(
+    bus: SyncMessageBus[Any], uow: SyncOutboxUnitOfWork, *ids: str
+) -> None:
+    bus.add_listener(DummyCommand, listen_command)
+    with uow as tuow:
+        bus.handle_many([DummyCommand(id=id) for id in ids], tuow)
+        tuow.commit()
+
+
+def test_outbox_relay(
+    bus: SyncMessageBus[Any],
+    outbox_uow: SyncOutboxUnitOfWork,
+):
+    handle_commands(bus, outbox_uow, "foo", "bar", "baz")
+
+    transport = SyncEventstreamTransport()
+    relay = SyncOutboxRelay(
+        outbox_uow, SyncEventstreamPublisher(transport), batch_size=2
+    )
+    assert transport.events == []
+    assert relay.relay() == 2
+    assert relay.relay() == 1
+    assert relay.relay() == 0
+    assert [evt["payload"] for evt in transport.events] == [
+        '{"id":"foo","increment":10}',
+        '{"id":"bar","increment":10}',
+        '{"id":"baz","increment":10}',
+    ]
+    assert relay.published_count == 3
+
+
+def test_outbox_binary_serializer(
+    bus: SyncMessageBus[Any], connection: sqlite3.Connection
+):
+    serializer = MsgpackMessageSerializer()
+    messagestore = SyncSQLiteOutboxMessageStore(connection, serializer)
+    messagestore.create_tables()
+    handle_commands(bus, SyncOutboxUnitOfWork(messagestore, connection), "foo")
+
+    (pending,) = messagestore.fetch_pending_messages(10)
+    frame = pending.serialized["frame"]
+    assert isinstance(frame, bytes)
+    assert serializer.decode_frame(frame)["payload"] == {"id": "foo", "increment": 10}
+
+
+def test_outbox_rollback(
+    bus: SyncMessageBus[Any],
+    outbox_uow: SyncOutboxUnitOfWork,
+):
+    bus.add_listener(DummyCommand, listen_command)
+    with outbox_uow as tuow:
+        bus.handle(DummyCommand(id="foo"), tuow)
+        tuow.rollback()
+
+    transport = SyncEventstreamTransport()
+    relay = SyncOutboxRelay(outbox_uow, SyncEventstreamPublisher(transport))
+    assert relay.relay() == 0
+
+
+def test_outbox_at_least_once(
+    bus: SyncMessageBus[Any],
+    outbox_uow: SyncOutboxUnitOfWork,
+):
+    handle_commands(bus, outbox_uow, "foo")
+
+    relay = SyncOutboxRelay(
+        outbox_uow, SyncEventstreamPublisher(SyncFailingTransport())
+    )
+    with pytest.raises(ConnectionError):
+        relay.relay()
+
+    transport = SyncEventstreamTransport()
+    relay = SyncOutboxRelay(outbox_uow, SyncEventstreamPublisher(transport))
+    assert relay.relay() == 1
+
+
+def test_outbox_run(
+    bus: SyncMessageBus[Any],
+    outbox_uow: SyncOutboxUnitOfWork,
+):
+    handle_commands(bus, outbox_uow, "foo", "bar")
+
+    transport = SyncStoppingTransport()
+    relay = SyncOutboxRelay(
+        outbox_uow, SyncEventstreamPublisher(transport), poll_interval=0
+    )
+    transport.relay = relay
+    relay.run()
+    assert len(transport.events) == 2
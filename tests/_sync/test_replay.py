@@ -0,0 +1,226 @@
+import sqlite3
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from typing import Any
+
+import pytest
+
+from messagebus.service._sync.outbox import (
+    SyncInMemoryOutboxMessageStore,
+    SyncSQLiteOutboxMessageStore,
+)
+from messagebus.service._sync.registry import SyncMessageBus
+from messagebus.service._sync.replay import (
+    SyncInMemoryReplayCheckpointStore,
+    SyncReplayRunner,
+)
+from messagebus.service._sync.repository import (
+    SyncAbstractOutboxMessageStoreRepository,
+    SyncSinkholeMessageStoreRepository,
+)
+from messagebus.service._sync.unit_of_work import (
+    SyncAbstractUnitOfWork,
+    SyncUnitOfWorkTransaction,
+)
+from messagebus.service.message_registry import MessageTypeRegistry
+from tests._sync.conftest import (
+    DummyMetricsStore,
+    DummyModel,
+    SyncDummyRepository,
+    SyncFooRepository,
+)
+from tests.conftest import DummyCommand, DummyEvent
+
+
+class SyncReplayUnitOfWork(SyncAbstractUnitOfWork[Any, Any, Any]):
+    def __init__(
+        self,
+        messagestore: SyncAbstractOutboxMessageStoreRepository,
+        connection: sqlite3.Connection | None = None,
+    ) -> None:
+        self.foos = SyncFooRepository()
+        self.bars = SyncDummyRepository()
+        self.messagestore = messagestore
+        self.metrics_store = DummyMetricsStore()
+        self.connection = connection
+
+    def commit(self) -> None:
+        if self.connection:
+            self.connection.commit()
+
+    def rollback(self) -> None:
+        if self.connection:
+            self.connection.rollback()
+
+
+def listen_command(
+    cmd: DummyCommand,
+    uow: SyncUnitOfWorkTransaction[SyncReplayUnitOfWork],
+) -> None:
+    foo = DummyModel(id=cmd.id, counter=0)
+    foo.messages.append(DummyEvent(id=foo.id, increment=10))
+    uow.foos.add(foo)
+
+
+def project_event(
+    evt: DummyEvent,
+    uow: SyncUnitOfWorkTransaction[SyncReplayUnitOfWork],
+) -> None:
+    bar = DummyModel(id=evt.id, counter=evt.increment)
+    bar.messages.append(DummyEvent(id=bar.id, increment=1))
+    uow.bars.add(bar)
+
+
+@pytest.fixture
+def connection() -> Iterator[sqlite3.Connection]:
+    connection = sqlite3.connect(":memory:")
+    yield connection
+    connection.close()
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def replay_uow(
+    request: pytest.FixtureRequest, connection: sqlite3.Connection
+) -> SyncReplayUnitOfWork:
+    if request.param == "memory":
+        return SyncReplayUnitOfWork(SyncInMemoryOutboxMessageStore())
+    messagestore = SyncSQLiteOutboxMessageStore(connection, fetch_size=2)
+    messagestore.create_tables()
+    return SyncReplayUnitOfWork(messagestore, connection)
+
+
+@pytest.fixture
+def projection_bus() -> SyncMessageBus[SyncReplayUnitOfWork]:
+    bus: SyncMessageBus[SyncReplayUnitOfWork] = SyncMessageBus()
+    bus.add_listener(DummyEvent, project_event)
+    return bus
+
+
+def handle_commands(uow: SyncReplayUnitOfWork, *ids: str) -> None:
+    bus: SyncMessageBus[SyncReplayUnitOfWork] = SyncMessageBus()
+    bus.add_listener(DummyCommand, listen_command)
+    with uow as tuow:
+        bus.handle_many([DummyCommand(id=id) for id in ids], tuow)
+        tuow.commit()
+
+
+def test_iter_messages(replay_uow: SyncReplayUnitOfWork):
+    handle_commands(replay_uow, "foo", "bar")
+    messagestore = replay_uow.messagestore
+
+    messages = [
+        msg for msg in messagestore.iter_messages(types=[DummyCommand, DummyEvent])
+    ]
+    # messages are read in the order they have been created
+    assert messages == [
+        DummyCommand(id="foo"),
+        DummyCommand(id="bar"),
+        DummyEvent(id="foo", increment=10),
+        DummyEvent(id="bar", increment=10),
+    ]
+
+    events = [msg for msg in messagestore.iter_messages(types=[DummyEvent])]
+    assert events == [
+        DummyEvent(id="foo", increment=10),
+        DummyEvent(id="bar", increment=10),
+    ]
+
+    since = messages[1].created_at
+    assert [
+        msg
+        for msg in messagestore.iter_messages(
+            since=since, types=[DummyCommand, DummyEvent]
+        )
+    ] == messages[2:]
+
+
+def test_iter_messages_correlation_id(replay_uow: SyncReplayUnitOfWork):
+    handle_commands(replay_uow, "foo", "bar")
+    messagestore = replay_uow.messagestore
+    cmd = [msg for msg in messagestore.iter_messages(types=[DummyCommand])][1]
+    assert cmd.correlation_id == cmd.message_id
+    messages = [
+        msg
+        for msg in messagestore.iter_messages(
+            types=[DummyCommand, DummyEvent], correlation_id=cmd.message_id
+        )
+    ]
+    assert messages == [DummyCommand(id="bar"), DummyEvent(id="bar", increment=10)]
+    assert messages[1].causation_id == cmd.message_id
+
+
+def test_iter_messages_registry(connection: sqlite3.Connection):
+    registry = MessageTypeRegistry()
+    registry.register(DummyEvent)
+    messagestore = SyncSQLiteOutboxMessageStore(connection, message_types=registry)
+    messagestore.create_tables()
+    handle_commands(SyncReplayUnitOfWork(messagestore, connection), "foo")
+    assert [msg for msg in messagestore.iter_messages()] == [
+        DummyEvent(id="foo", increment=10)
+    ]
+
+    messagestore.message_types = None
+    with pytest.raises(ValueError):
+        [msg for msg in messagestore.iter_messages()]
+
+
+def test_iter_messages_default():
+    messagestore = SyncSinkholeMessageStoreRepository()
+    assert [msg for msg in messagestore.iter_messages()] == []
+
+
+def test_replay(
+    projection_bus: SyncMessageBus[SyncReplayUnitOfWork],
+    replay_uow: SyncReplayUnitOfWork,
+):
+    handle_commands(replay_uow, "foo", "bar", "baz")
+    checkpoint_store = SyncInMemoryReplayCheckpointStore()
+    runner = SyncReplayRunner(
+        "bars",
+        projection_bus,
+        replay_uow,
+        checkpoint_store=checkpoint_store,
+        batch_size=2,
+    )
+    assert runner.types == [DummyEvent]
+    assert runner.run() == 3
+    assert runner.replayed_count == 3
+    assert list(replay_uow.bars.models) == ["foo", "bar", "baz"]
+    assert replay_uow.bars.seen == []
+    assert checkpoint_store.checkpoints["bars"] == runner.checkpoint
+
+    # replayed messages and the events raised while replaying are not stored
+    events = replay_uow.messagestore.iter_messages(types=[DummyEvent])
+    assert len([msg for msg in events]) == 3
+
+    assert runner.run() == 0
+
+    handle_commands(replay_uow, "qux")
+    assert runner.run() == 1
+    assert list(replay_uow.bars.models) == ["foo", "bar", "baz", "qux"]
+    assert runner.replayed_count == 4
+
+
+def test_replay_same_created_at(
+    projection_bus: SyncMessageBus[SyncReplayUnitOfWork],
+    replay_uow: SyncReplayUnitOfWork,
+):
+    created_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    events = [
+        DummyEvent(id=id, increment=1, created_at=created_at)
+        for id in ("foo", "bar", "baz")
+    ]
+    with replay_uow as tuow:
+        tuow.messagestore.add_many(events)
+        tuow.commit()
+    events.sort(key=lambda evt: evt.message_id)
+
+    checkpoint_store = SyncInMemoryReplayCheckpointStore()
+    # a previous run stopped between the messages created at the same date
+    checkpoint_store.save_checkpoint("bars", (created_at, events[0].message_id))
+    runner = SyncReplayRunner(
+        "bars", projection_bus, replay_uow, checkpoint_store=checkpoint_store
+    )
+    assert runner.run() == 2
+    assert list(replay_uow.bars.models) == [evt.id for evt in events[1:]]
+    assert runner.checkpoint == (created_at, events[-1].message_id)
@@ -1,5 +1,16 @@
+from typing import Any, ClassVar
+
 from messagebus import Model
+from messagebus.service._sync.registry import SyncMessageBus
 from messagebus.service._sync.repository import SyncAbstractRepository
+from messagebus.service._sync.unit_of_work import SyncUnitOfWorkTransaction
+from tests._sync.conftest import (
+    DummyModel,
+    SyncDummyRepository,
+    SyncDummyUnitOfWork,
+    SyncFooRepository,
+)
+from tests.conftest import DummyCommand, DummyEvent
 
 
 class Dummy(Model): ...
@@ -11,3 +22,95 @@ class DummyRepository(SyncAbstractRepository[Dummy]): ...
 def test_repository_instanciate():
     repo = DummyRepository()
     assert repo.seen == []
+
+
+class SyncIdentityMapRepository(SyncFooRepository):
+    use_identity_map: ClassVar[bool] = True
+
+
+def test_repository_seen():
+    repo = SyncDummyRepository()
+    foo = DummyModel(id="foo", counter=0)
+    repo.add(foo)
+    (repo.get("foo")).unwrap()
+    (repo.get("foo")).unwrap()
+    assert repo.seen == [foo]
+    assert repo.identity_map == {}
+
+
+def test_repository_identity_map():
+    repo = SyncIdentityMapRepository()
+    repo.models["foo"] = DummyModel(id="foo", counter=0)
+    foo = (repo.get("foo")).unwrap()
+    assert repo.identity_map == {"foo": foo}
+
+    # served by the identity map, not by the storage
+    repo.models["foo"] = DummyModel(id="foo", counter=42)
+    assert (repo.get("foo")).unwrap() is foo
+    assert repo.seen == [foo]
+
+    repo.clear_identity_map()
+    assert (repo.get("foo")).unwrap().counter == 42
+
+
+def test_identity_map_cleared_on_close(uow: SyncDummyUnitOfWork):
+    uow.foos = SyncIdentityMapRepository()
+    with uow as tuow:
+        tuow.foos.add(DummyModel(id="foo", counter=0))
+        assert list(uow.foos.identity_map) == ["foo"]
+        tuow.commit()
+    assert uow.foos.identity_map == {}
+
+    with uow as tuow:
+        (tuow.foos.get("foo")).unwrap()
+        tuow.rollback()
+    assert uow.foos.identity_map == {}
+
+
+def test_identity_map_cascade(uow: SyncDummyUnitOfWork):
+    uow.foos = SyncIdentityMapRepository()
+    increments: list[int] = []
+
+    def listen_command(
+        cmd: DummyCommand, uow: SyncUnitOfWorkTransaction[SyncDummyUnitOfWork]
+    ) -> None:
+        foo = DummyModel(id=cmd.id, counter=0)
+        foo.messages.append(DummyEvent(id=foo.id, increment=10))
+        uow.foos.add(foo)
+
+    def listen_event(
+        evt: DummyEvent, uow: SyncUnitOfWorkTransaction[SyncDummyUnitOfWork]
+    ) -> None:
+        increments.append(evt.increment)
+        if evt.increment == 10:
+            # served by the identity map, after its first event has been collected
+            foo = (uow.foos.get(evt.id)).unwrap()
+            foo.messages.append(DummyEvent(id=foo.id, increment=1))
+
+    bus: SyncMessageBus[Any] = SyncMessageBus()
+    bus.add_listener(DummyCommand, listen_command)
+    bus.add_listener(DummyEvent, listen_event)
+    with uow as tuow:
+        bus.handle(DummyCommand(id="foo"), tuow)
+        tuow.commit()
+    assert increments == [10, 1]
+
+
+class TrackedModel(DummyModel):
+    track_changes: ClassVar[bool] = True
+
+
+def test_dirty_fields_reset_on_commit(uow: SyncDummyUnitOfWork):
+    uow.foos = SyncIdentityMapRepository()
+    uow.foos.models["foo"] = TrackedModel(id="foo", counter=0)
+    with uow as tuow:
+        foo = (tuow.foos.get("foo")).unwrap()
+        foo.counter += 1
+        assert foo.dirty_fields == {"counter"}
+        tuow.rollback()
+    assert foo.dirty_fields == {"counter"}
+
+    with uow as tuow:
+        foo = (tuow.foos.get("foo")).unwrap()
+        tuow.commit()
+    assert foo.dirty_fields == frozenset()
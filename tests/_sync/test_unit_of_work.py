@@ -10,6 +10,7 @@ from tests._sync.conftest import (
     DummyMetricsStore,
     DummyModel,
     MyMetadata,
+    SyncDummyRepository,
     SyncDummyUnitOfWork,
 )
 
@@ -55,6 +56,63 @@ def test_collect_new_events(uow: SyncDummyUnitOfWork, foo_factory: type[DummyMod
         next(iter)
 
 
+def test_collect_new_events_bulk(
+    uow: SyncDummyUnitOfWork, foo_factory: type[DummyModel]
+):
+    # 10k models with 10 messages, collecting them used to be quadratic
+    for i in range(10_000):
+        foo = foo_factory(id=str(i), counter=0)
+        foo.messages.extend([FooCreated(id=str(i))] * 10)
+        uow.foos.add(foo)
+
+    events = list(uow.collect_new_events())
+    assert len(events) == 100_000
+    assert [evt.id for evt in events[::10]] == [str(i) for i in range(10_000)]  # type: ignore
+    assert uow.foos.seen == []
+    assert uow.foos.models["0"].messages == []
+
+
+def test_collect_new_events_dirty_repositories(
+    uow: SyncDummyUnitOfWork, foo_factory: type[DummyModel]
+):
+    assert list(uow._iter_repositories()) == [uow.foos, uow.bars]
+    assert uow._dirty_repositories == {}
+
+    bar = foo_factory(id="1", counter=0)
+    bar.messages.append(BarCreated())
+    uow.bars.add(bar)
+    assert list(uow._dirty_repositories) == ["bars"]
+    assert list(uow.collect_new_events()) == [BarCreated()]
+    assert uow._dirty_repositories == {}
+
+    # models tracked before the repository is assigned are collected
+    bars = SyncDummyRepository()
+    bar = foo_factory(id="2", counter=0)
+    bar.messages.append(BarCreated())
+    bars.seen = [bar]
+    uow.bars = bars
+    assert list(uow._iter_repositories()) == [uow.foos, bars]
+    assert list(uow.collect_new_events()) == [BarCreated()]
+
+    # a replaced repository is not collected anymore
+    bars.add(foo_factory(id="3", counter=0))
+    uow.bars = SyncDummyRepository()
+    assert uow._dirty_repositories == {}
+    assert list(uow.collect_new_events()) == []
+
+
+def test_collect_new_events_seen_reassigned(
+    uow: SyncDummyUnitOfWork, foo_factory: type[DummyModel]
+):
+    # a repository that replaces its seen models is still flagged as dirty
+    uow.bars.seen = []
+    bar = foo_factory(id="1", counter=0)
+    bar.messages.append(BarCreated())
+    uow.bars.add(bar)
+    assert list(uow._dirty_repositories) == ["bars"]
+    assert list(uow.collect_new_events()) == [BarCreated()]
+
+
 def test_transaction_rollback_on_error(
     uow: SyncDummyUnitOfWork, metrics: DummyMetricsStore
 ):
@@ -0,0 +1,147 @@
+from typing import Any
+
+import pytest
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+
+from messagebus.adapters.opentelemetry.tracer import (
+    OpenTelemetryMessageSerializer,
+    OpenTelemetryTracer,
+)
+from messagebus.service._async.registry import AsyncMessageBus
+from messagebus.service._async.unit_of_work import AsyncUnitOfWorkTransaction
+from tests._async.conftest import (
+    AsyncDummyMessageStore,
+    AsyncDummyUnitOfWork,
+    DummyModel,
+)
+from tests.conftest import DummyCommand, DummyEvent
+
+
+async def listen_command(
+    cmd: DummyCommand, uow: AsyncUnitOfWorkTransaction[AsyncDummyUnitOfWork]
+) -> None:
+    foo = DummyModel(id=cmd.id, counter=0)
+    foo.messages.append(DummyEvent(id=foo.id, increment=10))
+    await uow.foos.add(foo)
+
+
+async def listen_event(
+    evt: DummyEvent, uow: AsyncUnitOfWorkTransaction[AsyncDummyUnitOfWork]
+) -> None: ...
+
+
+@pytest.fixture()
+def exporter() -> InMemorySpanExporter:
+    return InMemorySpanExporter()
+
+
+@pytest.fixture()
+def tracer_provider(exporter: InMemorySpanExporter) -> TracerProvider:
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    return provider
+
+
+@pytest.fixture()
+def bus() -> AsyncMessageBus[Any]:
+    bus: AsyncMessageBus[Any] = AsyncMessageBus()
+    bus.add_listener(DummyCommand, listen_command)
+    bus.add_listener(DummyEvent, listen_event)
+    return bus
+
+
+async def handle(
+    bus: AsyncMessageBus[Any], tracer: OpenTelemetryTracer, *ids: str
+) -> AsyncDummyUnitOfWork:
+    uow = AsyncDummyUnitOfWork()
+    uow.messagestore = AsyncDummyMessageStore(publisher=None)
+    uow.tracer = tracer
+    async with uow as tuow:
+        for id in ids:
+            await bus.handle(DummyCommand(id=id), tuow)
+        await tuow.commit()
+    return uow
+
+
+def spans_by_name(exporter: InMemorySpanExporter) -> dict[str, ReadableSpan]:
+    return {span.name: span for span in exporter.get_finished_spans()}
+
+
+async def test_tracer(
+    bus: AsyncMessageBus[Any],
+    tracer_provider: TracerProvider,
+    exporter: InMemorySpanExporter,
+):
+    tracer = OpenTelemetryTracer(tracer_provider)
+    await handle(bus, tracer, "foo")
+    spans = spans_by_name(exporter)
+    assert set(spans) == {"handle dummy", "dispatch dummy", "dispatch dummied"}
+
+    handle_span = spans["handle dummy"]
+    assert handle_span.attributes == {
+        "messaging.system": "messagebus",
+        "messaging.message.id": handle_span.attributes["messaging.message.id"],  # type: ignore
+        "messagebus.message.name": "dummy",
+        "messagebus.message.version": 1,
+    }
+    command_span, event_span = spans["dispatch dummy"], spans["dispatch dummied"]
+    assert command_span.parent == handle_span.context
+    assert event_span.parent == handle_span.context
+    assert command_span.links == ()
+    assert [link.context for link in event_span.links] == [handle_span.context]
+
+
+async def test_tracer_hooks(
+    bus: AsyncMessageBus[Any],
+    tracer_provider: TracerProvider,
+    exporter: InMemorySpanExporter,
+):
+    tracer = OpenTelemetryTracer(tracer_provider, trace_hooks=True)
+    await handle(bus, tracer, "foo")
+    spans = spans_by_name(exporter)
+    hook_span = spans[f"{__name__}.listen_event"]
+    assert hook_span.parent == spans["dispatch dummied"].context
+    assert f"{__name__}.listen_command" in spans
+
+
+async def test_tracer_sampling(
+    bus: AsyncMessageBus[Any],
+    tracer_provider: TracerProvider,
+    exporter: InMemorySpanExporter,
+):
+    tracer = OpenTelemetryTracer(tracer_provider, trace_hooks=True, sample_ratio=0)
+    await handle(bus, tracer, "foo", "bar")
+    assert exporter.get_finished_spans() == ()
+    assert tracer._trace_contexts == {}
+
+
+async def test_message_serializer(
+    bus: AsyncMessageBus[Any],
+    tracer_provider: TracerProvider,
+    exporter: InMemorySpanExporter,
+):
+    tracer = OpenTelemetryTracer(tracer_provider, max_trace_contexts=2)
+    uow = await handle(bus, tracer, "foo", "bar", "baz")
+
+    # only the published events have a trace context, the oldest has been dropped
+    assert len(tracer._trace_contexts) == 2
+    published = [msg for msg in uow.messagestore.messages if msg.metadata.published]
+    serializer = OpenTelemetryMessageSerializer(tracer)
+    serialized = [serializer.serialize_message(msg) for msg in published]
+    assert "traceparent" not in serialized[0]
+
+    event_span = [
+        span
+        for span in exporter.get_finished_spans()
+        if span.name == "dispatch dummied"
+    ][1]
+    ctx = event_span.get_span_context()
+    assert serialized[1]["traceparent"] == (
+        f"00-{ctx.trace_id:032x}-{ctx.span_id:016x}-{ctx.trace_flags:02x}"  # type: ignore
+    )
+    assert serialized[1]["type"] == "dummied_v1"
+    assert tracer._trace_contexts == {}
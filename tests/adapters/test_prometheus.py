@@ -6,7 +6,7 @@ from prometheus_client import CollectorRegistry
 
 from messagebus import Metadata, TransactionStatus
 from messagebus.adapters.prometheus.metrics_store import MetricsStore, Singleton
-from tests.conftest import DummyCommand
+from tests.conftest import DummyCommand, DummyEvent
 
 
 @pytest.fixture()
@@ -155,3 +155,71 @@ async def test_prometheusinc_command_processing_timer(
         )
         or 0 > 0
     )
+
+
+def test_prometheus_inc_eventstream_queue_full_total(
+    metrics: MetricsStore, registry: CollectorRegistry
+):
+    metrics.inc_eventstream_queue_full_total("block")
+    assert (
+        registry.get_sample_value(
+            "messagebus_eventstream_queue_full_total", labels={"policy": "block"}
+        )
+        == 1
+    )
+
+
+def test_prometheus_inc_messages_replayed_total(
+    metrics: MetricsStore, registry: CollectorRegistry
+):
+    metrics.inc_messages_replayed_total("projection", 42)
+    assert (
+        registry.get_sample_value(
+            "messagebus_messages_replayed_total", labels={"replay": "projection"}
+        )
+        == 42
+    )
+
+
+def test_prometheus_handler_metrics(
+    metrics: MetricsStore, registry: CollectorRegistry, dummy_event: DummyEvent
+):
+    labels = {"handler": "tests.handler", "name": "dummied", "version": "1"}
+    metrics.observe_handler_processing_seconds(
+        "tests.handler", dummy_event.metadata, 0.5
+    )
+    metrics.inc_handler_failed_total("tests.handler", dummy_event.metadata)
+    assert (
+        registry.get_sample_value(
+            "messagebus_handler_processing_seconds_count", labels=labels
+        )
+        == 1
+    )
+    assert (
+        registry.get_sample_value("messagebus_handler_processing_seconds_sum", labels)
+        == 0.5
+    )
+    assert registry.get_sample_value("messagebus_handler_failed_total", labels) == 1
+
+
+def test_prometheus_labels_cache(
+    metrics: MetricsStore, registry: CollectorRegistry, dummy_event: DummyEvent
+):
+    for _ in range(3):
+        metrics.inc_messages_processed_total(dummy_event.metadata)
+        metrics.inc_transaction_closed_count(TransactionStatus.committed)
+    assert list(metrics._messages_processed.children) == [("dummied", 1)]
+    assert list(metrics._transactions_closed.children) == [TransactionStatus.committed]
+    assert (
+        registry.get_sample_value(
+            "messagebus_messages_processed_total",
+            labels={"name": "dummied", "version": "1"},
+        )
+        == 3
+    )
+    assert (
+        registry.get_sample_value(
+            "messagebus_transactions_closed_total", labels={"status": "committed"}
+        )
+        == 3
+    )
@@ -0,0 +1,115 @@
+import asyncio
+import json
+from collections.abc import Mapping, MutableSequence, Sequence
+from typing import Any
+
+import pytest
+
+from messagebus import AsyncAbstractEventstreamTransport
+from messagebus.ports.observability import SinkholeMetricsStore
+from messagebus.service.background import (
+    AsyncBackgroundEventstreamPublisher,
+    OverflowPolicy,
+)
+from tests.conftest import DummyCommand, DummyEvent
+
+
+class BatchTransport(AsyncAbstractEventstreamTransport):
+    batches: MutableSequence[Sequence[Mapping[str, Any]]]
+
+    def __init__(self) -> None:
+        self.batches = []
+        self.ready = asyncio.Event()
+        self.ready.set()
+
+    async def send_message_serialized(self, message: Mapping[str, Any]) -> None:
+        raise NotImplementedError  # coverage: ignore
+
+    async def send_messages_serialized(
+        self, messages: Sequence[Mapping[str, Any]]
+    ) -> None:
+        await self.ready.wait()
+        self.batches.append(messages)
+
+
+class QueueFullMetricsStore(SinkholeMetricsStore):
+    def __init__(self) -> None:
+        self.queue_full: list[str] = []
+
+    def inc_eventstream_queue_full_total(self, overflow_policy: str) -> None:
+        self.queue_full.append(overflow_policy)
+
+
+def events(count: int) -> list[DummyEvent]:
+    return [DummyEvent(id=str(idx), increment=idx) for idx in range(count)]
+
+
+async def test_background_publisher_batch():
+    transport = BatchTransport()
+    publisher = AsyncBackgroundEventstreamPublisher(
+        transport, batch_size=3, batch_timeout=0.01
+    )
+    await publisher.send_messages([DummyCommand(id="cmd"), *events(5)])
+    await publisher.shutdown()
+    assert [[evt["payload"] for evt in batch] for batch in transport.batches] == [
+        [
+            '{"id":"0","increment":0}',
+            '{"id":"1","increment":1}',
+            '{"id":"2","increment":2}',
+        ],
+        [
+            '{"id":"3","increment":3}',
+            '{"id":"4","increment":4}',
+        ],
+    ]
+
+
+@pytest.mark.parametrize(
+    "policy,expected",
+    [
+        (OverflowPolicy.drop_newest, ["0", "1"]),
+        (OverflowPolicy.drop_oldest, ["2", "3"]),
+    ],
+)
+async def test_background_publisher_drop(policy: OverflowPolicy, expected: list[str]):
+    transport = BatchTransport()
+    transport.ready.clear()
+    metrics = QueueFullMetricsStore()
+    publisher = AsyncBackgroundEventstreamPublisher(
+        transport,
+        max_queue_size=2,
+        batch_size=10,
+        batch_timeout=0,
+        overflow_policy=policy,
+        metrics_store=metrics,
+    )
+    publisher.start()
+    await asyncio.sleep(0)
+    await publisher.send_messages(events(4))
+    assert metrics.queue_full == [policy.value, policy.value]
+    transport.ready.set()
+    await publisher.shutdown()
+    assert [json.loads(evt["payload"])["id"] for evt in transport.batches[0]] == (
+        expected
+    )
+
+
+async def test_background_publisher_block():
+    transport = BatchTransport()
+    transport.ready.clear()
+    metrics = QueueFullMetricsStore()
+    publisher = AsyncBackgroundEventstreamPublisher(
+        transport,
+        max_queue_size=1,
+        batch_size=1,
+        batch_timeout=0,
+        metrics_store=metrics,
+    )
+    sending = asyncio.ensure_future(publisher.send_messages(events(3)))
+    await asyncio.sleep(0.01)
+    assert not sending.done()
+    transport.ready.set()
+    await sending
+    await publisher.shutdown()
+    assert len(transport.batches) == 3
+    assert metrics.queue_full == ["block", "block"]
@@ -0,0 +1,41 @@
+import asyncio
+
+import pytest
+
+from messagebus.service.concurrency import async_gather, sync_gather
+
+
+async def test_async_gather():
+    started = asyncio.Event()
+
+    async def waiter() -> str:
+        await started.wait()
+        return "waiter"
+
+    async def starter() -> str:
+        started.set()
+        return "starter"
+
+    assert await async_gather(waiter(), starter()) == ["waiter", "starter"]
+
+
+async def test_async_gather_cancel_on_error():
+    cancelled = asyncio.Event()
+
+    async def sleeper() -> None:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def failure() -> None:
+        raise ValueError("Boom")
+
+    with pytest.raises(ValueError):
+        await async_gather(sleeper(), failure())
+    assert cancelled.is_set()
+
+
+def test_sync_gather():
+    assert sync_gather(1, 2) == [1, 2]
@@ -0,0 +1,37 @@
+from messagebus import FifoDispatchQueue, PriorityDispatchQueue
+from tests.conftest import AnotherDummyCommand, DummyCommand, DummyEvent
+
+
+def test_fifo_dispatch_queue():
+    queue = FifoDispatchQueue()
+    assert not queue
+    queue.append(DummyCommand(id="1"))
+    queue.extend([DummyEvent(id="2", increment=1), DummyEvent(id="3", increment=1)])
+    assert len(queue) == 3
+    assert [queue.popleft() for _ in range(len(queue))] == [
+        DummyCommand(id="1"),
+        DummyEvent(id="2", increment=1),
+        DummyEvent(id="3", increment=1),
+    ]
+    assert not queue
+
+
+def test_priority_dispatch_queue():
+    queue = PriorityDispatchQueue(
+        key=lambda msg: 0 if msg.metadata.name == "dummy2" else 1
+    )
+    queue.extend(
+        [
+            DummyEvent(id="1", increment=1),
+            AnotherDummyCommand(id="2"),
+            DummyEvent(id="3", increment=1),
+            AnotherDummyCommand(id="4"),
+        ]
+    )
+    assert len(queue) == 4
+    assert [queue.popleft() for _ in range(len(queue))] == [
+        AnotherDummyCommand(id="2"),
+        AnotherDummyCommand(id="4"),
+        DummyEvent(id="1", increment=1),
+        DummyEvent(id="3", increment=1),
+    ]
@@ -1,4 +1,10 @@
-from messagebus import Event, Metadata, Model
+import copy
+
+import pytest
+from pydantic import BaseModel, ConfigDict, PrivateAttr, ValidationError
+
+from messagebus import Event, Field, Metadata, Model
+from messagebus.service.eventstream import MessageSerializer
 
 
 class Foo(Model):
@@ -10,6 +16,31 @@ class FooCreated(Event):
     metadata: Metadata = Metadata(name="foo_created", schema_version=1)
 
 
+class BarsCreated(Event):
+    names: list[str] = Field(default=[])
+    metadata: Metadata = Metadata(name="bars_created", schema_version=1)
+
+
+class Address(BaseModel):
+    city: str
+
+
+class FooMoved(Event):
+    addresses: list[Address]
+    tags: dict[str, list[str]] = Field(default_factory=dict)
+    metadata: Metadata = Metadata(name="foo_moved", schema_version=1)
+
+
+class FrozenFooCreated(FooCreated):
+    model_config = ConfigDict(frozen=True)
+
+
+class TrackedFoo(Model):
+    track_changes = True
+    name: str
+    tags: list[str] = Field(default_factory=list)
+
+
 class Bar(Model):
     name: str
 
@@ -39,3 +70,132 @@ def test_message_equal():
     assert FooCreated(name="joe") == FooCreated(name="joe")
     assert FooCreated(name="joe") != BarCreated(name="joe")
     assert FooCreated(name="joe") != object()
+
+
+def test_message_equal_content():
+    assert FooCreated(name="joe") != FooCreated(name="jane")
+    assert FooMoved(addresses=[Address(city="Paris")]) == FooMoved(
+        addresses=[Address(city="Paris")]
+    )
+    assert FooMoved(addresses=[Address(city="Paris")]) != FooMoved(
+        addresses=[Address(city="Lyon")]
+    )
+    # same content and metadata, from another class
+    assert FrozenFooCreated(name="joe") == FooCreated(name="joe")
+    assert FooCreated(name="joe") != FooMoved(addresses=[])
+
+
+def test_message_hash():
+    events = {
+        FooCreated(name="joe"),
+        FooCreated(name="joe"),
+        FooCreated(name="jane"),
+        BarCreated(name="joe"),
+    }
+    assert len(events) == 3
+    assert hash(FrozenFooCreated(name="joe")) == hash(FooCreated(name="joe"))
+
+    # unhashable values are converted
+    moved = FooMoved(addresses=[Address(city="Paris")], tags={"a": ["b"]})
+    assert {moved: 1}[
+        FooMoved(addresses=[Address(city="Paris")], tags={"a": ["b"]})
+    ] == 1
+    assert hash(moved) != hash(FooMoved(addresses=[Address(city="Lyon")]))
+
+
+def test_message_hash_frozen():
+    evt = FrozenFooCreated(name="joe")
+    assert hash(evt) == evt._content_hash  # type: ignore
+    assert copy.copy(evt) == evt
+    assert not hasattr(copy.copy(evt), "_content_hash")
+    with pytest.raises(ValidationError):
+        evt.name = "jane"
+    # the envelope of the message is not part of its content
+    evt.__dict__["causation_id"] = FooCreated(name="joe").message_id
+    assert hash(evt) == hash(FooCreated(name="joe"))
+
+
+def test_model_equal_fields():
+    foo = Foo(name="joe")
+    foo.messages.append(FooCreated(name="joe"))
+    assert foo == Foo(name="joe")
+    assert foo != Foo(name="jane")
+
+
+def test_message_metadata_shared():
+    metadata = FooCreated.model_fields["metadata"].default
+    evt = FooCreated(name="joe")
+    assert evt.metadata is metadata
+    assert FooCreated(name="jane").metadata is metadata
+    assert copy.deepcopy(evt).metadata is metadata
+    assert {metadata: "foo"}[Metadata(name="foo_created", schema_version=1)] == "foo"
+    with pytest.raises(ValidationError):
+        evt.metadata.name = "bar"  # type: ignore
+
+
+def test_message_trusted():
+    evt = FooCreated.trusted(name="joe")
+    assert evt == FooCreated(name="joe")
+    assert evt.metadata is FooCreated.model_fields["metadata"].default
+    assert evt.causation_id is None
+    assert evt.model_fields_set == {"name"}
+    assert FooCreated.trusted(name="joe").message_id != evt.message_id
+
+    serialized = MessageSerializer().serialize_message(evt)
+    assert serialized == {
+        **MessageSerializer().serialize_message(FooCreated(name="joe")),
+        "id": str(evt.message_id),
+        "created_at": evt.created_at.isoformat(),
+    }
+
+    # mutable defaults are not shared
+    bars = BarsCreated.trusted()
+    bars.names.append("joe")
+    assert BarsCreated.trusted().names == []
+
+
+def test_message_trusted_fields_order():
+    class TaggedFooCreated(FooCreated):
+        tags: list[str] = Field(default=[])
+
+    # fields are in the order of their declaration, like in validated messages
+    evt = TaggedFooCreated.trusted(name="joe")
+    assert list(evt.__dict__) == list(TaggedFooCreated(name="joe").__dict__)
+    assert repr(evt) == "<TaggedFooCreated name='joe' tags=[]>"
+
+
+def test_message_trusted_invalid_fields():
+    with pytest.raises(ValueError) as ctx:
+        FooCreated.trusted(nam="joe")
+    assert str(ctx.value) == (
+        "Invalid fields for FooCreated: missing ['name'], unknown ['nam']"
+    )
+
+
+def test_message_trusted_private_attributes():
+    class PrivateFooCreated(FooCreated):
+        _private: str = PrivateAttr(default="private")
+
+    evt = PrivateFooCreated.trusted(name="joe")
+    assert evt._private == "private"
+    assert evt == FooCreated(name="joe")
+
+
+def test_model_dirty_fields():
+    foo = TrackedFoo(name="joe")
+    assert foo.dirty_fields == frozenset()
+
+    foo.name = "jane"
+    foo.messages = [FooCreated(name="jane")]
+    foo.tags.append("changes inside a field are not tracked")
+    assert foo.dirty_fields == {"name"}
+    assert copy.copy(foo).dirty_fields == frozenset()
+
+    foo.mark_clean()
+    assert foo.dirty_fields == frozenset()
+    foo.mark_clean()
+
+    # models don't track their changes by default
+    untracked = Foo(name="joe")
+    untracked.name = "jane"
+    assert untracked.dirty_fields == frozenset()
@@ -0,0 +1,84 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from messagebus.service.eventstream import (
+    AbstractBinaryMessageSerializer,
+    CborMessageSerializer,
+    Compression,
+    MessageSerializer,
+    MsgpackMessageSerializer,
+)
+from tests.conftest import DummyEvent
+
+
+@pytest.fixture(params=[MsgpackMessageSerializer, CborMessageSerializer])
+def serializer_class(
+    request: pytest.FixtureRequest,
+) -> type[AbstractBinaryMessageSerializer]:
+    return request.param
+
+
+@pytest.mark.parametrize("compression", [None, "zstd", "lz4"])
+def test_binary_serializer_roundtrip(
+    serializer_class: type[AbstractBinaryMessageSerializer],
+    compression: Compression | None,
+    dummy_event: DummyEvent,
+):
+    srlz = serializer_class(compression=compression, compression_threshold=0)
+    serialized = srlz.serialize_message(dummy_event)
+    assert serialized["id"] == str(dummy_event.message_id)
+    assert serialized["type"] == "dummied_v1"
+    assert serialized["frame"][:2] == bytes(
+        (1, {None: 0, "zstd": 1, "lz4": 2}[compression])
+    )
+
+    json_serialized = MessageSerializer().serialize_message(dummy_event)
+    assert srlz.decode_frame(serialized["frame"]) == {
+        **json_serialized,
+        "payload": json.loads(json_serialized["payload"]),
+    }
+
+
+def test_binary_serializer_naive_created_at(
+    serializer_class: type[AbstractBinaryMessageSerializer],
+):
+    created_at = datetime(2024, 1, 1, 12, 30)
+    event = DummyEvent(id="foo", increment=1, created_at=created_at)
+    frame = serializer_class().encode_message(event)
+    decoded = serializer_class().decode_frame(frame)
+    assert decoded["created_at"] == "2024-01-01T12:30:00+00:00"
+
+
+def test_binary_serializer_compression_threshold(
+    serializer_class: type[AbstractBinaryMessageSerializer],
+):
+    srlz = serializer_class(compression="zstd", compression_threshold=256)
+    small = srlz.encode_message(DummyEvent(id="small", increment=1))
+    large = srlz.encode_message(DummyEvent(id="large" * 100, increment=1))
+    assert small[1] == 0
+    assert large[1] == 1
+    assert len(large) < 256
+    assert srlz.decode_frame(large)["payload"] == {"id": "large" * 100, "increment": 1}
+
+
+def test_binary_serializer_size(
+    serializer_class: type[AbstractBinaryMessageSerializer],
+    dummy_event: DummyEvent,
+):
+    srlz = serializer_class()
+    json_size = len(json.dumps(MessageSerializer().serialize_message(dummy_event)))
+    assert len(srlz.encode_message(dummy_event)) < json_size / 2
+
+
+def test_binary_serializer_invalid_frame(
+    serializer_class: type[AbstractBinaryMessageSerializer],
+):
+    srlz = serializer_class()
+    with pytest.raises(ValueError) as ctx:
+        srlz.decode_frame(b"\x02\x00")
+    assert str(ctx.value) == "Unsupported frame version 2"
+    with pytest.raises(ValueError) as ctx:
+        srlz.decode_frame(b"\x01\x09")
+    assert str(ctx.value) == "Unknown compression flag 9"
@@ -0,0 +1,97 @@
+import os
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from messagebus.service.manifest import (
+    LazyHandler,
+    fingerprint_modules,
+    import_path,
+    read_manifest,
+    resolve_import_path,
+    write_manifest,
+)
+from tests.conftest import DummyCommand
+
+
+def dummy_handler() -> str:
+    return "handled"
+
+
+@pytest.fixture
+def package(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    pkg = tmp_path / "manifest_pkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    (pkg / "handlers.py").write_text("")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield pkg
+    # finding the spec of a submodule imports its package
+    sys.modules.pop("manifest_pkg", None)
+
+
+def test_import_path():
+    assert import_path(DummyCommand) == "tests.conftest:DummyCommand"
+    assert resolve_import_path("tests.conftest:DummyCommand") is DummyCommand
+    assert resolve_import_path("tests.test_manifest:LazyHandler.__call__") is (
+        LazyHandler.__call__
+    )
+
+    def closure() -> None: ...
+
+    with pytest.raises(ValueError):
+        import_path(closure)
+
+
+def test_fingerprint_modules(package: Path):
+    fingerprint = fingerprint_modules(["manifest_pkg"])
+    assert fingerprint_modules(["manifest_pkg"]) == fingerprint
+    assert fingerprint_modules(["manifest_pkg.handlers"]) != fingerprint
+
+    (package / "other.py").write_text("")
+    assert fingerprint_modules(["manifest_pkg"]) != fingerprint
+    fingerprint = fingerprint_modules(["manifest_pkg"])
+
+    # touching or reinstalling the same sources keeps the fingerprint
+    stat = (package / "handlers.py").stat()
+    os.utime(package / "handlers.py", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert fingerprint_modules(["manifest_pkg"]) == fingerprint
+
+    (package / "handlers.py").write_text("# changed")
+    assert fingerprint_modules(["manifest_pkg"]) != fingerprint
+
+    with pytest.raises(ModuleNotFoundError):
+        fingerprint_modules(["manifest_pkg.missing"])
+
+
+def test_read_manifest(package: Path, tmp_path: Path):
+    manifest = tmp_path / "manifest.json"
+    assert read_manifest(manifest, ["manifest_pkg"]) is None
+
+    write_manifest(manifest, ["manifest_pkg"], [])
+    loaded = read_manifest(manifest, ["manifest_pkg"])
+    assert loaded is not None
+    assert loaded["listeners"] == []
+    assert read_manifest(manifest, ["manifest_pkg.handlers"]) is None
+
+    (package / "handlers.py").write_text("# changed")
+    assert read_manifest(manifest, ["manifest_pkg"]) is None
+
+    manifest.write_text("{")
+    assert read_manifest(manifest, ["manifest_pkg"]) is None
+    manifest.write_text("[]")
+    assert read_manifest(manifest, ["manifest_pkg"]) is None
+
+
+def test_lazy_handler():
+    handler = LazyHandler("tests.test_manifest:dummy_handler")
+    assert repr(handler) == "<LazyHandler tests.test_manifest:dummy_handler>"
+    assert handler == dummy_handler
+    assert handler == LazyHandler("tests.test_manifest:dummy_handler")
+    assert handler != test_lazy_handler
+    assert hash(handler) == hash(LazyHandler("tests.test_manifest:dummy_handler"))
+    assert handler.handler is None
+    assert handler() == "handled"
+    assert handler.handler is dummy_handler
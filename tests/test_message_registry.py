@@ -0,0 +1,84 @@
+import uuid
+
+import pytest
+
+from messagebus.domain.model import GenericEvent
+from messagebus.domain.model.ids import MessageId
+from messagebus.service.eventstream import MessageSerializer, MsgpackMessageSerializer
+from messagebus.service.message_registry import (
+    DuplicateMessageTypeError,
+    MessageDeserializer,
+    MessageTypeRegistry,
+)
+from tests.conftest import DummyCommand, DummyEvent, MyMetadata
+
+
+class DuplicatedDummyEvent(GenericEvent[MyMetadata]):
+    metadata: MyMetadata = MyMetadata(
+        name="dummied", schema_version=1, custom_field="foo"
+    )
+
+
+@pytest.fixture
+def registry() -> MessageTypeRegistry:
+    registry = MessageTypeRegistry()
+    registry.register(DummyCommand)
+    registry.register(DummyEvent)
+    return registry
+
+
+def test_registry(registry: MessageTypeRegistry):
+    registry.register(DummyEvent)
+    assert len(registry) == 2
+    assert DummyEvent in registry
+    assert registry.get("dummied", 1) is DummyEvent
+    assert registry.get("dummied", 2) is None
+    assert registry.get_by_serialized_type("dummy_v1") is DummyCommand
+
+
+def test_registry_duplicate(registry: MessageTypeRegistry):
+    registry.register(DuplicatedDummyEvent)
+    assert registry.get("dummy", 1) is DummyCommand
+    with pytest.raises(DuplicateMessageTypeError) as ctx:
+        registry.get("dummied", 1)
+    assert "dummied version 1" in str(ctx.value)
+    with pytest.raises(DuplicateMessageTypeError):
+        registry.get_by_serialized_type("dummied_v1")
+
+
+@pytest.mark.parametrize(
+    "serializer", [MessageSerializer(), MsgpackMessageSerializer()]
+)
+def test_deserialize_message(
+    registry: MessageTypeRegistry,
+    serializer: MessageSerializer,
+    dummy_event: DummyEvent,
+):
+    dummy_event.causation_id = MessageId(uuid.uuid4())
+    dummy_event.correlation_id = MessageId(uuid.uuid4())
+    deserializer = MessageDeserializer(registry, MsgpackMessageSerializer())
+    message = deserializer.deserialize_message(
+        serializer.serialize_message(dummy_event)
+    )
+    assert message == dummy_event
+    assert message is not None
+    assert message.message_id == dummy_event.message_id
+    assert message.created_at == dummy_event.created_at
+    assert message.causation_id == dummy_event.causation_id
+    assert message.correlation_id == dummy_event.correlation_id
+    assert message.metadata is DummyEvent.model_fields["metadata"].default
+
+
+def test_deserialize_unknown_message(dummy_event: DummyEvent):
+    deserializer = MessageDeserializer(MessageTypeRegistry())
+    serialized = MessageSerializer().serialize_message(dummy_event)
+    assert deserializer.deserialize_message(serialized) is None
+
+
+def test_deserialize_frame_without_binary_serializer(
+    registry: MessageTypeRegistry, dummy_event: DummyEvent
+):
+    deserializer = MessageDeserializer(registry)
+    serialized = MsgpackMessageSerializer().serialize_message(dummy_event)
+    with pytest.raises(ValueError):
+        deserializer.deserialize_message(serialized)
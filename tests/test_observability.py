@@ -0,0 +1,30 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from messagebus import GenericCommand, Metadata, TransactionStatus
+from messagebus.ports.observability import AbstractMetricsStore
+
+
+class MinimalMetricsStore(AbstractMetricsStore):
+    def inc_beginned_transaction_count(self) -> None: ...
+
+    def inc_transaction_failed(self) -> None: ...
+
+    def inc_transaction_closed_count(self, status: TransactionStatus) -> None: ...
+
+    def inc_messages_processed_total(self, msg_metadata: Metadata) -> None: ...
+
+    @contextmanager
+    def command_processing_timer(self, command: GenericCommand[Any]) -> Iterator[None]:
+        yield
+
+
+def test_metrics_store_optional_metrics():
+    # metrics stores implementing the original interface are still valid
+    metrics = MinimalMetricsStore()
+    metadata = Metadata(name="dummy", schema_version=1)
+    metrics.observe_handler_processing_seconds("tests.handler", metadata, 0.5)
+    metrics.inc_handler_failed_total("tests.handler", metadata)
+    metrics.inc_eventstream_queue_full_total("block")
+    metrics.inc_messages_replayed_total("projection", 42)
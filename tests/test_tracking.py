@@ -0,0 +1,39 @@
+from messagebus.service.tracking import SeenModels, drain
+from tests._async.conftest import DummyModel
+
+
+def test_seen_models():
+    foo, bar = DummyModel(id="foo", counter=0), DummyModel(id="bar", counter=0)
+    seen: SeenModels[DummyModel] = SeenModels([foo, bar, foo])
+    assert seen == [foo, bar]
+
+    seen.append(bar)
+    seen.extend([foo, DummyModel(id="foo", counter=0)])
+    assert len(seen) == 3
+    assert foo in seen
+    assert DummyModel(id="bar", counter=0) not in seen
+
+    assert seen.pop(0) is foo
+    assert foo not in seen
+    seen.append(foo)
+    assert seen[-1] is foo
+
+    seen[0] = foo
+    assert seen == [foo, seen[1]]
+    assert seen[:1] == [foo]
+
+    seen.clear()
+    assert seen == []
+
+
+def test_drain():
+    foo, bar = DummyModel(id="foo", counter=0), DummyModel(id="bar", counter=0)
+    seen: SeenModels[DummyModel] = SeenModels([foo, bar])
+    assert drain(seen) == [foo, bar]
+    assert seen == []
+    seen.append(foo)
+    assert seen == [foo]
+
+    items = [1, 2, 3]
+    assert drain(items) == [1, 2, 3]
+    assert items == []